@@ -0,0 +1,65 @@
+#!/usr/bin/python3
+
+####################################################################################
+#
+#  custom data extraction throughput on small files: threads vs event driven engine vs batch rule
+#
+#  usage: python3 scripts/cde.bench.py [files] [threads] [repeats] [batch]
+#
+####################################################################################
+
+import sys
+from os import makedirs
+from os.path import abspath,dirname,join as path_join
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+sys.path.insert(0,path_join(dirname(abspath(__file__)),'..','src'))
+
+from core import LibrerRecord,CD_DATA_ID
+
+def print_func(data,always=False):
+    pass
+
+def prepare_files(path,files):
+    for nr in range(files):
+        folder = path_join(path,str(nr%32))
+        makedirs(folder,exist_ok=True)
+        with open(path_join(folder,f'file{nr}.txt'),'w') as f:
+            f.write(f'line {nr}\n'*(nr%7+1))
+
+def run(path,cde_list,threads,event_driven):
+    abort_list = [False,False]
+    record = LibrerRecord('bench',path)
+    record.scan(print_func,abort_list,cde_list)
+    pool = list(record.customdata_pool.values())
+
+    t0 = perf_counter()
+    record.extract_customdata(print_func,abort_list,threads=threads,event_driven=event_driven)
+    time_all = perf_counter()-t0
+
+    return time_all,sorted((subpath,scan_like_list[-1][CD_DATA_ID]) for scan_like_list,subpath,rule_nr,size in pool)
+
+if __name__ == "__main__":
+    files = int(sys.argv[1]) if len(sys.argv)>1 else 2000
+    threads = int(sys.argv[2]) if len(sys.argv)>2 else 4
+    repeats = int(sys.argv[3]) if len(sys.argv)>3 else 3
+    batch = int(sys.argv[4]) if len(sys.argv)>4 else 64
+
+    #expressions,use_smin,smin_int,use_smax,smax_int,executable,parameters,shell,timeout,crc,max_threads,batch_size,batch_json,output_max_bytes,output_max_lines
+    cde_list = ( (('*.txt',),False,0,False,0,'md5sum','%',False,10,False,0,0,False,0,0), )
+    cde_list_batch = ( (('*.txt',),False,0,False,0,'md5sum','%',False,10,False,0,batch,False,0,0), )
+
+    with TemporaryDirectory() as path:
+        prepare_files(path,files)
+
+        results = {}
+        for label,rules,event_driven in (('threads',cde_list,False),('events',cde_list,True),('batch',cde_list_batch,True)):
+            times = []
+            for i in range(repeats):
+                time_all,results[label] = run(path,rules,threads,event_driven)
+                times.append(time_all)
+
+            print(f'{label:8} files:{files} threads:{threads} best:{min(times):.2f}s  files/s:{files/min(times):8.0f}')
+
+        print('identical output:',results['threads']==results['events']==results['batch'])
@@ -0,0 +1,58 @@
+#!/usr/bin/python3
+
+####################################################################################
+#
+#  record creation peak memory: in-memory scan tree vs streaming (spill file)
+#
+#  usage: python3 scripts/create.bench.py <path> [columns|mapped]
+#
+####################################################################################
+
+import sys
+from os import remove,rmdir
+from os.path import abspath,dirname,join as path_join
+from tempfile import mkdtemp
+from time import perf_counter
+from tracemalloc import start as tracemalloc_start,stop as tracemalloc_stop,get_traced_memory
+
+sys.path.insert(0,path_join(dirname(abspath(__file__)),'..','src'))
+
+from core import LibrerRecord
+
+def dummy_print_func(*args,**kwargs):
+    pass
+
+if __name__ == "__main__":
+    path = sys.argv[1]
+    layout = sys.argv[2] if len(sys.argv)>2 else 'columns'
+    temp_dir = mkdtemp()
+
+    for streaming in (False,True):
+        file_path = path_join(temp_dir,'bench.dat')
+
+        tracemalloc_start()
+        t0 = perf_counter()
+
+        record = LibrerRecord('bench',path)
+        record.scan(dummy_print_func,[False,False],(),streaming=streaming,spill_dir=temp_dir)
+        t1 = perf_counter()
+
+        if streaming:
+            record.pack_stream(dummy_print_func)
+        else:
+            record.pack_data(dummy_print_func)
+        t2 = perf_counter()
+
+        pack_peak = get_traced_memory()[1]
+
+        record.save(dummy_print_func,file_path=file_path,columns=True,mapped=layout=='mapped')
+        t3 = perf_counter()
+
+        current,peak = get_traced_memory()
+        tracemalloc_stop()
+
+        print(f'{"streaming" if streaming else "in-memory":10} entries:{record.header.quant_files+record.header.quant_folders} scan:{t1-t0:.2f}s pack:{t2-t1:.2f}s save:{t3-t2:.2f}s  peak before save:{pack_peak/2**20:.1f}MB  peak:{peak/2**20:.1f}MB')
+
+        remove(file_path)
+
+    rmdir(temp_dir)
@@ -0,0 +1,138 @@
+#!/usr/bin/python3
+
+####################################################################################
+#
+#  packing of scanned tree into filestructure tuples: legacy recursion vs single pass
+#
+#  usage: python3 scripts/pack.bench.py [entries] [fanout]
+#
+####################################################################################
+
+import sys
+from os.path import abspath,dirname,join as path_join
+from random import Random
+from time import perf_counter
+
+sys.path.insert(0,path_join(dirname(abspath(__file__)),'..','src'))
+
+from core import LibrerRecord,LUT_encode,CD_OK_ID,CD_INDEX_ID,CD_ABORTED_ID,CD_EMPTY_ID,CD_TRUNCATED_ID
+
+def synthetic_tree(entries,fanout):
+    #breadth-first growth, fanout/8 (at least 2) folders in every folder, every 7th file has custom data
+    rnd = Random(0)
+    names = [f'name{i}.ext{i%13}' for i in range(max(entries//16,fanout))]
+    names_quant = len(names)
+
+    root = {}
+    folders = [root]
+    created = 0
+    cd_index = 0
+    for folder in folders:
+        for i in range(fanout):
+            if created>=entries:
+                return root,names
+            created += 1
+            name = names[rnd.randrange(names_quant)]
+            while name in folder:
+                name = names[rnd.randrange(names_quant)]
+
+            if i<max(2,fanout//8):
+                sub_dict = {}
+                folder[name] = [0,True,False,False,False,True,rnd.randrange(1<<30),sub_dict]
+                folders.append(sub_dict)
+            else:
+                items_list = folder[name] = [rnd.randrange(1<<20),False,True,False,False,False,rnd.randrange(1<<30)]
+                if created%7==0:
+                    items_list.append({CD_OK_ID:True,CD_INDEX_ID:cd_index,CD_ABORTED_ID:False,CD_EMPTY_ID:False,CD_TRUNCATED_ID:False})
+                    cd_index += 1
+
+    return root,names
+
+def legacy_tupelize_rec(self,scan_like_data,results_queue_put):
+    LUT_encode_loc = LUT_encode
+
+    sub_list = []
+    for entry_name,items_list in scan_like_data.items():
+        try:
+            entry_name_index = self.filenames_helper[entry_name]
+            self.header.references_names+=1
+        except Exception as VE:
+            print('filenames error:',entry_name,VE)
+        else:
+            try:
+                (size,is_dir,is_file,is_symlink,is_bind,has_files,mtime) = items_list[0:7]
+
+                try:
+                    elem_index = 7
+                    if has_files:
+                        sub_dict = items_list[elem_index]
+                        elem_index+=1
+                except:
+                    sub_dict={}
+
+                try:
+                    info_dict = items_list[elem_index]
+                except:
+                    has_cd = False
+                    cd_ok = False
+                    cd_aborted = False
+                    cd_empty = False
+                    cd_truncated = False
+                else:
+                    if CD_OK_ID in info_dict:
+                        cd_ok = info_dict[CD_OK_ID]
+                        cd_index = info_dict[CD_INDEX_ID]
+                        has_cd = True
+                    else:
+                        cd_ok = False
+                        has_cd = False
+
+                    cd_aborted = info_dict[CD_ABORTED_ID] if CD_ABORTED_ID in info_dict else False
+                    cd_empty = info_dict[CD_EMPTY_ID] if CD_EMPTY_ID in info_dict else False
+                    cd_truncated = info_dict[CD_TRUNCATED_ID] if CD_TRUNCATED_ID in info_dict else False
+
+                code_new = LUT_encode_loc[ (is_dir,is_file,is_symlink,is_bind,has_cd,has_files,cd_ok,cd_aborted,cd_empty,cd_truncated) ]
+
+                sub_list_elem=[entry_name_index,code_new,size,mtime]
+
+                if has_files:
+                    sub_list_elem.append(legacy_tupelize_rec(self,sub_dict,results_queue_put))
+
+                if has_cd:
+                    self.header.references_cd+=1
+                    sub_list_elem.append( cd_index )
+
+                sub_list.append( tuple(sub_list_elem) )
+
+            except Exception as e:
+                results_queue_put(f'tupelize_rec error:{e}' )
+
+    return tuple(sorted(sub_list,key = lambda x : x[1:4]))
+
+if __name__ == "__main__":
+    entries = int(sys.argv[1]) if len(sys.argv)>1 else 2000000
+    fanout = int(sys.argv[2]) if len(sys.argv)>2 else 32
+
+    record = LibrerRecord('bench','')
+    results = []
+
+    scan_like_data,names = synthetic_tree(entries,fanout)
+    record.filenames = tuple(sorted(names))
+    record.filenames_helper = {name:index for index,name in enumerate(record.filenames)}
+
+    record.header.references_names = record.header.references_cd = 0
+    t0 = perf_counter()
+    legacy_res = legacy_tupelize_rec(record,scan_like_data,results.append)
+    legacy_time = perf_counter()-t0
+    legacy_refs = (record.header.references_names,record.header.references_cd)
+
+    #pack_data consumes scan_data
+    record.scan_data = scan_like_data
+    t0 = perf_counter()
+    record.pack_data(results.append)
+    single_pass_time = perf_counter()-t0
+
+    print(f'entries:{entries} fanout:{fanout} references:{legacy_refs[0]} cd:{legacy_refs[1]}')
+    print(f'legacy recursive   : {legacy_time:.2f}s')
+    print(f'single pass        : {single_pass_time:.2f}s')
+    print(f'identical:{record.filestructure[4]==legacy_res and legacy_refs==(record.header.references_names,record.header.references_cd)} errors:{len(results)}')
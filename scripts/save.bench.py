@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+
+####################################################################################
+#
+#  record save: sequential sections with asizeof statistics vs pipelined save
+#
+#  usage: python3 scripts/save.bench.py <path> [compression_level]
+#
+####################################################################################
+
+import sys
+from os import remove,rmdir
+from os.path import abspath,dirname,join as path_join
+from tempfile import mkdtemp
+from time import perf_counter
+from zipfile import ZipFile
+
+sys.path.insert(0,path_join(dirname(abspath(__file__)),'..','src'))
+
+from pympler.asizeof import asizeof
+
+from core import LibrerRecord,build_nodes_index,build_trigram_index,dumps,ZstdCompressor,set_size_diagnostics
+
+def dummy_print_func(*args,**kwargs):
+    pass
+
+def legacy_save(record,file_path,compression_level):
+    with ZipFile(file_path, "w") as zip_file:
+        for datalabel,data in (('filestructure',record.filestructure),('nodesindex',build_nodes_index(record.filestructure,len(record.filenames))),('filenames',record.filenames),('filenamesindex',build_trigram_index(record.filenames)),('header',record.header)):
+            asizeof(data)
+            data_ser = dumps(data)
+            data_ser_compr = ZstdCompressor(level=compression_level,threads=-1).compress(data_ser)
+            record.header.zipinfo[datalabel]=(asizeof(data_ser_compr),asizeof(data_ser),asizeof(data))
+            zip_file.writestr(datalabel,data_ser_compr)
+
+if __name__ == "__main__":
+    path = sys.argv[1]
+    compression_level = int(sys.argv[2]) if len(sys.argv)>2 else 9
+    temp_dir = mkdtemp()
+    file_path = path_join(temp_dir,'bench.dat')
+
+    record = LibrerRecord('bench',path)
+    record.scan(dummy_print_func,[False,False],())
+    record.pack_data(dummy_print_func)
+    print(f'entries:{record.header.quant_files+record.header.quant_folders} compression level:{compression_level}')
+
+    t0 = perf_counter()
+    legacy_save(record,file_path,compression_level)
+    print(f'sequential with asizeof : {perf_counter()-t0:.2f}s')
+    remove(file_path)
+
+    for size_diagnostics in (True,False):
+        set_size_diagnostics(size_diagnostics)
+        t0 = perf_counter()
+        record.save(dummy_print_func,file_path=file_path,compression_level=compression_level)
+        print(f'pipelined{" with asizeof" if size_diagnostics else "             "}  : {perf_counter()-t0:.2f}s  ' + '  '.join(f'{datalabel}:{tdiff:.2f}s' for datalabel,tdiff in record.header.compression_time.items()))
+        remove(file_path)
+
+    rmdir(temp_dir)
@@ -0,0 +1,116 @@
+#!/usr/bin/python3
+
+####################################################################################
+#
+#  per entry metadata cost of scan loop: legacy calls vs single lstat
+#
+#  usage: python3 scripts/scan.bench.py <path> [repeats]
+#
+####################################################################################
+
+import sys
+from os import scandir,stat
+from os.path import abspath,basename,dirname,join as path_join
+from pathlib import Path as pathlib_Path
+from time import perf_counter
+from tracemalloc import start as tracemalloc_start,stop as tracemalloc_stop,get_traced_memory
+
+sys.path.insert(0,path_join(dirname(abspath(__file__)),'..','src'))
+
+from core import entry_lstat,name_ext,S_IFMT,S_IFDIR,S_IFREG,S_IFLNK
+
+def legacy_entry(entry,stat_func):
+    hidden = basename(abspath(entry)).startswith('.')
+    is_dir,is_file,is_symlink = entry.is_dir(),entry.is_file(),entry.is_symlink()
+    ext = pathlib_Path(entry).suffix
+    stat_res = stat_func(entry)
+    return hidden,is_dir,is_file,is_symlink,ext,int(stat_res.st_mtime),stat_res.st_dev,stat_res.st_size
+
+def lstat_entry(entry,stat_func):
+    entry_name = entry.name
+    hidden = entry_name.startswith('.')
+    ext = name_ext(entry_name)
+    stat_res = entry_lstat(entry)
+    st_fmt = S_IFMT(stat_res.st_mode)
+    if st_fmt==S_IFLNK:
+        is_dir,is_file,is_symlink = entry.is_dir(),entry.is_file(),True
+        stat_res = stat_func(entry)
+    else:
+        is_dir,is_file,is_symlink = st_fmt==S_IFDIR,st_fmt==S_IFREG,False
+    return hidden,is_dir,is_file,is_symlink,ext,int(stat_res.st_mtime),stat_res.st_dev,stat_res.st_size
+
+def folders(path):
+    res = [path]
+    for entry in scandir(path):
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                res.extend(folders(entry.path))
+        except Exception:
+            pass
+    return res
+
+class CountingEntry:
+    #counts metadata calls of wrapped DirEntry
+    calls = 0
+    def __init__(self,entry):
+        self.entry = entry
+        self.name = entry.name
+        self.path = entry.path
+    def __fspath__(self):
+        return self.entry.path
+    def is_dir(self,**kwargs):
+        CountingEntry.calls += 1
+        return self.entry.is_dir(**kwargs)
+    def is_file(self,**kwargs):
+        CountingEntry.calls += 1
+        return self.entry.is_file(**kwargs)
+    def is_symlink(self):
+        CountingEntry.calls += 1
+        return self.entry.is_symlink()
+    def stat(self,**kwargs):
+        CountingEntry.calls += 1
+        return self.entry.stat(**kwargs)
+
+stat_calls = [0]
+def counting_stat(path,**kwargs):
+    stat_calls[0] += 1
+    return stat(path,**kwargs)
+
+def run(entry_func,all_folders,stat_func=stat,wrap=None):
+    quant = 0
+    for folder in all_folders:
+        try:
+            with scandir(folder) as res:
+                for entry in res:
+                    try:
+                        entry_func(wrap(entry) if wrap else entry,stat_func)
+                    except Exception:
+                        pass
+                    quant += 1
+        except Exception:
+            pass
+    return quant
+
+if __name__ == "__main__":
+    path = sys.argv[1]
+    repeats = int(sys.argv[2]) if len(sys.argv)>2 else 5
+
+    all_folders = folders(path)
+
+    for label,entry_func in (('legacy',legacy_entry),('lstat',lstat_entry)):
+        times = []
+        for i in range(repeats):
+            t0 = perf_counter()
+            quant = run(entry_func,all_folders)
+            times.append(perf_counter()-t0)
+
+        tracemalloc_start()
+        run(entry_func,all_folders)
+        current,peak = get_traced_memory()
+        tracemalloc_stop()
+
+        stat_calls[0] = 0
+        CountingEntry.calls = 0
+        run(entry_func,all_folders,counting_stat,CountingEntry)
+
+        print(f'{label:8} entries:{quant} time/entry:{min(times)/quant*1e9:8.0f}ns  os.stat/entry:{stat_calls[0]/quant:.3f}  DirEntry calls/entry:{CountingEntry.calls/quant:.3f}  peak transient alloc:{peak}B')
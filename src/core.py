@@ -28,27 +28,42 @@
 
 from gc import disable as gc_disable, enable as gc_enable,collect as gc_collect
 
-from json import loads as json_loads
+from json import loads as json_loads,dumps as json_dumps,JSONDecoder
 from subprocess import Popen, STDOUT,DEVNULL,PIPE, run as subprocess_run
 
 from time import sleep, perf_counter,time,strftime,localtime,mktime
-from threading import Thread
-from stat import FILE_ATTRIBUTE_HIDDEN as stat_FILE_ATTRIBUTE_HIDDEN
-from os import cpu_count,scandir,stat,sep,name as os_name,remove as os_remove,rename
-from os.path import abspath,normpath,basename,dirname,join as path_join
-
-from zipfile import ZipFile
+from threading import Thread,Lock,Condition
+from selectors import DefaultSelector,EVENT_READ
+from multiprocessing import get_context
+from multiprocessing.pool import ThreadPool
+from stat import FILE_ATTRIBUTE_HIDDEN as stat_FILE_ATTRIBUTE_HIDDEN,S_IFMT,S_IFDIR,S_IFREG,S_IFLNK
+from os import cpu_count,scandir,stat,sep,name as os_name,remove as os_remove,rename,replace as os_replace,read as os_read,environ
+from os.path import abspath,normpath,normcase,basename,dirname,join as path_join
+
+from zipfile import ZipFile,ZipInfo,ZIP_STORED,ZIP64_LIMIT
+from mmap import mmap,ACCESS_READ
 from platform import system as platform_system,release as platform_release,node as platform_node
-from re import search as re_search,compile as re_compile, sub as re_sub
+from re import search as re_search,compile as re_compile, sub as re_sub,IGNORECASE,MULTILINE,DOTALL
 import sys
-from collections import defaultdict
+from collections import defaultdict,Counter,deque
+from bisect import bisect_left
+from itertools import accumulate
+from operator import itemgetter
 from pathlib import Path as pathlib_Path
 from signal import SIGTERM
 from copy import deepcopy
+from array import array
+from struct import Struct,pack,unpack_from
 from pickle import dumps,loads
-from fnmatch import fnmatch
+from tempfile import TemporaryFile
+from hashlib import blake2b
+from fnmatch import fnmatch,translate
+try:
+    from re._parser import parse as sre_parse,LITERAL as SRE_LITERAL
+except ImportError:
+    from sre_parse import parse as sre_parse,LITERAL as SRE_LITERAL
+from difflib import SequenceMatcher
 from zstandard import ZstdCompressor,ZstdDecompressor
-from pympler.asizeof import asizeof
 from send2trash import send2trash as send2trash_delete
 from unicodedata import normalize, combining
 from psutil import disk_usage
@@ -57,14 +72,22 @@ from dateparser import parse as parse_datetime
 
 windows = bool(os_name=='nt')
 
-def is_hidden_win(filepath):
-    return bool(stat(filepath).st_file_attributes & stat_FILE_ATTRIBUTE_HIDDEN)
+#DirEntry.stat on windows is filled by directory listing, without st_dev
+def is_hidden_win(entry):
+    return bool(entry.stat(follow_symlinks=False).st_file_attributes & stat_FILE_ATTRIBUTE_HIDDEN)
 
-def is_hidden_lin(filepath):
-    return basename(abspath(filepath)).startswith('.')
+def is_hidden_lin(entry):
+    return entry.name.startswith('.')
 
 is_hidden = is_hidden_win if windows else is_hidden_lin
 
+entry_lstat = (lambda entry : stat(entry,follow_symlinks=False)) if windows else (lambda entry : entry.stat(follow_symlinks=False))
+
+#same as pathlib suffix
+def name_ext(name):
+    dot = name.rfind('.')
+    return name[dot:] if 0 < dot < len(name)-1 else ''
+
 if windows:
     from subprocess import CREATE_NO_WINDOW,DETACHED_PROCESS,CREATE_NEW_PROCESS_GROUP
 else:
@@ -82,11 +105,18 @@ SCAN_DAT_FILE = 'scaninfo'
 SEARCH_DAT_FILE = 'searchinfo'
 SIGNAL_FILE = 'signal'
 
+CDE_CACHE_FILE = 'cde.cache'
+CDE_CACHE_MAX_SIZE = 128*1024*1024
+CDE_CACHE_HASH_CHUNK = 64*1024
+
+SAVE_THREADS = 4
+
 CD_OK_ID = 0
 CD_INDEX_ID = 1
 CD_DATA_ID = 2
 CD_ABORTED_ID = 3
 CD_EMPTY_ID = 4
+CD_TRUNCATED_ID = 5
 
 def get_dev_labes_dict():
     lsblk = subprocess_run(['lsblk','-fJ'],capture_output = True,text = True)
@@ -142,6 +172,41 @@ def bytes_to_str(num):
 
     return "BIG"
 
+#####################################################################
+#size accounting: byte lengths of strings and serialized data by default
+#full object graph walk (pympler asizeof) only in diagnostics mode, LIBRER_SIZE_DIAGNOSTICS environment variable
+
+SIZE_DIAGNOSTICS = bool(environ.get('LIBRER_SIZE_DIAGNOSTICS'))
+
+def set_size_diagnostics(enabled):
+    global SIZE_DIAGNOSTICS
+    SIZE_DIAGNOSTICS = enabled
+
+def graph_size(data):
+    if SIZE_DIAGNOSTICS:
+        from pympler.asizeof import asizeof
+        return asizeof(data)
+    return ''
+
+def graph_size_info(data):
+    return f' ({bytes_to_str(graph_size(data))})' if SIZE_DIAGNOSTICS else ''
+
+def str_bytes_len(data):
+    #utf-8 length, not code points, lone surrogates from undecodable output counted too
+    return len(data.encode('utf-8','surrogatepass')) if isinstance(data,str) else len(data)
+
+def data_size(data):
+    if SIZE_DIAGNOSTICS:
+        return graph_size(data)
+
+    if isinstance(data,(str,bytes)):
+        return str_bytes_len(data)
+
+    if isinstance(data,(tuple,list)):
+        return sum(str_bytes_len(elem) if isinstance(elem,(str,bytes)) else 8 for elem in data)
+
+    return 8
+
 def fnumber(num):
     return str(format(num,',d').replace(',',' '))
 
@@ -196,20 +261,760 @@ def prepare_LUTs():
 
 prepare_LUTs()
 
+FUZZY_ALGORITHMS = ('SequenceMatcher','Levenshtein')
+
+def fuzzy_sequencematcher_func(expr,threshold):
+    #SequenceMatcher(...).ratio() preceded by its cheap upper bounds (like real_quick_ratio and quick_ratio)
+    expr_len = len(expr)
+    expr_counter = Counter(expr)
+
+    def fuzzy_sequencematcher(x):
+        length = expr_len+len(x)
+        if length:
+            if 2.0*min(expr_len,len(x))/length <= threshold:
+                return False
+            if 2.0*sum((expr_counter & Counter(x)).values())/length <= threshold:
+                return False
+
+        return bool(SequenceMatcher(None, expr, x).ratio()>threshold)
+
+    return fuzzy_sequencematcher
+
+def fuzzy_levenshtein_func(expr,threshold):
+    #similarity: 1 - levenshtein distance / longer length, distance by bit-parallel algorithm (Myers/Hyyro)
+    expr_len = len(expr)
+    peq = defaultdict(int)
+    for i,c in enumerate(expr):
+        peq[c] |= 1<<i
+    peq_get = dict(peq).get
+    last = 1<<(expr_len-1) if expr_len else 0
+
+    def fuzzy_levenshtein(x):
+        x_len = len(x)
+        max_len = max(expr_len,x_len)
+        if not max_len:
+            return bool(1.0>threshold)
+        if 1.0-abs(expr_len-x_len)/max_len <= threshold:
+            return False
+        if not expr_len:
+            return False
+
+        pv,mv,dist = -1,0,expr_len
+        for c in x:
+            eq = peq_get(c,0)
+            xv = eq | mv
+            xh = (((eq & pv) + pv) ^ pv) | eq
+            ph = mv | ~(xh | pv)
+            mh = pv & xh
+            if ph & last:
+                dist+=1
+            elif mh & last:
+                dist-=1
+            ph = (ph << 1) | 1
+            pv = (mh << 1) | ~(xv | ph)
+            mv = ph & xv
+
+        return bool(1.0-dist/max_len>threshold)
+
+    return fuzzy_levenshtein
+
+def fuzzy_func(algorithm,expr,threshold):
+    if algorithm=='Levenshtein':
+        return fuzzy_levenshtein_func(expr,threshold)
+    return fuzzy_sequencematcher_func(expr,threshold)
+
+def search_funcs(find_filename_search_kind,name_expr,name_case_sens,find_cd_search_kind,cd_expr,cd_case_sens,filename_fuzzy_threshold_str,cd_fuzzy_threshold_str,filename_fuzzy_algorithm='SequenceMatcher',cd_fuzzy_algorithm='SequenceMatcher'):
+    try:
+        filename_fuzzy_threshold = float(filename_fuzzy_threshold_str)
+    except Exception as ce:
+        filename_fuzzy_threshold = 0.0
+
+    try:
+        cd_fuzzy_threshold = float(cd_fuzzy_threshold_str)
+    except Exception as ce:
+        cd_fuzzy_threshold = 0.0
+
+    if find_filename_search_kind == 'regexp':
+        re_obj_name=re_compile(name_expr)
+        name_func_to_call = lambda x : re_obj_name.match(x)
+        name_search_kind='regexp'
+    elif find_filename_search_kind == 'glob':
+        if name_case_sens:
+            re_obj_name=re_compile(translate(name_expr))
+        else:
+            re_obj_name=re_compile(translate(name_expr), IGNORECASE)
+        name_func_to_call = lambda x : re_obj_name.match(x)
+        name_search_kind='glob'
+    elif find_filename_search_kind == 'fuzzy':
+        name_func_to_call = fuzzy_func(filename_fuzzy_algorithm,name_expr,filename_fuzzy_threshold)
+        name_search_kind='fuzzy'
+    elif find_filename_search_kind == 'error':
+        name_func_to_call = None
+        name_search_kind='error'
+    else:
+        name_func_to_call = None
+        name_search_kind='dont'
+
+    custom_data_needed=False
+
+    if find_cd_search_kind=='regexp':
+        custom_data_needed=True
+        re_obj_cd=re_compile(cd_expr, MULTILINE | DOTALL)
+        cd_func_to_call = lambda x : re_obj_cd.match(x)
+    elif find_cd_search_kind=='glob':
+        custom_data_needed=True
+        if cd_case_sens:
+            re_obj_cd=re_compile(translate(cd_expr), MULTILINE | DOTALL)
+        else:
+            re_obj_cd=re_compile(translate(cd_expr), MULTILINE | DOTALL | IGNORECASE)
+        cd_func_to_call = lambda x : re_obj_cd.match(x)
+    elif find_cd_search_kind=='fuzzy':
+        custom_data_needed=True
+        cd_func_to_call = fuzzy_func(cd_fuzzy_algorithm,cd_expr,cd_fuzzy_threshold)
+    else:
+        #'without','empty','error','any','dont'
+        cd_func_to_call = None
+
+    return name_search_kind,name_func_to_call,cd_func_to_call,custom_data_needed
+
+#####################################################################
+#trigram index of filenames
+
+ASCII_LOWER_TRANS = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz')
+
+#ascii letters having non-ascii case insensitive equivalents (dotless i, kelvin sign, long s)
+TRIGRAM_IGNORECASE_UNSAFE = frozenset('iksIKS')
+
+def build_trigram_index(strings):
+    postings_dict = defaultdict(list)
+    for nr,string in enumerate(strings):
+        string_low = string.translate(ASCII_LOWER_TRANS)
+        for trigram in {string_low[i:i+3] for i in range(len(string_low)-2)}:
+            postings_dict[trigram].append(nr)
+
+    trigrams = tuple(sorted(postings_dict))
+    offsets = array('I',[0])
+    offsets_append = offsets.append
+    postings = array('I')
+    postings_extend = postings.extend
+
+    for trigram in trigrams:
+        postings_extend(postings_dict[trigram])
+        offsets_append(len(postings))
+
+    return (trigrams,offsets,postings)
+
+def regexp_literals(expr):
+    #literal runs required by top-level sequence of regular expression
+    try:
+        parsed = sre_parse(expr)
+    except Exception as e:
+        return [],False
+
+    literals = []
+    run = []
+    for op,av in parsed:
+        if op is SRE_LITERAL:
+            run.append(chr(av))
+        elif run:
+            literals.append(''.join(run))
+            run = []
+    if run:
+        literals.append(''.join(run))
+
+    return literals,bool(parsed.state.flags & IGNORECASE)
+
+def glob_literals(expr):
+    #literal runs required by glob expression (fnmatch syntax)
+    literals = []
+    run = []
+    i,n = 0,len(expr)
+    while i<n:
+        c = expr[i]
+        i+=1
+        if c in '*?':
+            if run:
+                literals.append(''.join(run))
+                run = []
+        elif c=='[':
+            j = i
+            if j<n and expr[j]=='!':
+                j+=1
+            if j<n and expr[j]==']':
+                j+=1
+            while j<n and expr[j]!=']':
+                j+=1
+            if j>=n:
+                run.append(c)
+            else:
+                if run:
+                    literals.append(''.join(run))
+                    run = []
+                i = j+1
+        else:
+            run.append(c)
+    if run:
+        literals.append(''.join(run))
+
+    return literals
+
+def search_literals(search_kind,expr,case_sens):
+    if search_kind=='regexp':
+        literals,ignorecase = regexp_literals(expr)
+    elif search_kind=='glob':
+        literals,ignorecase = glob_literals(expr),not case_sens
+    else:
+        return None
+
+    if not any(len(literal)>2 for literal in literals):
+        return None
+
+    return literals,ignorecase
+
+def trigram_candidates(trigram_index,literals,ignorecase):
+    trigrams,offsets,postings = trigram_index
+
+    query_trigrams = set()
+    for literal in literals:
+        literal_low = literal.translate(ASCII_LOWER_TRANS)
+        for trigram in {literal_low[i:i+3] for i in range(len(literal_low)-2)}:
+            if ignorecase and (not trigram.isascii() or not TRIGRAM_IGNORECASE_UNSAFE.isdisjoint(trigram)):
+                continue
+            query_trigrams.add(trigram)
+
+    if not query_trigrams:
+        return None
+
+    trigrams_len = len(trigrams)
+    postings_slices = []
+    for trigram in query_trigrams:
+        pos = bisect_left(trigrams,trigram)
+        if pos==trigrams_len or trigrams[pos]!=trigram:
+            return set()
+        postings_slices.append(postings[offsets[pos]:offsets[pos+1]])
+
+    postings_slices.sort(key=len)
+
+    candidates = set(postings_slices[0])
+    for postings_slice in postings_slices[1:]:
+        if not candidates:
+            break
+        candidates.intersection_update(postings_slice)
+
+    return candidates
+
+#####################################################################
+#nodes index - filestructure entries reachable by filename index
+
+def build_nodes_index(filestructure,filenames_quant):
+    LUT_decode_loc = LUT_decode
+
+    names = array('I')
+    names_append = names.append
+    parents = array('i')
+    parents_append = parents.append
+    positions = array('I')
+    positions_append = positions.append
+
+    #breadth-first order, same nodes numbering as in filestructure columns
+    queue = [(filestructure[4],-1)]
+    queue_append = queue.append
+
+    for sub_data,parent in queue:
+        for pos,data_entry in enumerate(sub_data):
+            node = len(names)
+            names_append(data_entry[0])
+            parents_append(parent)
+            positions_append(pos)
+
+            if LUT_decode_loc[data_entry[1]][5]:
+                queue_append( (data_entry[4],node) )
+
+    return nodes_index_postings(names,parents,positions,filenames_quant)
+
+def build_nodes_index_columns(columns,filenames_quant):
+    root_child_count,names = columns[3:5]
+    first_child,child_count = columns[8:10]
+
+    #children of consecutive nodes are consecutive in breadth-first order
+    parents = array('i',[-1])*root_child_count
+    parents_extend = parents.extend
+    positions = array('I',range(root_child_count))
+    positions_extend = positions.extend
+
+    for node,count in enumerate(child_count):
+        if count:
+            parents_extend(array('i',[node])*count)
+            positions_extend(range(count))
+
+    return nodes_index_postings(names,parents,positions,filenames_quant)
+
+def nodes_index_postings(names,parents,positions,filenames_quant):
+    counts = [0]*filenames_quant
+    for name_nr in names:
+        counts[name_nr]+=1
+
+    offsets = array('I',[0])
+    offsets.extend(accumulate(counts))
+    postings = array('I',sorted(range(len(names)),key=names.__getitem__))
+
+    return (parents,positions,offsets,postings)
+
+#####################################################################
+#filestructure columns - flat arrays instead of nested tuples
+#nodes in breadth-first order, children of node are nodes first_child ... first_child+child_count-1
+
+def filestructure_to_columns(filestructure):
+    LUT_decode_loc = LUT_decode
+
+    names = array('I')
+    codes = array('H')
+    sizes = array('q')
+    mtimes = array('q')
+    first_child = array('I')
+    child_count = array('I')
+    cd_index = array('i')
+
+    names_append = names.append
+    codes_append = codes.append
+    sizes_append = sizes.append
+    mtimes_append = mtimes.append
+    first_child_append = first_child.append
+    child_count_append = child_count.append
+    cd_index_append = cd_index.append
+
+    root_sub_data = filestructure[4]
+    next_first_child = len(root_sub_data)
+
+    queue = [root_sub_data]
+    queue_append = queue.append
+
+    for sub_data in queue:
+        for data_entry in sub_data:
+            name_nr,code,size,mtime = data_entry[0:4]
+
+            names_append(name_nr)
+            codes_append(code)
+            sizes_append(size)
+            mtimes_append(mtime)
+
+            is_dir,is_file,is_symlink,is_bind,has_cd,has_files,cd_ok,cd_aborted,cd_empty,cd_truncated = LUT_decode_loc[code]
+
+            elem_index=4
+            if has_files:
+                sub_sub_data = data_entry[elem_index]
+                elem_index+=1
+
+                sub_sub_data_len = len(sub_sub_data)
+                first_child_append(next_first_child)
+                child_count_append(sub_sub_data_len)
+                next_first_child += sub_sub_data_len
+                queue_append(sub_sub_data)
+            else:
+                first_child_append(0)
+                child_count_append(0)
+
+            cd_index_append(data_entry[elem_index] if has_cd else -1)
+
+    return (filestructure[1],filestructure[2],filestructure[3],len(root_sub_data),names,codes,sizes,mtimes,first_child,child_count,cd_index)
+
+def columns_to_filestructure(columns):
+    LUT_decode_loc = LUT_decode
+
+    root_code,root_size,root_mtime,root_child_count,names,codes,sizes,mtimes,first_child,child_count,cd_index = columns
+
+    entries = [None]*len(names)
+    for node in range(len(names)-1,-1,-1):
+        code = codes[node]
+        is_dir,is_file,is_symlink,is_bind,has_cd,has_files,cd_ok,cd_aborted,cd_empty,cd_truncated = LUT_decode_loc[code]
+
+        entry = [names[node],code,sizes[node],mtimes[node]]
+        if has_files:
+            first = first_child[node]
+            entry.append(tuple(entries[first:first+child_count[node]]))
+        if has_cd:
+            entry.append(cd_index[node])
+
+        entries[node] = tuple(entry)
+
+    return ('',root_code,root_size,root_mtime,tuple(entries[0:root_child_count]))
+
+def remove_cd_columns(columns):
+    LUT_decode_loc = LUT_decode
+    LUT_encode_loc = LUT_encode
+
+    root_code,root_size,root_mtime,root_child_count,names,codes,sizes,mtimes,first_child,child_count,cd_index = columns
+
+    new_codes = array('H')
+    new_codes_append = new_codes.append
+    for code in codes:
+        is_dir,is_file,is_symlink,is_bind,has_cd,has_files,cd_ok,cd_aborted,cd_empty,cd_truncated = LUT_decode_loc[code]
+        new_codes_append(LUT_encode_loc[ (is_dir,is_file,is_symlink,is_bind,False,has_files,False,cd_aborted,cd_empty,cd_truncated) ])
+
+    return (root_code,root_size,root_mtime,root_child_count,names,new_codes,sizes,mtimes,first_child,child_count,array('i',[-1])*len(names))
+
+#####################################################################
+#uncompressed arrays layout, usable directly from memory mapped file
+#magic, ints quantity, arrays quantity, ints, (typecode,length) of every array, arrays data aligned to 8 bytes
+
+ARRAYS_MAGIC = b'LBRARRS1'
+ARRAYS_ALIGN = 8
+
+def pack_arrays(ints,arrays):
+    parts = [ARRAYS_MAGIC,pack('<QQ',len(ints),len(arrays)),pack(f'<{len(ints)}q',*ints)]
+    parts_append = parts.append
+
+    for arr in arrays:
+        parts_append(pack('<cxxxxxxxQ',(arr.format if isinstance(arr,memoryview) else arr.typecode).encode(),len(arr)))
+
+    for arr in arrays:
+        arr_bytes = arr.tobytes()
+        parts_append(arr_bytes)
+        parts_append(bytes(-len(arr_bytes) % ARRAYS_ALIGN))
+
+    return b''.join(parts)
+
+def unpack_arrays(buffer):
+    buffer = memoryview(buffer)
+
+    if buffer[0:8]!=ARRAYS_MAGIC:
+        raise ValueError('arrays layout magic mismatch')
+
+    ints_quant,arrays_quant = unpack_from('<QQ',buffer,8)
+    pos = 24
+    ints = unpack_from(f'<{ints_quant}q',buffer,pos)
+    pos += 8*ints_quant
+
+    arrays_info = [unpack_from('<cxxxxxxxQ',buffer,pos+16*i) for i in range(arrays_quant)]
+    pos += 16*arrays_quant
+
+    arrays = []
+    arrays_append = arrays.append
+    for typecode,length in arrays_info:
+        typecode = typecode.decode()
+        itemsize = array(typecode).itemsize
+        arrays_append(buffer[pos:pos+length*itemsize].cast(typecode))
+        pos += length*itemsize
+        pos += -pos % ARRAYS_ALIGN
+
+    return ints,arrays
+
+def writestr_aligned(zip_file,datalabel,data):
+    #stored (not compressed) member with data start aligned by extra field padding
+    zinfo = ZipInfo(datalabel,date_time=localtime(time())[:6])
+    zinfo.compress_type = ZIP_STORED
+
+    data_offset = zip_file.fp.tell() + 30 + len(datalabel.encode()) + 4
+    if len(data)*1.05 > ZIP64_LIMIT:
+        data_offset += 20
+
+    zinfo.extra = pack('<HH',0xD935,-data_offset % ARRAYS_ALIGN) + bytes(-data_offset % ARRAYS_ALIGN)
+    zip_file.writestr(zinfo,data)
+
+def member_data_offset(file_obj,zinfo):
+    file_obj.seek(zinfo.header_offset)
+    local_header = file_obj.read(30)
+    name_len,extra_len = unpack_from('<HH',local_header,26)
+    return zinfo.header_offset + 30 + name_len + extra_len
+
+def columns_to_arrays_layout(columns):
+    return pack_arrays(columns[0:4],columns[4:])
+
+def arrays_layout_to_columns(buffer):
+    ints,arrays = unpack_arrays(buffer)
+    return (*ints,*arrays)
+
+#####################################################################
+#zstd seekable format: independent frames + skippable frame with seek table
+#customdata is split into chunks of CD_CHUNK_ITEMS elements, one frame per chunk
+
+ZSTD_SKIPPABLE_MAGIC = 0x184D2A5E
+ZSTD_SEEKABLE_MAGIC = 0x8F92EAB1
+CD_CHUNK_ITEMS = 128
+
+def compress_seekable(chunks,compressor):
+    frames = []
+    frames_append = frames.append
+    seek_table = []
+    seek_table_append = seek_table.append
+    compressor_compress = compressor.compress
+
+    for chunk in chunks:
+        frame = compressor_compress(chunk)
+        frames_append(frame)
+        seek_table_append(pack('<II',len(frame),len(chunk)))
+
+    seek_table_append(pack('<IBI',len(frames),0,ZSTD_SEEKABLE_MAGIC))
+    seek_table_bytes = b''.join(seek_table)
+    frames_append(pack('<II',ZSTD_SKIPPABLE_MAGIC,len(seek_table_bytes)))
+    frames_append(seek_table_bytes)
+
+    return b''.join(frames)
+
+def seekable_frames(read_func,size):
+    frames_quant,descriptor,magic = unpack_from('<IBI',read_func(size-9,9))
+    if magic!=ZSTD_SEEKABLE_MAGIC:
+        raise ValueError('zstd seek table magic mismatch')
+
+    entry_size = 12 if descriptor & 0x80 else 8
+    seek_table = read_func(size-9-frames_quant*entry_size,frames_quant*entry_size)
+
+    frames = []
+    frames_append = frames.append
+    pos = 0
+    for frame_nr in range(frames_quant):
+        frame_size = unpack_from('<I',seek_table,frame_nr*entry_size)[0]
+        frames_append((pos,frame_size))
+        pos += frame_size
+
+    return frames
+
+#exclude expressions: name globs, full path globs (containing path separator), trailing separator - folders only
+def compile_exclude(exclude):
+    names = set()
+    names_globs = []
+    folders_names = set()
+    folders_names_globs = []
+    paths_globs = []
+    folders_paths_globs = []
+
+    for expr in exclude:
+        if windows:
+            expr = expr.replace('/',sep)
+
+        folders_only = expr.endswith(sep) or expr.endswith('/')
+        expr = expr.rstrip('/'+sep)
+        if not expr:
+            continue
+
+        if sep in expr or '/' in expr:
+            (folders_paths_globs if folders_only else paths_globs).append(expr)
+        elif any(magic in expr for magic in '*?['):
+            (folders_names_globs if folders_only else names_globs).append(expr)
+        else:
+            (folders_names if folders_only else names).add(expr)
+
+    def globs_match(globs):
+        return re_compile('|'.join(translate(glob) for glob in globs)).match if globs else None
+
+    names_match = globs_match(names_globs)
+    folders_names_match = globs_match(folders_names_globs)
+    paths_match = globs_match(paths_globs)
+    folders_paths_match = globs_match(folders_paths_globs)
+    check_folders = bool(folders_names or folders_names_match or folders_paths_match)
+    check_paths = bool(paths_match or folders_paths_match)
+
+    def excluded(entry_name,entry,path):
+        if entry_name in names or (names_match and names_match(entry_name)):
+            return True
+
+        if check_paths:
+            full_path = path_join(path,entry_name)
+            if windows:
+                full_path = full_path.upper()
+            if paths_match and paths_match(full_path):
+                return True
+        else:
+            full_path = None
+
+        if check_folders and entry.is_dir(follow_symlinks=False):
+            if entry_name in folders_names or (folders_names_match and folders_names_match(entry_name)):
+                return True
+            if folders_paths_match and folders_paths_match(full_path):
+                return True
+
+        return False
+
+    return excluded
+
+#CDE rules: expressions of every rule in one regex, rules prefiltered by extension required by expression literal tail
+def glob_ext(expr):
+    tail = expr[max(expr.rfind(magic) for magic in '*?[]')+1:]
+    tail_name = tail[tail.rfind(sep)+1:]
+    dot = tail_name.rfind('.')
+    return tail_name[dot:] if dot>=0 else None
+
+def compile_cde_rules(cde_list):
+    rules = []
+    ext_rules = defaultdict(set)
+    generic_rules = set()
+
+    for rule_nr,rule in enumerate(cde_list):
+        expressions,use_smin,smin_int,use_smax,smax_int = rule[0:5]
+        expressions_normcased = [normcase(expr) for expr in expressions]
+        for expr in expressions_normcased:
+            if (ext:=glob_ext(expr)) is None:
+                generic_rules.add(rule_nr)
+            else:
+                ext_rules[ext].add(rule_nr)
+
+        rules.append( (use_smin,smin_int,use_smax,smax_int,re_compile('|'.join(translate(expr) for expr in expressions_normcased)).match if expressions_normcased else None) )
+
+    candidates_cache = {}
+
+    def match(entry_name,size,full_path_func):
+        entry_name = normcase(entry_name)
+        dot = entry_name.rfind('.')
+        ext = entry_name[dot:] if dot>=0 else ''
+
+        try:
+            candidates = candidates_cache[ext]
+        except KeyError:
+            candidates = candidates_cache[ext] = tuple(sorted(generic_rules.union(ext_rules.get(ext,()))))
+
+        full_path = None
+        for rule_nr in candidates:
+            use_smin,smin_int,use_smax,smax_int,rule_match = rules[rule_nr]
+            if use_smin and size<smin_int:
+                continue
+            if use_smax and size>smax_int:
+                continue
+            if rule_match:
+                if full_path is None:
+                    full_path = normcase(full_path_func())
+                if rule_match(full_path):
+                    return rule_nr
+
+        return -1
+
+    return match
+
+#parallelism limit doesn't affect extracted data
+def cde_rule_key(rule):
+    return tuple(tuple(elem) if isinstance(elem,list) else elem for elem in rule[0:10]) + (cde_rule_batch(rule) if cde_rule_batch(rule)[0] else ()) + (cde_rule_output_caps(rule) if any(cde_rule_output_caps(rule)) else ())
+
+#rules of older records have no parallelism limit, batch and output caps fields
+def cde_rule_max_threads(rule):
+    return rule[10] if len(rule)>10 else 0
+
+def cde_rule_batch(rule):
+    return (rule[11],rule[12]) if len(rule)>12 else (0,False)
+
+def cde_rule_output_caps(rule):
+    return (rule[13],rule[14]) if len(rule)>14 else (0,0)
+
+#repository level custom data cache: (rule digest,size,mtime,partial hash) -> (returncode,output,truncated)
+#dict order is the order of use, least recently used first
+def cde_cache_load(cache_file):
+    try:
+        with open(cache_file,'rb') as f:
+            return loads(ZstdDecompressor().decompress(f.read()))
+    except Exception:
+        return {}
+
+def cde_cache_save(cache,cache_file,max_size=CDE_CACHE_MAX_SIZE):
+    cache_size = sum(len(output) for returncode,output,truncated in cache.values())
+    for key in list(cache):
+        if cache_size<=max_size:
+            break
+        cache_size -= len(cache.pop(key)[1])
+
+    temp_file = cache_file + '.temp'
+    with open(temp_file,'wb') as f:
+        f.write(ZstdCompressor(level=9,threads=-1).compress(dumps(cache)))
+
+    os_replace(temp_file,cache_file)
+
+def cde_rule_digest(rule):
+    return blake2b(repr(cde_rule_key(rule)).encode(),digest_size=8).digest()
+
+#first and last chunk of file
+def partial_hash(full_file_path,size):
+    hasher = blake2b(digest_size=16)
+    with open(full_file_path,'rb') as f:
+        hasher.update(f.read(CDE_CACHE_HASH_CHUNK))
+        if size>CDE_CACHE_HASH_CHUNK:
+            f.seek(max(size-CDE_CACHE_HASH_CHUNK,CDE_CACHE_HASH_CHUNK))
+            hasher.update(f.read())
+    return hasher.digest()
+
+#the same cut regardless of how much of the output was read before the cap was hit
+def cap_output(output,max_bytes,max_lines):
+    truncated = False
+    if max_lines:
+        output_lines = output.split('\n')
+        if len(output_lines)>max_lines:
+            output = '\n'.join(output_lines[0:max_lines]).strip()
+            truncated = True
+
+    if max_bytes:
+        output_encoded = output.encode('utf-8')
+        if len(output_encoded)>max_bytes:
+            output = output_encoded[0:max_bytes].decode('utf-8','ignore').strip()
+            truncated = True
+
+    return output,truncated
+
+#batch output protocol: one line per file or json array with one element per file, in order of files in command
+def split_batch_output(output,files_quant,json_format):
+    if json_format:
+        try:
+            elems = json_loads(output)
+        except Exception:
+            return None
+
+        if isinstance(elems,list) and len(elems)==files_quant:
+            return [json_dumps(elem,indent=1,ensure_ascii=False) for elem in elems]
+        return None
+
+    lines = output.split('\n')
+    return [line.strip() for line in lines] if len(lines)==files_quant else None
+
+#complete leading elements of capped batch output and the partial rest
+def split_truncated_batch_output(output,files_quant,json_format):
+    if json_format:
+        complete = []
+        output = output.strip()
+        if output.startswith('['):
+            raw_decode = JSONDecoder().raw_decode
+            output_len = len(output)
+            pos = 1
+            try:
+                while len(complete)<files_quant:
+                    while pos<output_len and output[pos] in ' \t\r\n':
+                        pos+=1
+                    elem,pos = raw_decode(output,pos)
+                    while pos<output_len and output[pos] in ' \t\r\n':
+                        pos+=1
+                    #element without following separator may be cut
+                    if pos<output_len and output[pos] in ',]':
+                        complete.append(json_dumps(elem,indent=1,ensure_ascii=False))
+                        pos+=1
+                    else:
+                        break
+            except Exception:
+                pass
+        return complete,''
+
+    lines = output.split('\n')
+    if len(lines)>files_quant:
+        return None
+    return [line.strip() for line in lines[:-1]],lines[-1].strip()
+
 def get_command(executable,parameters,full_file_path,shell):
+    return get_batch_command(executable,parameters,[full_file_path],shell)
+
+#every parameter with path indicator is repeated for every file
+def get_batch_command(executable,parameters,full_file_paths,shell):
     if shell:
+        paths_quoted = ' '.join(f'"{full_file_path}"' for full_file_path in full_file_paths)
         if PARAM_INDICATOR_SIGN in executable:
-            res = executable.replace(f'"{PARAM_INDICATOR_SIGN}"',PARAM_INDICATOR_SIGN).replace(f"'{PARAM_INDICATOR_SIGN}'",PARAM_INDICATOR_SIGN).replace(PARAM_INDICATOR_SIGN,f'"{full_file_path}"')
+            res = executable.replace(f'"{PARAM_INDICATOR_SIGN}"',PARAM_INDICATOR_SIGN).replace(f"'{PARAM_INDICATOR_SIGN}'",PARAM_INDICATOR_SIGN).replace(PARAM_INDICATOR_SIGN,paths_quoted)
         else:
-            res = executable + ' ' + f'"{full_file_path}"'
+            res = executable + ' ' + paths_quoted
         return res,res
 
     if not parameters:
-        res = [executable.strip()] + [full_file_path]
+        res = [executable.strip()] + full_file_paths
     elif PARAM_INDICATOR_SIGN not in parameters:
-        res = [executable.strip()] + parameters.strip().split() + [full_file_path]
+        res = [executable.strip()] + parameters.strip().split() + full_file_paths
     else:
-        res = [executable.strip()] + [p_elem.replace(PARAM_INDICATOR_SIGN,full_file_path) for p_elem in parameters.replace(f'"{PARAM_INDICATOR_SIGN}"',PARAM_INDICATOR_SIGN).replace(f"'{PARAM_INDICATOR_SIGN}'",PARAM_INDICATOR_SIGN).strip().split() if p_elem]
+        res = [executable.strip()]
+        for p_elem in parameters.replace(f'"{PARAM_INDICATOR_SIGN}"',PARAM_INDICATOR_SIGN).replace(f"'{PARAM_INDICATOR_SIGN}'",PARAM_INDICATOR_SIGN).strip().split():
+            if PARAM_INDICATOR_SIGN in p_elem:
+                res.extend(p_elem.replace(PARAM_INDICATOR_SIGN,full_file_path) for full_file_path in full_file_paths)
+            elif p_elem:
+                res.append(p_elem)
 
     return res,' '.join(res)
 
@@ -221,6 +1026,10 @@ def popen_win(command,shell,stdin=DEVNULL):
 def popen_lin(command,shell,stdin=DEVNULL):
     return Popen(command, stdout=PIPE, stderr=STDOUT,stdin=stdin,shell=shell,text=True,universal_newlines=True,bufsize=-1,errors='ignore',start_new_session=True, encoding='utf-8')
 
+#raw output for event driven reading
+def popen_lin_bytes(command,shell):
+    return Popen(command, stdout=PIPE, stderr=STDOUT,stdin=DEVNULL,shell=shell,bufsize=0,start_new_session=True)
+
 uni_popen = (lambda command,shell=False,stdin=DEVNULL : popen_win(command,shell,stdin)) if windows else (lambda command,shell=False,stdin=DEVNULL : popen_lin(command,shell,stdin))
 
 def send_signal(subproc,temp_dir,kind=0):
@@ -251,17 +1060,58 @@ def kill_subprocess( subproc,print_func=lambda x,force=None : print(x) ):
     except Exception as ke:
         print_func( ('error',f'kill_subprocess error: {ke}'),True )
 
+def compress_section(data,compression,chunked=False):
+    #pickling and compression only, zstd releases GIL so sections can be compressed in parallel threads
+    t0 = perf_counter()
+    if chunked:
+        chunks = [dumps(data[index:index+CD_CHUNK_ITEMS]) for index in range(0,len(data),CD_CHUNK_ITEMS)]
+        data_ser_len = sum(map(len,chunks))
+        data_ser_compr = compress_seekable(chunks,ZstdCompressor(level=compression,threads=0))
+    else:
+        data_ser = dumps(data)
+        data_ser_len = len(data_ser)
+        data_ser_compr = ZstdCompressor(level=compression,threads=-1).compress(data_ser)
+
+    return data_ser_compr,data_ser_len,perf_counter()-t0
+
+def section_header_update(header,data,datalabel,data_ser_compr,data_ser_len,tdiff):
+    header.zipinfo[datalabel]=(len(data_ser_compr),data_ser_len,graph_size(data))
+    header.compression_time[datalabel] = tdiff
+
 def compress_with_header_update(header,data,compression,datalabel,zip_file):
+    data_ser_compr,data_ser_len,tdiff = compress_section(data,compression)
+    section_header_update(header,data,datalabel,data_ser_compr,data_ser_len,tdiff)
+    zip_file.writestr(datalabel,data_ser_compr)
+
+def store_with_header_update(header,data_bytes,datalabel,zip_file):
     t0 = perf_counter()
-    data_ser = dumps(data)
-    data_ser_compr = ZstdCompressor(level=compression,threads=-1).compress(data_ser)
+    writestr_aligned(zip_file,datalabel,data_bytes)
     t1 = perf_counter()
-    tdiff=t1-t0
 
-    header.zipinfo[datalabel]=(asizeof(data_ser_compr),asizeof(data_ser),asizeof(data))
-    header.compression_time[datalabel] = tdiff
+    header.zipinfo[datalabel]=(len(data_bytes),len(data_bytes),len(data_bytes))
+    header.compression_time[datalabel] = t1-t0
+
+def compress_chunked_with_header_update(header,data,compression,datalabel,zip_file):
+    data_ser_compr,data_ser_len,tdiff = compress_section(data,compression,chunked=True)
+    section_header_update(header,data,datalabel,data_ser_compr,data_ser_len,tdiff)
     zip_file.writestr(datalabel,data_ser_compr)
 
+def decompress_chunked(data_ser_compr):
+    data_ser_compr = memoryview(data_ser_compr)
+    dec_dec = ZstdDecompressor().decompress
+    data = []
+    data_extend = data.extend
+    for pos,frame_size in seekable_frames(lambda pos,size : data_ser_compr[pos:pos+size],len(data_ser_compr)):
+        data_extend(loads(dec_dec(data_ser_compr[pos:pos+frame_size])))
+    return data
+
+def copy_section(src_zip_file,zip_file,datalabel,aligned=False):
+    if datalabel in src_zip_file.namelist():
+        if aligned:
+            writestr_aligned(zip_file,datalabel,src_zip_file.read(datalabel))
+        else:
+            zip_file.writestr(datalabel,src_zip_file.read(datalabel))
+
 WINDOWS_RESERVED_NAMES = {
     "CON", "PRN", "AUX", "NUL",
     *(f"COM{i}" for i in range(1, 10)),
@@ -294,11 +1144,21 @@ CREATION_CODE = 0
 EXPORT_CODE = 1
 IMPORT_CODE = 2
 REPACK_CODE = 3
+UPDATE_CODE = 4
 
-hist_code_2_str={CREATION_CODE:'creation ',EXPORT_CODE:'export   ',IMPORT_CODE:'import   ',REPACK_CODE:'repack   '}
+hist_code_2_str={CREATION_CODE:'creation ',EXPORT_CODE:'export   ',IMPORT_CODE:'import   ',REPACK_CODE:'repack   ',UPDATE_CODE:'update   '}
 
 #######################################################################
 class Header :
+    #'filestructure' section stored as columns (see filestructure_to_columns)
+    filestructure_columns = False
+    #'filestructure' and 'nodesindex' sections stored uncompressed and aligned, memory mapped on load (implies columns)
+    filestructure_mapped = False
+    #'customdata' section in zstd seekable format, chunks of CD_CHUNK_ITEMS elements
+    customdata_chunked = False
+    cde_threads_stats = ()
+    cde_cache_hits = 0
+
     def __init__(self,label='',scan_path=''):
         self.label=label
         self.scan_path = scan_path
@@ -353,7 +1213,9 @@ class LibrerRecord:
 
         self.filestructure = ()
         self.customdata = []
+        self.customdata_chunks_cache = {}
         self.filenames = []
+        self.update_helper = {}
 
         self.find_results = []
         self.find_results_tuples_set=set()
@@ -363,9 +1225,40 @@ class LibrerRecord:
         self.file_name = ''
         self.file_path = ''
 
+        self.mmaps = []
+
     def find_results_clean(self):
         self.find_results = []
 
+    #find results paths are tuples of filenames indexes (search pool) or tuples of names (debug mode)
+    find_results_by_index = False
+
+    def find_result_path(self,res_item):
+        if self.find_results_by_index:
+            self.decompress_filenames()
+            self_filenames = self.filenames
+            return tuple([self_filenames[name_nr] for name_nr in res_item])
+
+        return res_item
+
+    def find_result_key(self,path):
+        if self.find_results_by_index:
+            self.decompress_filenames()
+            self_filenames = self.filenames
+            filenames_len = len(self_filenames)
+
+            key = []
+            for name in path:
+                #filenames are sorted
+                name_nr = bisect_left(self_filenames,name)
+                if name_nr==filenames_len or self_filenames[name_nr]!=name:
+                    return None
+                key.append(name_nr)
+
+            return tuple(key)
+
+        return tuple(path)
+
     def abort(self):
         self.abort_action = True
 
@@ -378,7 +1271,7 @@ class LibrerRecord:
                 header_ser_compr = zip_file.read('header')
                 header_ser = ZstdDecompressor().decompress(header_ser_compr)
                 self.header = loads( header_ser )
-                self.header.zipinfo["header"]=(asizeof(header_ser_compr),asizeof(header_ser),asizeof(self.header))
+                self.header.zipinfo["header"]=(len(header_ser_compr),len(header_ser),graph_size(self.header))
 
             if self.header.data_format_version != DATA_FORMAT_VERSION:
                 return f'loading "{file_path}" error: incompatible data format version: {self.header.data_format_version} vs {DATA_FORMAT_VERSION}'
@@ -390,8 +1283,8 @@ class LibrerRecord:
 
         return False
 
-    label_of_datalabel = {'filestructure':'Filestructure','filenames':'Filenames','customdata':'Custom Data','header':'Header'}
-    def save(self,print_func,file_path=None,compression_level=9):
+    label_of_datalabel = {'filestructure':'Filestructure','filenames':'Filenames','filenamesindex':'Filenames Index','nodesindex':'Nodes Index','customdata':'Custom Data','customdataindex':'Custom Data Index','header':'Header'}
+    def save(self,print_func,file_path=None,compression_level=9,index_customdata=False,columns=False,mapped=False):
         self_header = self.header
 
         if file_path:
@@ -405,73 +1298,118 @@ class LibrerRecord:
         self_header.compression_level = compression_level
 
         self_label_of_datalabel = self.label_of_datalabel
-        with ZipFile(file_path, "w") as zip_file:
-            def compress_with_header_update_wrapp(data,datalabel):
-                print_func(('save',f'Compressing {self_label_of_datalabel[datalabel]} ({bytes_to_str(asizeof(data))})'),True)
-                compress_with_header_update(self_header,data,compression_level,datalabel,zip_file)
 
-            compress_with_header_update_wrapp(self.filestructure,'filestructure')
+        #sections pickled and compressed by pool of threads while next sections are prepared, written in order of submission
+        sections = []
+        sections_append = sections.append
+        with ZipFile(file_path, "w") as zip_file, ThreadPool(min(SAVE_THREADS,cpu_count() or 1)) as pool:
+            pool_apply_async = pool.apply_async
+            def compress_async(data,datalabel,chunked=False):
+                print_func(('save',f'Compressing {self_label_of_datalabel[datalabel]}{graph_size_info(data)}'),True)
+                sections_append( (datalabel,data if SIZE_DIAGNOSTICS else None,pool_apply_async(compress_section,(data,compression_level,chunked))) )
+
+            #streaming creation builds filestructure columns directly
+            streamed = not self.filestructure and bool(self.filestructure_columns)
+
+            if mapped:
+                self_header.filestructure_columns = True
+                self_header.filestructure_mapped = True
+
+                print_func(('save','Storing Filestructure'),True)
+                store_with_header_update(self_header,columns_to_arrays_layout(self.filestructure_columns if streamed else filestructure_to_columns(self.filestructure)),'filestructure',zip_file)
+
+                print_func(('save','Indexing Nodes'),True)
+                store_with_header_update(self_header,pack_arrays((),build_nodes_index_columns(self.filestructure_columns,len(self.filenames)) if streamed else build_nodes_index(self.filestructure,len(self.filenames))),'nodesindex',zip_file)
+            elif streamed:
+                self_header.filestructure_columns = True
+                compress_async(self.filestructure_columns,'filestructure')
+
+                print_func(('save','Indexing Nodes'),True)
+                compress_async(build_nodes_index_columns(self.filestructure_columns,len(self.filenames)),'nodesindex')
+            else:
+                if columns:
+                    self_header.filestructure_columns = True
+                    compress_async(filestructure_to_columns(self.filestructure),'filestructure')
+                else:
+                    compress_async(self.filestructure,'filestructure')
+
+                print_func(('save','Indexing Nodes'),True)
+                compress_async(build_nodes_index(self.filestructure,len(self.filenames)),'nodesindex')
+
+            compress_async(self.filenames,'filenames')
 
-            compress_with_header_update_wrapp(self.filenames,'filenames')
+            if self.customdata:
+                self_header.customdata_chunked = True
+                compress_async(self.customdata,'customdata',True)
+
+            print_func(('save','Indexing Filenames'),True)
+            compress_async(build_trigram_index(self.filenames),'filenamesindex')
 
             if self.customdata:
-                compress_with_header_update_wrapp(self.customdata,'customdata')
+                if index_customdata:
+                    print_func(('save','Indexing Custom Data'),True)
+                    compress_async(build_trigram_index(cd_elem[2] for cd_elem in self.customdata),'customdataindex')
             else:
                 self_header.zipinfo['customdata'] = (0,0,0)
 
-            compress_with_header_update_wrapp(self_header,'header')
+            for datalabel,data,async_res in sections:
+                data_ser_compr,data_ser_len,tdiff = async_res.get()
+                section_header_update(self_header,data,datalabel,data_ser_compr,data_ser_len,tdiff)
+                zip_file.writestr(datalabel,data_ser_compr)
+
+            del sections
+
+            #header last, with sizes and times of all sections
+            print_func(('save',f'Compressing {self_label_of_datalabel["header"]}'),True)
+            compress_with_header_update(self_header,self_header,compression_level,'header',zip_file)
 
         self.prepare_info()
 
         print_func(('save','finished'),True)
 
-    def scan_rec(self,print_func,abort_list,path, scan_like_data,filenames_set,check_dev=True,dev_call=None,include_hidden=False,exclude=None) :
-        #print(f'{exclude=}')
-        if any(abort_list) :
-            return True
-
+    def scan_dir(self,print_func,abort_list,path,scan_like_data,filenames_set_add,ext_stats,ext_stats_size,check_dev,dev_call,include_hidden,exclude):
+        #single folder listing, subfolders returned to the caller
         path_join_loc = path_join
 
-        local_folder_size_with_subtree=0
-        subitems=0
-
-        self_scan_rec = self.scan_rec
-
-        filenames_set_add = filenames_set.add
-        self_header_ext_stats = self.header.ext_stats
-        self_header_ext_stats_size = self.header.ext_stats_size
+        local_folder_size = 0
+        local_folder_files_count = 0
+        local_folder_folders_count = 0
+        subitems = 0
+        subfolders = []
+        subfolders_append = subfolders.append
 
         try:
             with scandir(path) as res:
-                local_folder_size = 0
-                local_folder_files_count = 0
-                local_folder_folders_count = 0
-
                 for entry in res:
                     if include_hidden or (not is_hidden(entry)):
                         entry_name = entry.name
 
-                        entry_name_to_check = entry_name.upper() if windows else entry_name
-                        #if (not bool(exclude) or entry_name_to_check not in exclude):
-                        if (not bool(exclude) or all([not fnmatch(entry_name_to_check,exclude_elem) for exclude_elem in exclude]) ):
+                        if not exclude or not exclude(entry_name.upper() if windows else entry_name,entry,path):
                             subitems+=1
                             if any(abort_list) :
                                 break
 
                             filenames_set_add(entry_name)
 
-                            is_dir,is_file,is_symlink = entry.is_dir(),entry.is_file(),entry.is_symlink()
-
-                            ext=pathlib_Path(entry).suffix
-
-                            if is_file:
-                                self_header_ext_stats[ext]+=1
+                            ext=name_ext(entry_name)
 
                             try:
-                                stat_res = stat(entry)
+                                #single lstat, flags from st_mode, target stat only for symlinks
+                                stat_res = entry_lstat(entry)
+                                st_fmt = S_IFMT(stat_res.st_mode)
+                                if st_fmt==S_IFLNK:
+                                    is_dir,is_file,is_symlink = entry.is_dir(),entry.is_file(),True
+                                    stat_res = stat(entry)
+                                else:
+                                    is_dir,is_file,is_symlink = st_fmt==S_IFDIR,st_fmt==S_IFREG,False
+
                                 mtime = int(stat_res.st_mtime)
                                 dev=stat_res.st_dev
                             except Exception as e:
+                                is_dir,is_file,is_symlink = entry.is_dir(),entry.is_file(),entry.is_symlink()
+                                if is_file:
+                                    ext_stats[ext]+=1
+
                                 print_func( ('error',f'stat {entry_name} error:{e}'),True )
                                 #size -1 <=> error, dev,in ==0
                                 is_bind = False
@@ -480,7 +1418,9 @@ class LibrerRecord:
                                 has_files = False
                                 scan_like_data[entry_name] = [size,is_dir,is_file,is_symlink,is_bind,has_files,mtime]
                             else:
-                                dict_entry={}
+                                if is_file:
+                                    ext_stats[ext]+=1
+
                                 is_bind=False
                                 if check_dev:
                                     if dev_call:
@@ -491,32 +1431,16 @@ class LibrerRecord:
                                     else:
                                         dev_call=dev
 
+                                has_files = False
                                 if is_dir:
-                                    if is_symlink :
-                                        has_files = False
-                                        size = 0
-                                    elif is_bind:
-                                        has_files = False
-                                        size = 0
-                                    else:
-                                        try:
-                                            size,sub_sub_items = self_scan_rec(print_func,abort_list,path_join_loc(path,entry_name),dict_entry,filenames_set,check_dev,dev,include_hidden,exclude)
-                                        except Exception as sre:
-                                            print_func( ('error',f'{path=},error:{sre=}'),True )
-                                            size,sub_sub_items=0,{}
-
-                                        has_files = bool(sub_sub_items)
-                                        local_folder_size_with_subtree += size
-
+                                    size = 0
                                     local_folder_folders_count += 1
                                 else:
                                     if is_symlink :
-                                        has_files = False
                                         size = 0
                                     else:
-                                        has_files = False
                                         size = int(stat_res.st_size)
-                                        self_header_ext_stats_size[ext]+=size
+                                        ext_stats_size[ext]+=size
 
                                         local_folder_size += size
 
@@ -524,24 +1448,225 @@ class LibrerRecord:
 
                                 temp_list_ref = scan_like_data[entry_name]=[size,is_dir,is_file,is_symlink,is_bind,has_files,mtime]
 
-                                if dict_entry:
-                                    temp_list_ref.append(dict_entry)
-
-                self_header = self.header
-                self_header.sum_size += local_folder_size
-                self_header.quant_files += local_folder_files_count
-                self_header.quant_folders += local_folder_folders_count
-
-                print_func( ('scan',self_header.sum_size,self_header.quant_files,self_header.quant_folders,path) )
+                                if is_dir and not is_symlink and not is_bind:
+                                    #size and has_files set by caller after subfolder scan
+                                    subfolders_append( (path_join_loc(path,entry_name),{},temp_list_ref,dev) )
 
-            return (local_folder_size_with_subtree+local_folder_size,subitems)
+            return local_folder_size,local_folder_files_count,local_folder_folders_count,subitems,subfolders,True
 
         except Exception as e:
             print_func( ('error', f'scandir {path} error:{e}'),True )
 
+            return local_folder_size,local_folder_files_count,local_folder_folders_count,subitems,subfolders,False
+
+    def scan_rec(self,print_func,abort_list,path, scan_like_data,filenames_set,check_dev=True,dev_call=None,include_hidden=False,exclude=None) :
+        #print(f'{exclude=}')
+        if any(abort_list) :
+            return True
+
+        self_header = self.header
+        local_folder_size,local_folder_files_count,local_folder_folders_count,subitems,subfolders,scan_ok = self.scan_dir(print_func,abort_list,path,scan_like_data,filenames_set.add,self_header.ext_stats,self_header.ext_stats_size,check_dev,dev_call,include_hidden,exclude)
+
+        local_folder_size_with_subtree=0
+        self_scan_rec = self.scan_rec
+
+        for sub_path,dict_entry,temp_list_ref,dev in subfolders:
+            try:
+                size,sub_sub_items = self_scan_rec(print_func,abort_list,sub_path,dict_entry,filenames_set,check_dev,dev,include_hidden,exclude)
+            except Exception as sre:
+                print_func( ('error',f'{path=},error:{sre=}'),True )
+                size,sub_sub_items=0,{}
+
+            temp_list_ref[0] = size
+            temp_list_ref[5] = bool(sub_sub_items)
+            local_folder_size_with_subtree += size
+
+            if dict_entry:
+                temp_list_ref.append(dict_entry)
+
+        if not scan_ok:
             return (local_folder_size_with_subtree,subitems)
 
-    def scan(self,print_func,abort_list,cde_list,check_dev=True,include_hidden=False,exclude_str=None):
+        self_header.sum_size += local_folder_size
+        self_header.quant_files += local_folder_files_count
+        self_header.quant_folders += local_folder_folders_count
+
+        print_func( ('scan',self_header.sum_size,self_header.quant_files,self_header.quant_folders,path) )
+
+        return (local_folder_size_with_subtree+local_folder_size,subitems)
+
+    def scan_parallel(self,print_func,abort_list,path,scan_like_data,filenames_set,check_dev=True,include_hidden=False,exclude=None,threads=2):
+        #folders listed by pool of threads taking jobs from shared stack, subtree sizes summed afterwards
+        self_header = self.header
+        self_scan_dir = self.scan_dir
+        filenames_set_add = filenames_set.add
+
+        jobs = deque([(path,scan_like_data,None,None)])
+        jobs_pop = jobs.pop
+        jobs_extend = jobs.extend
+
+        done = []
+        done_append = done.append
+        pending = [1]
+        lock = Condition()
+
+        all_threads_ext_stats = []
+        all_threads_ext_stats_size = []
+
+        def walker():
+            ext_stats = defaultdict(int)
+            ext_stats_size = defaultdict(int)
+            all_threads_ext_stats.append(ext_stats)
+            all_threads_ext_stats_size.append(ext_stats_size)
+
+            while True:
+                with lock:
+                    #abort set from outside without notify, checked at least every 0.1s
+                    while not jobs and pending[0] and not any(abort_list):
+                        lock.wait(0.1)
+
+                    if not jobs or any(abort_list):
+                        break
+
+                    sub_path,dict_entry,temp_list_ref,dev_call = jobs_pop()
+
+                local_folder_size,local_folder_files_count,local_folder_folders_count,subitems,subfolders,scan_ok = self_scan_dir(print_func,abort_list,sub_path,dict_entry,filenames_set_add,ext_stats,ext_stats_size,check_dev,dev_call,include_hidden,exclude)
+
+                if temp_list_ref:
+                    temp_list_ref[5] = bool(subitems)
+                    if dict_entry:
+                        temp_list_ref.append(dict_entry)
+
+                with lock:
+                    if scan_ok:
+                        self_header.sum_size += local_folder_size
+                        self_header.quant_files += local_folder_files_count
+                        self_header.quant_folders += local_folder_folders_count
+                        print_func( ('scan',self_header.sum_size,self_header.quant_files,self_header.quant_folders,sub_path) )
+
+                    done_append( (temp_list_ref,local_folder_size if scan_ok else 0,[subfolder[2] for subfolder in subfolders]) )
+                    jobs_extend(subfolders)
+                    pending[0] += len(subfolders)-1
+
+                    if subfolders or not pending[0]:
+                        lock.notify_all()
+
+        walker_threads = [Thread(target=walker,daemon=True) for i in range(threads)]
+        for thread in walker_threads:
+            thread.start()
+        for thread in walker_threads:
+            thread.join()
+
+        for ext_stats in all_threads_ext_stats:
+            for ext,val in ext_stats.items():
+                self_header.ext_stats[ext] += val
+        for ext_stats_size in all_threads_ext_stats_size:
+            for ext,val in ext_stats_size.items():
+                self_header.ext_stats_size[ext] += val
+
+        #children always after parent
+        for temp_list_ref,local_folder_size,subfolders_refs in reversed(done):
+            if temp_list_ref:
+                temp_list_ref[0] = local_folder_size + sum(sub_ref[0] for sub_ref in subfolders_refs)
+
+    def scan_stream(self,print_func,abort_list,path,filenames_set,subpath_list,check_dev=True,dev_call=None,include_hidden=False,exclude=None):
+        #scan_rec variant, folder entries spilled to temporary file after its subfolders, only current path kept in memory
+        if any(abort_list) :
+            return (0,None)
+
+        self_header = self.header
+        scan_like_data = {}
+        local_folder_size,local_folder_files_count,local_folder_folders_count,subitems,subfolders,scan_ok = self.scan_dir(print_func,abort_list,path,scan_like_data,filenames_set.add,self_header.ext_stats,self_header.ext_stats_size,check_dev,dev_call,include_hidden,exclude)
+
+        #custom data pool entries stay in memory, referenced from spill by number
+        cd_refs = {}
+        if self_header.cde_list:
+            pool_index,reused_quant = self.customdata_pool_index,len(self.customdata_reused)
+            self.prepare_customdata_pool_rec(print_func,abort_list,scan_like_data,subpath_list)
+
+            self_customdata_pool = self.customdata_pool
+            self_spill_cd_items = self.spill_cd_items
+            for items_list in [self_customdata_pool[index][0] for index in range(pool_index,self.customdata_pool_index)] + [reused[0] for reused in self.customdata_reused[reused_quant:]]:
+                cd_refs[id(items_list)] = len(self_spill_cd_items)
+                self_spill_cd_items.append(items_list)
+
+        local_folder_size_with_subtree=0
+        self_scan_stream = self.scan_stream
+
+        for sub_path,dict_entry,temp_list_ref,dev in subfolders:
+            try:
+                size,sub_chunk = self_scan_stream(print_func,abort_list,sub_path,filenames_set,subpath_list + [basename(sub_path)],check_dev,dev,include_hidden,exclude)
+            except Exception as sre:
+                print_func( ('error',f'{path=},error:{sre=}'),True )
+                size,sub_chunk=0,None
+
+            temp_list_ref[0] = size
+            temp_list_ref[5] = bool(sub_chunk)
+            local_folder_size_with_subtree += size
+
+            if sub_chunk:
+                temp_list_ref.append(sub_chunk)
+
+        chunk = None
+        if scan_like_data:
+            cd_refs_get = cd_refs.get
+            entries = [(entry_name,*items_list[0:7],items_list[7] if items_list[5] else None,cd_refs_get(id(items_list),-1)) for entry_name,items_list in scan_like_data.items()]
+
+            #(spill chunk number,entries quantity)
+            spill_offsets = self.spill_offsets
+            chunk = (len(spill_offsets),len(entries))
+            spill_offsets.append(self.spill.tell())
+            self.spill.write(dumps(entries))
+
+        if not scan_ok:
+            return (local_folder_size_with_subtree,chunk)
+
+        self_header.sum_size += local_folder_size
+        self_header.quant_files += local_folder_files_count
+        self_header.quant_folders += local_folder_folders_count
+
+        print_func( ('scan',self_header.sum_size,self_header.quant_files,self_header.quant_folders,path) )
+
+        return (local_folder_size_with_subtree+local_folder_size,chunk)
+
+    def prepare_update(self,print_func,prev_file_path):
+        #custom data of unchanged files (same size,mtime and rule) taken from previous record
+        prev_record = LibrerRecord()
+        if res:=prev_record.load(prev_file_path):
+            print_func( ('error',res),True )
+            return
+
+        print_func( ('info',f'update of:{prev_file_path}'),True)
+
+        prev_record.decompress_filestructure()
+        prev_record.decompress_customdata()
+
+        prev_filenames = prev_record.filenames
+        prev_customdata = prev_record.customdata
+        prev_rules_keys = [cde_rule_key(rule) for rule in prev_record.header.cde_list]
+        LUT_decode_loc = LUT_decode
+        sep_join=sep.join
+
+        update_helper = {}
+        stack = [([],prev_record.filestructure[4])]
+        while stack:
+            parent_path,sub_data = stack.pop()
+            for data_entry in sub_data:
+                is_dir,is_file,is_symlink,is_bind,has_cd,has_files,cd_ok,cd_aborted,cd_empty,cd_truncated = LUT_decode_loc[data_entry[1]]
+                subpath_list = parent_path + [prev_filenames[data_entry[0]]]
+
+                if has_files:
+                    stack.append( (subpath_list,data_entry[4]) )
+                elif has_cd and not cd_aborted:
+                    rule_nr,returncode,output = prev_customdata[data_entry[4]]
+                    update_helper[sep_join(subpath_list)] = (data_entry[2],data_entry[3],prev_rules_keys[rule_nr],cd_ok,cd_empty,cd_truncated,returncode,output)
+
+        self.update_helper = update_helper
+        self.header.history_stack.append( (UPDATE_CODE,int(time()),prev_record.header.label,0) )
+
+        del prev_record
+
+    def scan(self,print_func,abort_list,cde_list,check_dev=True,include_hidden=False,exclude_str=None,scan_threads=1,streaming=False,spill_dir=None):
         self.header.sum_size = 0
 
         self.header.ext_stats=defaultdict(int)
@@ -556,9 +1681,30 @@ class LibrerRecord:
             exclude_str=exclude_str.upper()
 
         exclude=tuple(exclude_str.split(';' if windows else ':')) if exclude_str else None
+        exclude_matcher=compile_exclude(exclude) if exclude else None
+
+        self.header.cde_list = cde_list
+        self.cd_stat=[0]*len(cde_list)
+
+        self.customdata_pool = {}
+        self.customdata_pool_index = 0
+        self.customdata_reused = []
+
+        if cde_list:
+            self.cde_rules_match = compile_cde_rules(cde_list)
 
         print_func( ('info',f'{exclude=}'),True )
-        self.scan_rec(print_func,abort_list,self.header.scan_path,self.scan_data,filenames_set,check_dev=check_dev,include_hidden=include_hidden,exclude=exclude)
+        if streaming:
+            self.spill = TemporaryFile(dir=spill_dir)
+            self.spill_offsets = array('Q')
+            self.spill_cd_items = []
+
+            size,self.spill_root = self.scan_stream(print_func,abort_list,self.header.scan_path,filenames_set,[],check_dev=check_dev,include_hidden=include_hidden,exclude=exclude_matcher)
+            self.spill_offsets.append(self.spill.tell())
+        elif scan_threads>1:
+            self.scan_parallel(print_func,abort_list,self.header.scan_path,self.scan_data,filenames_set,check_dev=check_dev,include_hidden=include_hidden,exclude=exclude_matcher,threads=scan_threads)
+        else:
+            self.scan_rec(print_func,abort_list,self.header.scan_path,self.scan_data,filenames_set,check_dev=check_dev,include_hidden=include_hidden,exclude=exclude_matcher)
 
         time_end = perf_counter()
 
@@ -570,16 +1716,12 @@ class LibrerRecord:
 
         self.filenames_helper = {fsname:fsname_index for fsname_index,fsname in enumerate(self.filenames)}
 
-        self.header.cde_list = cde_list
-        self.cd_stat=[0]*len(cde_list)
-
-        self.customdata_pool = {}
-        self.customdata_pool_index = 0
-
-        if cde_list:
+        if cde_list and not streaming:
             print_func( ('info','Estimating files pool for custom data extraction.'),True )
             self.prepare_customdata_pool_rec(print_func,abort_list,self.scan_data,[])
 
+        self.update_helper = {}
+
     def prepare_customdata_pool_rec(self,print_func,abort_list,scan_like_data,parent_path):
         self_header = self.header
         scan_path = self_header.scan_path
@@ -589,6 +1731,11 @@ class LibrerRecord:
         self_customdata_pool = self.customdata_pool
         sep_join=sep.join
 
+        cde_rules_match = self.cde_rules_match
+        update_helper_get = self.update_helper.get
+        rules_keys = [cde_rule_key(rule) for rule in cde_list] if self.update_helper else ()
+        self_customdata_reused_append = self.customdata_reused.append
+
         for entry_name,items_list in scan_like_data.items():
             size,is_dir,is_file,is_symlink,is_bind,has_files,mtime = items_list[0:7]
 
@@ -602,48 +1749,29 @@ class LibrerRecord:
                         if has_files:
                             self_prepare_customdata_pool_rec(print_func,abort_list,items_list[7],subpath_list)
                     else:
-                        subpath=sep_join(subpath_list)
-                        ############################
-
-                        full_file_path = normpath(abspath(sep_join([scan_path,subpath])))
-
-                        matched = False
-
-                        rule_nr=-1
-                        for expressions,use_smin,smin_int,use_smax,smax_int,executable,parameters,shell,timeout,crc in cde_list:
-                            if any(abort_list) :
-                                break
-                            if matched:
-                                break
-
-                            rule_nr+=1
+                        rule_nr = cde_rules_match(entry_name,size,lambda : normpath(abspath(sep_join([scan_path,sep_join(subpath_list)]))))
 
-                            if use_smin:
-                                if size<smin_int:
-                                    continue
-                            if use_smax:
-                                if size>smax_int:
-                                    continue
+                        if rule_nr>=0:
+                            subpath=sep_join(subpath_list)
 
-                            for expr in expressions:
-                                if any(abort_list) :
-                                    break
-                                if matched:
-                                    break
+                            prev_cd = update_helper_get(subpath)
+                            if prev_cd and prev_cd[0:3]==(size,mtime,rules_keys[rule_nr]):
+                                prev_size,prev_mtime,prev_rule_key,cd_ok,cd_empty,cd_truncated,returncode,output = prev_cd
+                                items_list.append({CD_OK_ID:cd_ok,CD_DATA_ID:(rule_nr,returncode,output),CD_ABORTED_ID:False,CD_EMPTY_ID:cd_empty,CD_TRUNCATED_ID:cd_truncated})
+                                self_customdata_reused_append( (items_list,subpath,rule_nr,size) )
+                            else:
+                                self_customdata_pool[self.customdata_pool_index]=(items_list,subpath,rule_nr,size)
+                                self.customdata_pool_index += 1
+                                self_header.files_cde_size_sum += size
 
-                                if fnmatch(full_file_path,expr):
-                                    self_customdata_pool[self.customdata_pool_index]=(items_list,subpath,rule_nr,size)
-                                    self.customdata_pool_index += 1
-                                    self.cd_stat[rule_nr]+=1
-                                    self_header.files_cde_size_sum += size
-                                    matched = True
+                            self.cd_stat[rule_nr]+=1
 
             except Exception as e:
                 #self.log.error('prepare_customdata_pool_rec error::%s',e )
                 #print('prepare_customdata_pool_rec',e,entry_name,size,is_dir,is_file,is_symlink,is_bind,has_files,mtime)
                 print_func( ('error','prepare_customdata_pool_rec:{e},{entry_name},{size},{is_dir},{is_file},{is_symlink},{is_bind},{has_files},{mtime}'),True )
 
-    def extract_customdata(self,print_func,abort_list,threads=0):
+    def extract_customdata(self,print_func,abort_list,threads=0,largest_first=False,event_driven=False,cache_file=None,cache_hash=False):
         self_header = self.header
         scan_path = self_header.scan_path
 
@@ -660,74 +1788,223 @@ class LibrerRecord:
         files_cde_size_sum = self_header.files_cde_size_sum
         cde_list = self.header.cde_list
 
+        customdata_pool_values = self.customdata_pool.values()
+
+        customdata_cached = []
+        cache_keys = {}
+        if cache_file:
+            cache = cde_cache_load(cache_file)
+            print_func( ('info',f'custom data cache:{len(cache)}'),True)
+
+            rules_digests = [cde_rule_digest(rule) for rule in cde_list]
+            cache_prefixes = {cache_key[0:3] for cache_key in cache}
+            customdata_pool_values_not_cached = []
+            CD_TRUNCATED_ID_loc = CD_TRUNCATED_ID
+            for val_tuple in customdata_pool_values:
+                scan_like_list,subpath,rule_nr,size = val_tuple
+                cache_prefix = (rules_digests[rule_nr],size,scan_like_list[6])
+                if cache_prefix not in cache_prefixes:
+                    #no candidate in cache, content hashed only when result is stored
+                    cache_keys[subpath] = cache_prefix
+                    customdata_pool_values_not_cached.append(val_tuple)
+                    continue
+
+                try:
+                    cache_key = cache_keys[subpath] = (*cache_prefix,partial_hash(sep.join([scan_path,subpath]),size) if cache_hash else None)
+                except Exception as he:
+                    print_func( ('error',f'partial hash error:{he}'),True )
+                    customdata_pool_values_not_cached.append(val_tuple)
+                    continue
+
+                if cache_key in cache:
+                    returncode,output,truncated = cache[cache_key] = cache.pop(cache_key)
+                    scan_like_list.append({CD_OK_ID:True,CD_DATA_ID:(rule_nr,returncode,output),CD_ABORTED_ID:False,CD_EMPTY_ID:False,CD_TRUNCATED_ID_loc:truncated})
+                    customdata_cached.append(val_tuple)
+                else:
+                    customdata_pool_values_not_cached.append(val_tuple)
+
+            customdata_pool_values = customdata_pool_values_not_cached
+            print_func( ('info',f'custom data cache hits:{len(customdata_cached)}'),True)
+
+        self_header.cde_cache_hits = len(customdata_cached)
+        if customdata_cached:
+            files_cde_quant_sum = self_header.files_cde_quant_sum = len(customdata_pool_values)
+            files_cde_size_sum = self_header.files_cde_size_sum = files_cde_size_sum - sum(val_tuple[3] for val_tuple in customdata_cached)
+
         print_func( ('cdeinit',files_cde_quant_sum,files_cde_size_sum),True)
 
         if threads==0:
             threads = cpu_count()
 
+        #selectors can't wait on pipes on windows
+        event_driven = event_driven and not windows
+
+        #shared queues per rule, every thread takes next file (or batch of files) of rule below its parallelism limit, processed files collected per thread
+        rules_max_threads = [cde_rule_max_threads(rule) or threads for rule in cde_list]
+        rules_batch = [cde_rule_batch(rule) for rule in cde_list]
+        rules_queues = defaultdict(deque)
+        for val_tuple in (sorted(customdata_pool_values,key=lambda val_tuple : val_tuple[3],reverse=True) if largest_first else customdata_pool_values):
+            rules_queues[val_tuple[2]].append(val_tuple)
+
+        rules_running = defaultdict(int)
+        queue_condition = Condition()
+
+        #most limited rules first - they are the bottleneck
+        def customdata_queue_next(wait=True):
+            with queue_condition:
+                while True:
+                    available = [rule_nr for rule_nr,rule_queue in rules_queues.items() if rule_queue and rules_running[rule_nr]<rules_max_threads[rule_nr]]
+                    if available:
+                        rule_nr = min(available,key=lambda rule_nr : (rules_max_threads[rule_nr],-rules_queues[rule_nr][0][3] if largest_first else rule_nr))
+                        rules_running[rule_nr]+=1
+                        rule_queue = rules_queues[rule_nr]
+                        rule_queue_popleft = rule_queue.popleft
+                        return rule_nr,[rule_queue_popleft() for i in range(min(max(rules_batch[rule_nr][0],1),len(rule_queue)))]
+
+                    if not wait or not any(rules_queues.values()):
+                        return None
+
+                    queue_condition.wait()
+
+        def customdata_queue_done(rule_nr):
+            with queue_condition:
+                rules_running[rule_nr]-=1
+                queue_condition.notify_all()
+
         customdata_pool_per_thread = defaultdict(list)
         timeout_semi_list_per_thread = { thread_index:[None] for thread_index in range(threads) }
-        self.killed = { thread_index:False for thread_index in range(threads) }
-
-        thread_index = 0
-        for val_tuple in self.customdata_pool.values():
-            customdata_pool_per_thread[thread_index].append(val_tuple)
-            thread_index+=1
-            thread_index %= threads
+        self_killed = self.killed = { thread_index:False for thread_index in range(threads) }
 
         CD_OK_ID_loc = CD_OK_ID
         CD_DATA_ID_loc = CD_DATA_ID
         CD_ABORTED_ID_loc = CD_ABORTED_ID
         CD_EMPTY_ID_loc = CD_EMPTY_ID
+        CD_TRUNCATED_ID_loc = CD_TRUNCATED_ID
 
         all_threads_data_list={}
         all_threads_files_cde_errors_quant = {}
         all_threads_customdata_stats_time = {}
 
+        all_threads_utilization = {}
+
         for thread_index in range(threads):
             all_threads_data_list[thread_index]=[0,0,0,0]
             all_threads_files_cde_errors_quant[thread_index]=defaultdict(int)
             all_threads_customdata_stats_time[thread_index]=defaultdict(float)
+            all_threads_utilization[thread_index]=[0,0.0,0.0]
 
         time_start_all = perf_counter()
 
         single_thread = bool(threads==1)
+        aborted_string = 'Custom data extraction was aborted.'
+
         #############################################################
-        def threaded_cde(timeout_semi_list,thread_index,thread_data_list,cde_errors_quant,cde_stats_time):
+        #every thread (or event engine slot) updates only its own stats
+        def customdata_done(thread_index,val_tuple,returncode,output,aborted,empty,killed,truncated,file_time):
+            scan_like_list,subpath,rule_nr,size = val_tuple
+            thread_data_list = all_threads_data_list[thread_index]
+
+            all_threads_customdata_stats_time[thread_index][rule_nr]+=file_time
+            utilization = all_threads_utilization[thread_index]
+            utilization[0]+=1
+            utilization[1]+=file_time
+
+            if (returncode and not truncated) or killed or aborted:
+                all_threads_files_cde_errors_quant[thread_index][rule_nr]+=1
+                thread_data_list[1]+=1
+
+            if not aborted:
+                thread_data_list[2]+=1
+                thread_data_list[3]+=size
+                thread_data_list[0]+=data_size(output)
+
+            new_elem={
+                        CD_OK_ID_loc:bool((returncode==0 or truncated) and not killed and not aborted),
+                        CD_DATA_ID_loc:(rule_nr,returncode,output),
+                        CD_ABORTED_ID_loc:aborted,
+                        CD_EMPTY_ID_loc:empty,
+                        CD_TRUNCATED_ID_loc:truncated
+                    }
+
+            scan_like_list.append(new_elem) #dostep z wielu watkow
+
+        #single extractor run, output of batch run is split into outputs of files
+        def invocation_done(thread_index,rule_nr,batch,returncode,output,aborted,empty,killed,truncated,split,invocation_time):
+            batch_quant = len(batch)
+            file_time = invocation_time/batch_quant
+
+            batch_size,batch_json = rules_batch[rule_nr]
+            #returncode,output,empty,truncated of every file
+            if split and batch_size:
+                if truncated:
+                    outputs = split_truncated_batch_output(output,batch_quant,batch_json)
+                    if outputs is None:
+                        files_results = None
+                    else:
+                        complete,partial = outputs
+                        files_results = [(0,file_output,False,False) for file_output in complete]
+                        if partial:
+                            files_results.append((205,partial,False,True))
+                        files_results.extend([(204,'Batch output truncated before this file.',True,False)]*(batch_quant-len(files_results)))
+                else:
+                    outputs = split_batch_output(output,batch_quant,batch_json)
+                    files_results = None if outputs is None else [(returncode,file_output,empty,False) for file_output in outputs]
 
-            aborted_string = 'Custom data extraction was aborted.'
+                if files_results is None:
+                    files_results = [(204,f'Batch output not matching {batch_quant} files.\n{output}',empty,False)]*batch_quant
+            else:
+                files_results = [(returncode,output,empty,truncated)]*batch_quant
+
+            for val_tuple,(file_returncode,file_output,file_empty,file_truncated) in zip(batch,files_results):
+                if file_output:
+                    customdata_done(thread_index,val_tuple,file_returncode,file_output,aborted,file_empty,killed,file_truncated,file_time)
+                else:
+                    customdata_done(thread_index,val_tuple,203,'No output collected.',aborted,True,killed,file_truncated,file_time)
 
-            files_cde_quant = 0
-            files_cde_size = 0
-            cde_size_extracted = 0
+            customdata_queue_done(rule_nr)
 
-            cde_errors_quant_all = 0
+        def batch_command(rule_nr,batch):
+            rule = cde_list[rule_nr]
+            executable,parameters,shell,timeout = rule[5:9]
+            output_max_bytes,output_max_lines = cde_rule_output_caps(rule)
+            full_file_paths = [normpath(abspath(sep.join([scan_path,subpath]))).replace('/',sep) for scan_like_list,subpath,rule_nr,size in batch]
+            command,command_info = get_batch_command(executable,parameters,full_file_paths,shell)
 
+            if single_thread:
+                batch_info = f' (+{len(batch)-1})' if len(batch)>1 else ''
+                batch_files_size = sum(val_tuple[3] for val_tuple in batch)
+                print_func( ('cde',f'{full_file_paths[0]}{batch_info} ({bytes_to_str(batch_files_size)})',batch_files_size,*all_threads_data_list[0]) )
+
+            batch_quant = len(batch)
+            return command,shell,timeout*batch_quant if timeout else None,output_max_bytes*batch_quant,output_max_lines*batch_quant
+
+        #############################################################
+        def threaded_cde(thread_index):
             perf_counter_loc = perf_counter
-            self_killed = self.killed
+            timeout_semi_list = timeout_semi_list_per_thread[thread_index]
+            processed_extend = customdata_pool_per_thread[thread_index].extend
+            thread_time_start = perf_counter_loc()
 
-            for (scan_like_list,subpath,rule_nr,size) in customdata_pool_per_thread[thread_index]:
+            while next_batch:=customdata_queue_next():
+                rule_nr,batch = next_batch
+                processed_extend(batch)
 
                 self_killed[thread_index]=False
 
                 time_start = perf_counter_loc()
+                empty=False
+                truncated=False
                 if abort_list[0] : #wszystko
                     returncode=200
                     output = aborted_string
                     aborted = True
                     empty=True
                 else:
-                    expressions,use_smin,smin_int,use_smax,smax_int,executable,parameters,shell,timeout,do_crc = cde_list[rule_nr]
-                    full_file_path = normpath(abspath(sep.join([scan_path,subpath]))).replace('/',sep)
-                    command,command_info = get_command(executable,parameters,full_file_path,shell)
-
-                    if single_thread:
-                        print_func( ('cde',f'{full_file_path} ({bytes_to_str(size)})',size,cde_size_extracted,cde_errors_quant_all,files_cde_quant,files_cde_size) )
+                    command,shell,timeout,max_bytes,max_lines = batch_command(rule_nr,batch)
 
                     timeout_val=time()+timeout if timeout else None
                     #####################################
 
-                    empty=False
                     try:
                         subprocess = uni_popen(command,shell)
                         timeout_semi_list[0]=(timeout_val,subprocess)
@@ -742,6 +2019,7 @@ class LibrerRecord:
 
                         output_list = []
                         output_list_append = output_list.append
+                        output_size = 0
 
                         returncode=202
                         while True:
@@ -749,6 +2027,14 @@ class LibrerRecord:
 
                             output_list_append(line.rstrip())
 
+                            if line and (max_bytes or max_lines):
+                                output_size += len(line.encode('utf-8'))
+                                if (max_bytes and output_size>max_bytes) or (max_lines and len(output_list)>max_lines):
+                                    truncated = True
+                                    kill_subprocess(subprocess,print_func)
+                                    timeout_semi_list[0] = None
+                                    break
+
                             if not line and subprocess_poll() is not None:
                                 returncode=subprocess.returncode
                                 timeout_semi_list[0] = None
@@ -763,7 +2049,11 @@ class LibrerRecord:
                         else:
                             aborted = False
 
-                        output = '\n'.join(output_list).strip()
+                        output,output_capped = cap_output('\n'.join(output_list).strip(),max_bytes,max_lines)
+                        if truncated or output_capped:
+                            truncated = True
+                            returncode=205
+
                         if not output:
                             output = 'No output collected.'
                             returncode=203
@@ -771,71 +2061,165 @@ class LibrerRecord:
 
                     #####################################
 
-                cde_stats_time[rule_nr]+=perf_counter_loc()-time_start
+                invocation_done(thread_index,rule_nr,batch,returncode,output,aborted,empty,self_killed[thread_index],truncated,returncode!=201 and not aborted and not empty,perf_counter_loc()-time_start)
+
+            all_threads_utilization[thread_index][2]=perf_counter_loc()-thread_time_start
 
-                if returncode or self_killed[thread_index] or aborted:
-                    cde_errors_quant[rule_nr]+=1
-                    cde_errors_quant_all+=1
+            sys.exit() #thread
 
-                if not aborted:
-                    files_cde_quant += 1
-                    files_cde_size += size
-                    cde_size_extracted += asizeof(output)
+        #############################################################
+        #single thread multiplexing up to 'threads' subprocesses, woken by output, process end or nearest timeout
+        def events_cde():
+            perf_counter_loc = perf_counter
+            selector = DefaultSelector()
+            selector_register = selector.register
+            selector_unregister = selector.unregister
+            selector_select = selector.select
 
-                thread_data_list[0:4]=[cde_size_extracted,cde_errors_quant_all,files_cde_quant,files_cde_size]
+            running = {}
+            free_slots = list(reversed(range(threads)))
+            progress_time = 0
 
-                new_elem={
-                            CD_OK_ID_loc:bool(returncode==0 and not self_killed[thread_index] and not aborted),
-                            CD_DATA_ID_loc:(rule_nr,returncode,output),
-                            CD_ABORTED_ID_loc:aborted,
-                            CD_EMPTY_ID_loc:empty
-                        }
+            while True:
+                while free_slots and (next_batch:=customdata_queue_next(False)):
+                    rule_nr,batch = next_batch
+                    thread_index = free_slots.pop()
+                    customdata_pool_per_thread[thread_index].extend(batch)
+
+                    time_start = perf_counter_loc()
+                    if abort_list[0] : #wszystko
+                        invocation_done(thread_index,rule_nr,batch,200,aborted_string,True,True,False,False,False,perf_counter_loc()-time_start)
+                        free_slots.append(thread_index)
+                        continue
 
-                scan_like_list.append(new_elem) #dostep z wielu watkow
+                    command,shell,timeout,max_bytes,max_lines = batch_command(rule_nr,batch)
 
-            sys.exit() #thread
+                    try:
+                        subprocess = popen_lin_bytes(command,shell)
+                    except Exception as re:
+                        invocation_done(thread_index,rule_nr,batch,201,f'Exception: {re}',False,False,False,False,False,perf_counter_loc()-time_start)
+                        free_slots.append(thread_index)
+                    else:
+                        stdout_fd = subprocess.stdout.fileno()
+                        selector_register(stdout_fd,EVENT_READ)
+                        #subprocess,slot,rule,files,output chunks,start time,timeout time,killed,output caps,output bytes,output lines,truncated
+                        running[stdout_fd] = [subprocess,thread_index,rule_nr,batch,[],time_start,time()+timeout if timeout else None,False,max_bytes,max_lines,0,0,False]
+
+                if not running:
+                    break
+
+                timeouts = [running_elem[6] for running_elem in running.values() if running_elem[6] and not running_elem[7]]
+                for key,event in selector_select(max(min(min(timeouts)-time(),0.1),0) if timeouts else 0.1):
+                    stdout_fd = key.fd
+                    running_elem = running[stdout_fd]
+
+                    if chunk:=os_read(stdout_fd,65536):
+                        running_elem[4].append(chunk)
+
+                        max_bytes,max_lines = running_elem[8:10]
+                        if max_bytes or max_lines:
+                            running_elem[10]+=len(chunk)
+                            running_elem[11]+=chunk.count(b'\n')+chunk.count(b'\r')-chunk.count(b'\r\n')
+                            if (max_bytes and running_elem[10]>max_bytes) or (max_lines and running_elem[11]>max_lines):
+                                running_elem[12] = True
+                                kill_subprocess(running_elem[0],print_func)
+                                chunk = None
+
+                    if not chunk:
+                        selector_unregister(stdout_fd)
+                        del running[stdout_fd]
+
+                        subprocess,thread_index,rule_nr,batch,chunks,time_start,timeout_val,killed,max_bytes,max_lines,output_bytes,output_lines,truncated = running_elem
+                        subprocess.stdout.close()
+                        returncode = subprocess.wait()
 
-        cde_threads = {}
-        cde_thread_is_alive = {}
-        any_thread_alive = True
+                        #the same as universal newlines text mode + readline
+                        output_list = [line.rstrip() for line in b''.join(chunks).decode('utf-8','ignore').replace('\r\n','\n').replace('\r','\n').split('\n')]
+                        if killed:
+                            output_list.append('Killed.')
+
+                        empty=False
+                        output,output_capped = cap_output('\n'.join(output_list).strip(),max_bytes,max_lines)
+                        if truncated or output_capped:
+                            truncated = True
+                            returncode=205
 
-        for thread_index_loop in range(threads):
-            thread_index = thread_index_loop
-            cde_threads[thread_index] = Thread(target = lambda : threaded_cde(timeout_semi_list_per_thread[thread_index],thread_index,all_threads_data_list[thread_index],all_threads_files_cde_errors_quant[thread_index],all_threads_customdata_stats_time[thread_index]),daemon=True)
-            cde_threads[thread_index].start()
+                        if not output:
+                            output = 'No output collected.'
+                            returncode=203
+                            empty=True
 
-        self_killed = self.killed
+                        invocation_done(thread_index,rule_nr,batch,returncode,output,killed,empty,killed,truncated,not killed and not empty,perf_counter_loc()-time_start)
+                        free_slots.append(thread_index)
 
-        while any_thread_alive:
-            any_thread_alive = False
-            now = time()
-            for thread_index in range(threads):
-                if cde_threads[thread_index].is_alive():
-                    any_thread_alive = True
-                    if timeout_semi_list_per_thread[thread_index][0]:
-                        timeout_val,subprocess = timeout_semi_list_per_thread[thread_index][0]
-                        if any(abort_list) or (timeout_val and now>timeout_val):
-                            kill_subprocess(subprocess,print_func)
-                            self_killed[thread_index]=True
-                            abort_list[1]=False
-
-            cde_size_extracted=0
-            cde_errors_quant_all=0
-            files_cde_quant=0
-            files_cde_size=0
+                now = time()
+                any_abort = any(abort_list)
+                for running_elem in running.values():
+                    if not running_elem[7] and (any_abort or (running_elem[6] and now>running_elem[6])):
+                        kill_subprocess(running_elem[0],print_func)
+                        running_elem[7]=True
+                        abort_list[1]=False
 
-            for thread_index in range(threads):
-                thread_data_list = all_threads_data_list[thread_index]
+                if not single_thread and now>progress_time:
+                    print_func( ('cde','(multithread run)',0,*[sum(thread_data_list[i] for thread_data_list in all_threads_data_list.values()) for i in range(4)]) )
+                    progress_time = now+0.1
 
-                cde_size_extracted+=thread_data_list[0]
-                cde_errors_quant_all+=thread_data_list[1]
-                files_cde_quant+=thread_data_list[2]
-                files_cde_size+=thread_data_list[3]
+            selector.close()
 
-            if threads!=1:
-                print_func( ('cde','(multithread run)',0,cde_size_extracted,cde_errors_quant_all,files_cde_quant,files_cde_size) )
+            wall_time = perf_counter_loc()-time_start_all
+            for utilization in all_threads_utilization.values():
+                utilization[2]=wall_time
 
-            sleep(0.1)
+        #############################################################
+        cde_threads = {}
+        if event_driven:
+            events_cde()
+        else:
+            any_thread_alive = True
+
+            for thread_index in range(threads):
+                cde_threads[thread_index] = Thread(target = threaded_cde,args=(thread_index,),daemon=True)
+                cde_threads[thread_index].start()
+
+            while any_thread_alive:
+                any_thread_alive = False
+                now = time()
+                for thread_index in range(threads):
+                    if cde_threads[thread_index].is_alive():
+                        any_thread_alive = True
+                        if timeout_semi_list_per_thread[thread_index][0]:
+                            timeout_val,subprocess = timeout_semi_list_per_thread[thread_index][0]
+                            if any(abort_list) or (timeout_val and now>timeout_val):
+                                kill_subprocess(subprocess,print_func)
+                                self_killed[thread_index]=True
+                                abort_list[1]=False
+
+                if threads!=1:
+                    print_func( ('cde','(multithread run)',0,*[sum(thread_data_list[i] for thread_data_list in all_threads_data_list.values()) for i in range(4)]) )
+
+                sleep(0.1)
+
+        cde_size_extracted,cde_errors_quant_all,files_cde_quant,files_cde_size = [sum(thread_data_list[i] for thread_data_list in all_threads_data_list.values()) for i in range(4)]
+
+        if cache_file:
+            for thread_index in range(threads):
+                for (scan_like_list,subpath,rule_nr,size) in customdata_pool_per_thread[thread_index]:
+                    new_elem = scan_like_list[-1]
+                    if new_elem[CD_OK_ID_loc] and subpath in cache_keys:
+                        cache_key = cache_keys[subpath]
+                        if len(cache_key)==3:
+                            try:
+                                cache_key = (*cache_key,partial_hash(sep.join([scan_path,subpath]),size) if cache_hash else None)
+                            except Exception as he:
+                                print_func( ('error',f'partial hash error:{he}'),True )
+                                continue
+
+                        rule_nr,returncode,output = new_elem[CD_DATA_ID_loc]
+                        cache[cache_key] = (returncode,output,new_elem[CD_TRUNCATED_ID_loc])
+            try:
+                cde_cache_save(cache,cache_file)
+            except Exception as ce:
+                print_func( ('error',f'custom data cache save error:{ce}'),True )
 
         self_header.cde_errors_quant_all = cde_errors_quant_all
 
@@ -866,36 +2250,51 @@ class LibrerRecord:
             for rule_nr,val in all_threads_customdata_stats_time[thread_index].items():
                 customdata_stats_time[rule_nr] += val
 
-            for (scan_like_list,subpath,rule_nr,size) in customdata_pool_per_thread[thread_index]:
-                new_elem = scan_like_list[-1]
-                cd_field = new_elem[CD_DATA_ID_loc]
+        customdata_reused = self.customdata_reused
+        for (scan_like_list,subpath,rule_nr,size) in customdata_reused:
+            if scan_like_list[-1][CD_DATA_ID_loc][1] and not scan_like_list[-1][CD_TRUNCATED_ID]:
+                files_cde_errors_quant[rule_nr] += 1
+                self_header.cde_errors_quant_all += 1
 
-                try:
-                    used_cd_index = customdata_helper[cd_field]
-                    new_elem[CD_INDEX_ID_loc]=used_cd_index
-                except:
-                    customdata_helper[cd_field] = new_elem[CD_INDEX_ID_loc] = cd_index
-                    cd_index+=1
+        if customdata_reused:
+            print_func( ('info',f'Custom data reused:{len(customdata_reused)}'),True)
+            hist_code,hist_time,prev_label,reused_quant = self_header.history_stack[-1]
+            self_header.history_stack[-1] = (hist_code,hist_time,prev_label,len(customdata_reused))
+
+        for pool_list in [customdata_pool_per_thread[thread_index] for thread_index in range(threads)] + [customdata_reused,customdata_cached]:
+            for (scan_like_list,subpath,rule_nr,size) in pool_list:
+                    new_elem = scan_like_list[-1]
+                    cd_field = new_elem[CD_DATA_ID_loc]
+
+                    try:
+                        used_cd_index = customdata_helper[cd_field]
+                        new_elem[CD_INDEX_ID_loc]=used_cd_index
+                    except:
+                        customdata_helper[cd_field] = new_elem[CD_INDEX_ID_loc] = cd_index
+                        cd_index+=1
 
-                    self_customdata_append(cd_field)
+                        self_customdata_append(cd_field)
 
-                    customdata_stats_size[rule_nr]+=asizeof(cd_field)
-                    customdata_stats_uniq[rule_nr]+=1
+                        customdata_stats_size[rule_nr]+=data_size(cd_field)
+                        customdata_stats_uniq[rule_nr]+=1
 
-                customdata_stats_refs[rule_nr]+=1
+                    customdata_stats_refs[rule_nr]+=1
 
         print_func( ('info','Custom data post-processing finished.'),True)
 
-        for thread_index in range(threads):
-            cde_threads[thread_index].join()
+        for cde_thread in cde_threads.values():
+            cde_thread.join()
 
         del self.customdata_pool
+        del self.customdata_reused
 
         self_header.files_cde_errors_quant=files_cde_errors_quant
         self_header.cde_stats_size=customdata_stats_size
         self_header.cde_stats_uniq=customdata_stats_uniq
         self_header.cde_stats_refs=customdata_stats_refs
         self_header.cde_stats_time=customdata_stats_time
+        #files, busy time, wall time
+        self_header.cde_threads_stats=[tuple(all_threads_utilization[thread_index]) for thread_index in range(threads)]
 
     #############################################################
     def sld_recalc_rec(self,scan_like_data):
@@ -928,99 +2327,200 @@ class LibrerRecord:
         return new_size_on_this_level,new_files_quant_on_this_level,new_folders_quant_on_this_level
 
     #############################################################
-    def tupelize_rec(self,scan_like_data,results_queue_put):
+    def tupelize(self,scan_like_data,results_queue_put):
+        #single pass with explicit stack, folder tuple closed after its last subitem, scan_like_data dicts released on the way
         LUT_encode_loc = LUT_encode
+        filenames_helper = self.filenames_helper
+        sort_key = itemgetter(1,2,3)
+        CD_OK_ID_loc,CD_INDEX_ID_loc,CD_ABORTED_ID_loc,CD_EMPTY_ID_loc,CD_TRUNCATED_ID_loc = CD_OK_ID,CD_INDEX_ID,CD_ABORTED_ID,CD_EMPTY_ID,CD_TRUNCATED_ID
 
-        self_tupelize_rec = self.tupelize_rec
+        references_names = 0
+        references_cd = 0
 
-        sub_list = []
-        for entry_name,items_list in scan_like_data.items():
-            try:
-                entry_name_index = self.filenames_helper[entry_name]
-                self.header.references_names+=1
-            except Exception as VE:
-                print('filenames error:',entry_name,VE)
-            else:
+        root_list = []
+        stack = [(iter(scan_like_data.items()),scan_like_data,root_list,None,None)]
+        stack_append = stack.append
+        stack_pop = stack.pop
+
+        while stack:
+            items_iter,sub_dict,sub_list,parent_list,parent_elem = stack[-1]
+            sub_list_append = sub_list.append
+
+            for entry_name,items_list in items_iter:
                 try:
-                    (size,is_dir,is_file,is_symlink,is_bind,has_files,mtime) = items_list[0:7]
+                    entry_name_index = filenames_helper[entry_name]
+                    references_names+=1
 
-                    try:
-                        elem_index = 7
-                        if has_files:
-                            sub_dict = items_list[elem_index]
-                            elem_index+=1
-                    except:
-                        #print('f1 error')
-                        sub_dict={}
+                    size,is_dir,is_file,is_symlink,is_bind,has_files,mtime,*rest = items_list
 
-                    try:
-                        info_dict = items_list[elem_index]
-                    except:
-                        has_cd = False
-                        cd_ok = False
-                        cd_aborted = False
-                        cd_empty = False
-                    else:
-                        #if 'cd_ok' in info_dict:
-                        if CD_OK_ID in info_dict:
-                            cd_ok = info_dict[CD_OK_ID]
-                            cd_index = info_dict[CD_INDEX_ID]
-                            has_cd = True
+                    if has_files:
+                        sub_sub_dict = rest.pop(0) if rest else {}
+
+                    if rest:
+                        info_dict = rest[0]
+                        if has_cd := CD_OK_ID_loc in info_dict:
+                            cd_ok = info_dict[CD_OK_ID_loc]
                         else:
                             cd_ok = False
-                            has_cd = False
 
-                        if CD_ABORTED_ID in info_dict:
-                            cd_aborted = info_dict[CD_ABORTED_ID]
-                        else:
-                            cd_aborted = False
+                        code = LUT_encode_loc[ (is_dir,is_file,is_symlink,is_bind,has_cd,has_files,cd_ok,info_dict.get(CD_ABORTED_ID_loc,False),info_dict.get(CD_EMPTY_ID_loc,False),info_dict.get(CD_TRUNCATED_ID_loc,False)) ]
 
-                        if CD_EMPTY_ID in info_dict:
-                            cd_empty = info_dict[CD_EMPTY_ID]
+                        if has_cd: #only files
+                            references_cd+=1
+                            sub_list_elem = [entry_name_index,code,size,mtime,info_dict[CD_INDEX_ID_loc]]
                         else:
-                            cd_empty = False
+                            sub_list_elem = [entry_name_index,code,size,mtime]
+                    else:
+                        sub_list_elem = [entry_name_index,LUT_encode_loc[ (is_dir,is_file,is_symlink,is_bind,False,has_files,False,False,False,False) ],size,mtime]
 
-                    code_new = LUT_encode_loc[ (is_dir,is_file,is_symlink,is_bind,has_cd,has_files,cd_ok,cd_aborted,cd_empty,False) ]
+                    if has_files:
+                        #subfolder tuple completed (children inserted before cd index) when its items are done
+                        stack_append( (iter(sub_sub_dict.items()),sub_sub_dict,[],sub_list,sub_list_elem) )
+                        break
 
-                    sub_list_elem=[entry_name_index,code_new,size,mtime]
+                    sub_list_append( tuple(sub_list_elem) )
 
-                    if has_files:
-                        sub_list_elem.append(self_tupelize_rec(sub_dict,results_queue_put))
+                except Exception as e:
+                    results_queue_put(f'tupelize error:{e},{entry_name}' )
+            else:
+                stack_pop()
+                sub_list.sort(key=sort_key)
+                sub_dict.clear()
 
-                    if has_cd: #only files
-                        self.header.references_cd+=1
-                        sub_list_elem.append( cd_index )
+                if parent_elem is None:
+                    break
 
-                    sub_list.append( tuple(sub_list_elem) )
+                parent_elem.insert(4,tuple(sub_list))
+                parent_list.append(tuple(parent_elem))
 
-                except Exception as e:
-                    #self.log.error('tupelize_rec error:%s',e )
-                    results_queue_put(f'tupelize_rec error:{e}' )
-                    #print('tupelize_rec error:',e,' entry_name:',entry_name)
+        self.header.references_names+=references_names
+        self.header.references_cd+=references_cd
+
+        return tuple(root_list)
+    #############################################################
+
+    def pack_data(self,results_queue_put):
+        size,mtime = 0,0
+        is_dir = True
+        is_file = False
+        is_symlink = False
+        is_bind = False
+        has_cd = False
+        has_files = True
+        cd_ok = False
+
+        self.header.references_names=0
+        self.header.references_cd=0
+
+        code = LUT_encode[ (is_dir,is_file,is_symlink,is_bind,has_cd,has_files,cd_ok,False,False,False) ]
+        #millions of new tuples, nothing to collect
+        gc_disable()
+        try:
+            self.filestructure = ('',code,size,mtime,self.tupelize(self.scan_data,results_queue_put))
+        finally:
+            gc_enable()
+        #print('ok:',self.scan_data)
+
+        self.header.items_names=len(self.filenames)
+        self.header.items_cd=len(self.customdata)
+
+        del self.filenames_helper
+        del self.scan_data
+
+    def pack_stream(self,results_queue_put):
+        #filestructure columns built breadth-first from spilled folders, no nested tuples
+        LUT_encode_loc = LUT_encode
+        filenames_helper = self.filenames_helper
+        spill_seek = self.spill.seek
+        spill_read = self.spill.read
+        spill_offsets = self.spill_offsets
+        spill_cd_items = self.spill_cd_items
+        sort_key = itemgetter(0,1,2)
+
+        names = array('I')
+        codes = array('H')
+        sizes = array('q')
+        mtimes = array('q')
+        first_child = array('I')
+        child_count = array('I')
+        cd_index = array('i')
+
+        names_append = names.append
+        codes_append = codes.append
+        sizes_append = sizes.append
+        mtimes_append = mtimes.append
+        first_child_append = first_child.append
+        child_count_append = child_count.append
+        cd_index_append = cd_index.append
+
+        references_cd = 0
+
+        root_chunk = self.spill_root
+        queue = array('I',[root_chunk[0]] if root_chunk else [])
+        queue_append = queue.append
+        next_first_child = root_chunk[1] if root_chunk else 0
+
+        for chunk_nr in queue:
+            spill_seek(spill_offsets[chunk_nr])
+            sub_list = []
+            sub_list_append = sub_list.append
+
+            for entry_name,size,is_dir,is_file,is_symlink,is_bind,has_files,mtime,sub_chunk,cd_ref in loads(spill_read(spill_offsets[chunk_nr+1]-spill_offsets[chunk_nr])):
+                has_cd = cd_ok = cd_aborted = cd_empty = cd_truncated = False
+                cd_index_val = -1
+                if cd_ref>=0:
+                    items_list = spill_cd_items[cd_ref]
+                    if len(items_list)>7:
+                        info_dict = items_list[7]
+                        if CD_OK_ID in info_dict:
+                            cd_ok = info_dict[CD_OK_ID]
+                            cd_index_val = info_dict[CD_INDEX_ID]
+                            has_cd = True
+
+                        cd_aborted = info_dict.get(CD_ABORTED_ID,False)
+                        cd_empty = info_dict.get(CD_EMPTY_ID,False)
+                        cd_truncated = info_dict.get(CD_TRUNCATED_ID,False)
+
+                code = LUT_encode_loc[ (is_dir,is_file,is_symlink,is_bind,has_cd,has_files,cd_ok,cd_aborted,cd_empty,cd_truncated) ]
+
+                #same order as tupelize
+                sub_list_append( (code,size,mtime,filenames_helper[entry_name],sub_chunk,cd_index_val) )
+
+            sub_list.sort(key=sort_key)
 
-        return tuple(sorted(sub_list,key = lambda x : x[1:4]))
-    #############################################################
+            for code,size,mtime,name_nr,sub_chunk,cd_index_val in sub_list:
+                names_append(name_nr)
+                codes_append(code)
+                sizes_append(size)
+                mtimes_append(mtime)
 
-    def pack_data(self,results_queue_put):
-        size,mtime = 0,0
-        is_dir = True
-        is_file = False
-        is_symlink = False
-        is_bind = False
-        has_cd = False
-        has_files = True
-        cd_ok = False
+                if sub_chunk:
+                    sub_chunk_nr,sub_entries_quant = sub_chunk
+                    first_child_append(next_first_child)
+                    child_count_append(sub_entries_quant)
+                    next_first_child += sub_entries_quant
+                    queue_append(sub_chunk_nr)
+                else:
+                    first_child_append(0)
+                    child_count_append(0)
 
-        self.header.references_names=0
-        self.header.references_cd=0
+                if cd_index_val>=0:
+                    references_cd+=1
+                cd_index_append(cd_index_val)
 
-        code = LUT_encode[ (is_dir,is_file,is_symlink,is_bind,has_cd,has_files,cd_ok,False,False,False) ]
-        self.filestructure = ('',code,size,mtime,self.tupelize_rec(self.scan_data,results_queue_put))
-        #print('ok:',self.scan_data)
+        code = LUT_encode[ (True,False,False,False,False,True,False,False,False,False) ]
+        self.filestructure_columns = (code,0,0,root_chunk[1] if root_chunk else 0,names,codes,sizes,mtimes,first_child,child_count,cd_index)
 
+        self.header.references_names=len(names)
+        self.header.references_cd=references_cd
         self.header.items_names=len(self.filenames)
         self.header.items_cd=len(self.customdata)
 
+        self.spill.close()
+
+        del self.spill
+        del self.spill_offsets
+        del self.spill_cd_items
         del self.filenames_helper
         del self.scan_data
 
@@ -1029,12 +2529,12 @@ class LibrerRecord:
 
         self_remove_cd_rec = self.remove_cd_rec
 
-        is_dir,is_file,is_symlink,is_bind,has_cd,has_files,cd_ok,cd_aborted,cd_empty,aux2 = LUT_decode_loc[tuple_like_data[1]]
+        is_dir,is_file,is_symlink,is_bind,has_cd,has_files,cd_ok,cd_aborted,cd_empty,cd_truncated = LUT_decode_loc[tuple_like_data[1]]
 
         has_cd=False
         cd_ok=False
 
-        code = LUT_encode[ (is_dir,is_file,is_symlink,is_bind,has_cd,has_files,cd_ok,cd_aborted,cd_empty,aux2) ]
+        code = LUT_encode[ (is_dir,is_file,is_symlink,is_bind,has_cd,has_files,cd_ok,cd_aborted,cd_empty,cd_truncated) ]
 
         new_list = [tuple_like_data[0],code,tuple_like_data[2],tuple_like_data[3]]
 
@@ -1052,6 +2552,109 @@ class LibrerRecord:
         return tuple(new_list)
 
     ########################################################################################
+    def find_items_by_names(self,print_func,size_min,size_max,timestamp_min,timestamp_max,name_func_to_call,type_folders,type_files,print_info_fn,abort_func=None,names_as_indexes=False,name_candidates=None):
+        self.decompress_filestructure_for_search()
+
+        filenames_loc = self.filenames
+        parents,positions,offsets,postings = self.nodes_index
+
+        columns_mode = bool(self.header.filestructure_columns)
+        if columns_mode:
+            names,codes,sizes,mtimes = self.filestructure_columns[4:8]
+        else:
+            root_sub_data = self.filestructure[4]
+
+        LUT_decode_loc = LUT_decode
+
+        use_size = bool(size_min or size_max)
+        use_timestamp = bool(timestamp_min or timestamp_max)
+
+        when_folder_may_apply = bool(not use_size and not use_timestamp and type_folders)
+
+        #node -> (data_entry,path of name indexes), kept for folders only
+        folders_cache = {}
+
+        def node_entry(node):
+            chain = []
+            chain_append = chain.append
+            while node>=0 and node not in folders_cache:
+                chain_append(node)
+                node = parents[node]
+
+            if node>=0:
+                data_entry,path = folders_cache[node]
+                if not chain:
+                    return data_entry,path
+            else:
+                data_entry,path = None,[]
+
+            leaf = chain[0]
+            for chain_node in reversed(chain):
+                if columns_mode:
+                    data_entry = (names[chain_node],codes[chain_node],sizes[chain_node],mtimes[chain_node])
+                else:
+                    data_entry = (data_entry[4] if data_entry else root_sub_data)[positions[chain_node]]
+                path = path + [data_entry[0]]
+                if chain_node!=leaf:
+                    folders_cache[chain_node] = (data_entry,path)
+
+            return data_entry,path
+
+        names_nrs = sorted(name_candidates) if name_candidates is not None else range(len(filenames_loc))
+
+        #progress - postings of processed names, monotonic up to number of nodes
+        search_progress = 0
+        for names_counter,name_nr in enumerate(names_nrs):
+            if abort_func and not names_counter & 0xFFF and abort_func():
+                print_info_fn('find_items aborted')
+                break
+
+            postings_start,postings_end = offsets[name_nr],offsets[name_nr+1]
+            search_progress += postings_end-postings_start
+
+            try:
+                if not name_func_to_call(filenames_loc[name_nr]):
+                    continue
+            except Exception as e:
+                print_info_fn(f'find_items(1c):{e}' )
+                continue
+
+            for node in postings[postings_start:postings_end]:
+                data_entry,path = node_entry(node)
+                code,size,mtime = data_entry[1:4]
+
+                is_dir,is_file,is_symlink,is_bind,has_cd,has_files,cd_ok,cd_aborted,cd_empty,cd_truncated = LUT_decode_loc[code]
+
+                if is_dir:
+                    if not when_folder_may_apply:
+                        continue
+                elif is_file:
+                    if not type_files:
+                        continue
+
+                    if use_size:
+                        if size<0:
+                            continue
+                        if size_min and size<size_min:
+                            continue
+                        if size_max and size>size_max:
+                            continue
+
+                    if use_timestamp:
+                        if timestamp_min and mtime<timestamp_min:
+                            continue
+                        if timestamp_max and mtime>timestamp_max:
+                            continue
+                else:
+                    continue
+
+                if names_as_indexes:
+                    print_func( (search_progress,size,mtime,*path) )
+                else:
+                    print_func( (search_progress,size,mtime,*[filenames_loc[nr] for nr in path]) )
+
+        print_func( [len(parents)] )
+
     def find_items(self,
             print_func,
             size_min,size_max,
@@ -1059,12 +2662,27 @@ class LibrerRecord:
             name_search_kind,name_func_to_call,
             cd_search_kind,cd_func_to_call,
             type_folders,type_files,
-            print_info_fn):
+            print_info_fn,
+            abort_func=None,
+            names_as_indexes=False,
+            name_candidates=None,
+            cd_candidates=None):
 
-        self.decompress_filestructure()
+        if name_func_to_call and name_search_kind in ('regexp','glob','fuzzy') and cd_search_kind=='dont':
+            self.decompress_nodes_index()
+            if self.nodes_index:
+                return self.find_items_by_names(print_func,size_min,size_max,timestamp_min,timestamp_max,name_func_to_call,type_folders,type_files,print_info_fn,abort_func,names_as_indexes,name_candidates)
+
+        self.decompress_filestructure_for_search()
 
         filenames_loc = self.filenames
-        filestructure = self.filestructure
+
+        columns_mode = bool(self.header.filestructure_columns)
+        if columns_mode:
+            root_code,root_size,root_mtime,root_child_count,names,codes,sizes,mtimes,first_child,child_count,cd_index = self.filestructure_columns
+            search_list = [ ((0,root_child_count),[]) ]
+        else:
+            search_list = [ (self.filestructure[4],[]) ]
 
         search_progress = 0
 
@@ -1076,7 +2694,6 @@ class LibrerRecord:
         use_size = bool(size_min or size_max)
         use_timestamp = bool(timestamp_min or timestamp_max)
 
-        search_list = [ (filestructure[4],[]) ]
         search_list_pop = search_list.pop
         search_list_append = search_list.append
 
@@ -1095,7 +2712,9 @@ class LibrerRecord:
         self_customdata = self.customdata
 
         name_func_to_call_bool = bool(name_func_to_call)
+        name_candidates_bool = bool(name_func_to_call and name_candidates is not None)
         cd_func_to_call_bool = bool(cd_func_to_call)
+        cd_candidates_bool = bool(cd_func_to_call and cd_candidates is not None)
 
         size_min_bool = bool(size_min)
         size_max_bool = bool(size_max)
@@ -1106,8 +2725,17 @@ class LibrerRecord:
         cd_func_to_call_res_cache = {}
 
         while search_list:
+            if abort_func and abort_func():
+                print_info_fn('find_items aborted')
+                break
+
             filestructure,parent_path_components = search_list_pop()
 
+            if columns_mode:
+                first,count = filestructure
+                last = first+count
+                filestructure = zip(names[first:last],codes[first:last],sizes[first:last],mtimes[first:last],first_child[first:last],child_count[first:last],cd_index[first:last])
+
             for data_entry in filestructure:
                 search_progress +=1
 
@@ -1115,20 +2743,24 @@ class LibrerRecord:
 
                 name = filenames_loc[name_nr]
 
-                is_dir,is_file,is_symlink,is_bind,has_cd,has_files,cd_ok,cd_aborted,cd_empty,aux2 = LUT_decode_loc[code]
+                is_dir,is_file,is_symlink,is_bind,has_cd,has_files,cd_ok,cd_aborted,cd_empty,cd_truncated = LUT_decode_loc[code]
 
-                elem_index=4
-                if has_files:
-                    sub_data = data_entry[elem_index]
-                    elem_index+=1
+                if columns_mode:
+                    sub_data = data_entry[4:6] if data_entry[5] else None
+                    cd_nr = data_entry[6]
                 else:
-                    sub_data = None
+                    elem_index=4
+                    if has_files:
+                        sub_data = data_entry[elem_index]
+                        elem_index+=1
+                    else:
+                        sub_data = None
 
-                if has_cd:
-                    cd_nr = data_entry[elem_index]
-                    elem_index+=1
+                    if has_cd:
+                        cd_nr = data_entry[elem_index]
+                        elem_index+=1
 
-                next_level = parent_path_components + [name]
+                next_level = parent_path_components + [name_nr if names_as_indexes else name]
                 if name_search_kind_is_error:
                     if size>-1:
                         continue
@@ -1136,7 +2768,9 @@ class LibrerRecord:
                 if is_dir :
                     if when_folder_may_apply:
                         #katalog moze spelniac kryteria naazwy pliku ale nie ma rozmiaru i custom data
-                        if name_func_to_call_bool:
+                        if name_candidates_bool and name_nr not in name_candidates:
+                            pass
+                        elif name_func_to_call_bool:
                             try:
                                 name_func_to_call_res = name_func_to_call_res_cache[name_nr]
                             except:
@@ -1175,6 +2809,9 @@ class LibrerRecord:
                                 continue
 
                     if name_func_to_call:
+                        if name_candidates_bool and name_nr not in name_candidates:
+                            continue
+
                         try:
                             name_func_to_call_res = name_func_to_call_res_cache[name_nr]
                         except:
@@ -1201,6 +2838,9 @@ class LibrerRecord:
                             continue
 
                         if cd_func_to_call_bool:
+                            if cd_candidates_bool and cd_nr not in cd_candidates:
+                                continue
+
                             try:
                                 cd_func_to_call_res = cd_func_to_call_res_cache[cd_nr]
                             except:
@@ -1313,6 +2953,9 @@ class LibrerRecord:
                 info_list_append(f'free space      : unknown')
                 info_list_med_append(f'free space      : unknown')
 
+            if self_header.cde_cache_hits:
+                info_list_append(f'cde cache hits  : {fnumber(self_header.cde_cache_hits)}')
+
             info_list_med_append(f'custom data     : {bytes_to_str(self_header.cde_size_extracted)}')
 
             self.txtinfo_medium = '\n'.join(info_list_med)
@@ -1360,12 +3003,25 @@ class LibrerRecord:
             if cd_data[0]:
                 info_list_append(f'Custom Data     |{bytes_to_str_mod(cd_data[0]).rjust(12)     }{bytes_to_str_mod(cd_data[1]).rjust(12)     }{bytes_to_str_mod(cd_data[2]).rjust(12)  }{fnumber(self_header.items_cd).rjust(12)       }{fnumber(self_header.references_cd).rjust(12)}{cde_stats_time_all_str.rjust(11)}s{str(round(customdata_time,2)).rjust(11)}s{fnumber(cde_errors).rjust(12)}')
 
+            for datalabel,label in (('filenamesindex','File Names Index'),('nodesindex','Nodes Index'),('customdataindex','Cust. Data Index')):
+                if datalabel in self_header.zipinfo:
+                    idx_data = self_header.zipinfo[datalabel]
+                    info_list_append(f'{label.ljust(16)}|{bytes_to_str_mod(idx_data[0]).rjust(12)}{bytes_to_str_mod(idx_data[1]).rjust(12)}{bytes_to_str_mod(idx_data[2]).rjust(12)}{"".rjust(12)}{"".rjust(12)}{"".rjust(12)}{str(round(self_header.compression_time[datalabel],2)).rjust(11)}s')
+
             try:
                 if self_header.cde_list:
                     info_list_append('----------------+------------------------------------------------------------------------------------------------')
-                    for nr,(expressions,use_smin,smin_int,use_smax,smax_int,executable,parameters,shell,timeout,crc) in enumerate(self_header.cde_list):
+                    for nr in range(len(self_header.cde_list)):
                         info_list_append(f'rule nr {str(nr).rjust(2)}      |                        {bytes_to_str(self_header.cde_stats_size[nr]).rjust(12)}{fnumber(self_header.cde_stats_uniq[nr]).rjust(12)}{fnumber(self_header.cde_stats_refs[nr]).rjust(12)}{str(round(self_header.cde_stats_time[nr],2)).rjust(11)}s{"".rjust(12)}{fnumber(self_header.files_cde_errors_quant[nr]).rjust(12)}')
                     info_list_append('----------------+------------------------------------------------------------------------------------------------')
+
+                if self_header.cde_threads_stats:
+                    info_list_append('CDE threads     |       files   busy time   wall time utilization')
+                    info_list_append('----------------+------------------------------------------------')
+                    for nr,(files_quant,busy_time,wall_time) in enumerate(self_header.cde_threads_stats):
+                        utilization = f'{round(100*busy_time/wall_time)}%' if wall_time else ''
+                        info_list_append(f'thread nr {str(nr).rjust(2)}    |{fnumber(files_quant).rjust(12)}{str(round(busy_time,2)).rjust(11)}s{str(round(wall_time,2)).rjust(11)}s{utilization.rjust(12)}')
+                    info_list_append('----------------+------------------------------------------------')
             except Exception as EE:
                 info_list_append(str(EE))
                 #print('record:',file_name,' error:',str(EE))
@@ -1374,7 +3030,8 @@ class LibrerRecord:
                 if self_header.cde_list:
                     info_list_append('')
                     info_list_append('Custom Data Extractors and rules:')
-                    for nr,(expressions,use_smin,smin_int,use_smax,smax_int,executable,parameters,shell,timeout,crc) in enumerate(self_header.cde_list):
+                    for nr,rule in enumerate(self_header.cde_list):
+                        expressions,use_smin,smin_int,use_smax,smax_int,executable,parameters,shell,timeout,crc = rule[0:10]
                         info_list_append(f'\nrule nr    : {nr}')
 
                         if expressions:
@@ -1390,6 +3047,16 @@ class LibrerRecord:
                         info_list_append(f'command    : {executable} {parameters} {in_shell_string}')
                         if timeout:
                             info_list_append(f'timeout    : {timeout}s')
+                        if max_threads:=cde_rule_max_threads(rule):
+                            info_list_append(f'max threads: {max_threads}')
+                        batch_size,batch_json = cde_rule_batch(rule)
+                        if batch_size:
+                            info_list_append(f'batch      : {batch_size} files per run, split by {"json array" if batch_json else "lines"}')
+                        output_max_bytes,output_max_lines = cde_rule_output_caps(rule)
+                        if output_max_bytes:
+                            info_list_append(f'max output : {bytes_to_str(output_max_bytes)}')
+                        if output_max_lines:
+                            info_list_append(f'max lines  : {fnumber(output_max_lines)}')
             except Exception as EE:
                 print('record:',file_name,' error:',str(EE))
 
@@ -1421,6 +3088,9 @@ class LibrerRecord:
                         line_list.append(f'lab:{hist_entry[2]}')
                         line_list.append(f'compr:{hist_entry[3]}')
                         line_list.append(f'cd:{"Yes" if hist_entry[4] else "No"}')
+                    elif hist_code==UPDATE_CODE:
+                        line_list.append(f'lab:{hist_entry[2]}')
+                        line_list.append(f'reused cd:{fnumber(hist_entry[3])}')
                     else:
                         line_list.append(f'unknown code:{hist_code}')
 
@@ -1458,25 +3128,140 @@ class LibrerRecord:
     decompressed_filestructure = False
     def decompress_filestructure(self):
         if not self.decompressed_filestructure:
+            if self.header.filestructure_mapped:
+                self.decompress_filenames()
+                self.filestructure = columns_to_filestructure(arrays_layout_to_columns(self.map_section('filestructure')))
+            else:
+                with ZipFile(self.file_path, "r") as zip_file:
+                    decompressor = ZstdDecompressor()
+
+                    self.filestructure = loads( decompressor.decompress(zip_file.read('filestructure')) )
+                    self.filenames = loads( decompressor.decompress(zip_file.read('filenames')) )
+
+                    del decompressor
+
+                if self.header.filestructure_columns:
+                    self.filestructure = columns_to_filestructure(self.filestructure)
+
+            self.decompressed_filestructure = True
+            self.prepare_info()
+
+            return True
+
+        return False
+
+    def map_section(self,datalabel):
+        with open(self.file_path,'rb') as file_obj:
+            with ZipFile(file_obj, "r") as zip_file:
+                zinfo = zip_file.getinfo(datalabel)
+
+            offset = member_data_offset(file_obj,zinfo)
+
+            if offset % ARRAYS_ALIGN:
+                file_obj.seek(offset)
+                return file_obj.read(zinfo.file_size)
+
+            mapped = mmap(file_obj.fileno(),0,access=ACCESS_READ)
+            self.mmaps.append(mapped)
+            return memoryview(mapped)[offset:offset+zinfo.file_size]
+
+    def unmap_sections(self):
+        #views of mapped sections must be released before mmap can be closed
+        self.filestructure_columns = ()
+        self.nodes_index = None
+        gc_collect()
+
+        mmaps_left = []
+        for mapped in self.mmaps:
+            try:
+                mapped.close()
+            except BufferError:
+                mmaps_left.append(mapped)
+
+        self.mmaps = mmaps_left
+        return not mmaps_left
+
+    filestructure_columns = ()
+    def decompress_filestructure_columns(self):
+        if not self.filestructure_columns:
+            if self.header.filestructure_mapped:
+                self.decompress_filenames()
+                self.filestructure_columns = arrays_layout_to_columns(self.map_section('filestructure'))
+                return True
+
             with ZipFile(self.file_path, "r") as zip_file:
                 decompressor = ZstdDecompressor()
 
-                self.filestructure = loads( decompressor.decompress(zip_file.read('filestructure')) )
+                self.filestructure_columns = loads( decompressor.decompress(zip_file.read('filestructure')) )
                 self.filenames = loads( decompressor.decompress(zip_file.read('filenames')) )
 
                 del decompressor
 
-            self.decompressed_filestructure = True
-            self.prepare_info()
-
             return True
 
         return False
 
+    def decompress_filestructure_for_search(self):
+        if self.header.filestructure_columns:
+            return self.decompress_filestructure_columns()
+
+        return self.decompress_filestructure()
+
+    def decompress_filenames(self):
+        if not self.filenames:
+            with ZipFile(self.file_path, "r") as zip_file:
+                self.filenames = loads( ZstdDecompressor().decompress(zip_file.read('filenames')) )
+
+    def decompress_optional_section(self,datalabel):
+        with ZipFile(self.file_path, "r") as zip_file:
+            if datalabel in zip_file.namelist():
+                return loads( ZstdDecompressor().decompress(zip_file.read(datalabel)) )
+        return ()
+
+    filenames_index = None
+    def decompress_filenames_index(self):
+        if self.filenames_index is None:
+            self.filenames_index = self.decompress_optional_section('filenamesindex')
+
+    nodes_index = None
+    def decompress_nodes_index(self):
+        if self.nodes_index is None:
+            if self.header.filestructure_mapped:
+                self.nodes_index = tuple(unpack_arrays(self.map_section('nodesindex'))[1])
+            else:
+                self.nodes_index = self.decompress_optional_section('nodesindex')
+
+    def filenames_candidates(self,name_search_kind,name_expr,name_case_sens):
+        if not (literals_ignorecase := search_literals(name_search_kind,name_expr,name_case_sens)):
+            return None
+
+        self.decompress_filenames_index()
+
+        if not self.filenames_index:
+            return None
+
+        return trigram_candidates(self.filenames_index,*literals_ignorecase)
+
+    customdata_index = None
+    def decompress_customdata_index(self):
+        if self.customdata_index is None:
+            self.customdata_index = self.decompress_optional_section('customdataindex')
+
+    def customdata_candidates(self,cd_search_kind,cd_expr,cd_case_sens):
+        if not (literals_ignorecase := search_literals(cd_search_kind,cd_expr,cd_case_sens)):
+            return None
+
+        self.decompress_customdata_index()
+
+        if not self.customdata_index:
+            return None
+
+        return trigram_candidates(self.customdata_index,*literals_ignorecase)
+
     def unload_filestructure(self):
         self.decompressed_filestructure = False
         del self.filestructure
-        gc_collect()
+        self.unmap_sections()
         self.filestructure = ()
         self.prepare_info()
 
@@ -1486,7 +3271,10 @@ class LibrerRecord:
             with ZipFile(self.file_path, "r") as zip_file:
                 decompressor = ZstdDecompressor()
                 try:
-                    self.customdata = loads( decompressor.decompress( zip_file.read('customdata') ) )
+                    if self.header.customdata_chunked:
+                        self.customdata = decompress_chunked(zip_file.read('customdata'))
+                    else:
+                        self.customdata = loads( decompressor.decompress( zip_file.read('customdata') ) )
                 except:
                     self.customdata = []
 
@@ -1503,10 +3291,248 @@ class LibrerRecord:
     def unload_customdata(self):
         self.decompressed_customdata = False
         del self.customdata
+        self.customdata_chunks_cache = {}
         gc_collect()
         self.customdata = []
         self.prepare_info()
 
+    def get_customdata(self,cd_nr):
+        if self.decompressed_customdata or not self.header.customdata_chunked:
+            self.decompress_customdata()
+            return self.customdata[cd_nr]
+
+        chunk_nr = cd_nr // CD_CHUNK_ITEMS
+
+        if chunk_nr not in self.customdata_chunks_cache:
+            with open(self.file_path,'rb') as file_obj:
+                with ZipFile(file_obj, "r") as zip_file:
+                    zinfo = zip_file.getinfo('customdata')
+
+                offset = member_data_offset(file_obj,zinfo)
+
+                def read_func(pos,size):
+                    file_obj.seek(offset+pos)
+                    return file_obj.read(size)
+
+                pos,frame_size = seekable_frames(read_func,zinfo.file_size)[chunk_nr]
+
+                self.customdata_chunks_cache[chunk_nr] = loads(ZstdDecompressor().decompress(read_func(pos,frame_size)))
+
+        return self.customdata_chunks_cache[chunk_nr][cd_nr % CD_CHUNK_ITEMS]
+
+#######################################################################
+SEARCH_WORKER_SEND_PERIOD = 0.1
+SEARCH_DROP_TIMEOUT = 5
+SEARCH_WORKER_SEND_QUANT = 4096
+
+#search worker -> gui frames (first byte is the frame kind)
+SEARCH_FRAME_RESULTS = ord('R')
+SEARCH_FRAME_INFO = ord('I')
+SEARCH_FRAME_END = ord('E')
+SEARCH_FRAME_DROPPED = ord('D')
+
+#progress, hits quantity, path elements quantity
+search_frame_header = Struct('<qII')
+SEARCH_FRAME_HEADER_END = 1+search_frame_header.size
+
+#path elements are indexes of record filenames
+def pack_search_results(progress,sizes,mtimes,path_lens,path_elems):
+    return b''.join( (bytes( (SEARCH_FRAME_RESULTS,) ),search_frame_header.pack(progress,len(sizes),len(path_elems)),sizes.tobytes(),mtimes.tobytes(),path_lens.tobytes(),path_elems.tobytes()) )
+
+def unpack_search_results(frame):
+    progress,hits_quant,path_elems_quant = search_frame_header.unpack_from(frame,1)
+
+    offset = SEARCH_FRAME_HEADER_END
+    columns = []
+    for typecode,quant in (('q',hits_quant),('q',hits_quant),('I',hits_quant),('I',path_elems_quant)):
+        column = array(typecode)
+        column_end = offset + quant*column.itemsize
+        column.frombytes(frame[offset:column_end])
+        columns.append(column)
+        offset = column_end
+
+    sizes,mtimes,path_lens,path_elems = columns
+
+    results = []
+    results_append = results.append
+    path_elems_index = 0
+    for size,mtime,path_len in zip(sizes,mtimes,path_lens):
+        path_elems_index_next = path_elems_index+path_len
+        results_append( (tuple(path_elems[path_elems_index:path_elems_index_next]),size,mtime) )
+        path_elems_index = path_elems_index_next
+
+    return progress,results
+
+def search_worker(conn,abort_event):
+    #long-lived search process. Keeps loaded records between queries
+    gc_disable()
+
+    records_cache = {}
+    conn_send_bytes = conn.send_bytes
+    abort_event_is_set = abort_event.is_set
+
+    while True:
+        try:
+            command = conn.recv()
+        except (EOFError,OSError):
+            break
+
+        kind = command[0]
+
+        if kind=='search':
+            file_path,params = command[1:3]
+
+            sizes,mtimes,path_lens,path_elems = array('q'),array('q'),array('I'),array('I')
+            sizes_append,mtimes_append,path_lens_append,path_elems_extend = sizes.append,mtimes.append,path_lens.append,path_elems.extend
+
+            progress_semi_list = [0]
+            next_send_time_semi_list = [perf_counter()+SEARCH_WORKER_SEND_PERIOD]
+
+            def send_results():
+                conn_send_bytes(pack_search_results(progress_semi_list[0],sizes,mtimes,path_lens,path_elems))
+                del sizes[:],mtimes[:],path_lens[:],path_elems[:]
+                next_send_time_semi_list[0] = perf_counter()+SEARCH_WORKER_SEND_PERIOD
+
+            def print_func(data):
+                progress_semi_list[0] = data[0]
+                if len(data)>1:
+                    sizes_append(data[1])
+                    mtimes_append(data[2])
+                    path_lens_append(len(data)-3)
+                    path_elems_extend(data[3:])
+
+                    if len(sizes)>=SEARCH_WORKER_SEND_QUANT or perf_counter()>next_send_time_semi_list[0]:
+                        send_results()
+
+            def print_info(info):
+                conn_send_bytes(bytes( (SEARCH_FRAME_INFO,) ) + f'# {info}'.encode('utf-8','surrogatepass'))
+
+            try:
+                try:
+                    record = records_cache[file_path]
+                except KeyError:
+                    record = LibrerRecord()
+                    if load_result := record.load(file_path):
+                        raise Exception(load_result)
+                    records_cache[file_path] = record
+
+                (size_min,size_max,t_min,t_max,find_filename_search_kind,name_expr,name_case_sens,find_cd_search_kind,cd_expr,cd_case_sens,filename_fuzzy_threshold_str,cd_fuzzy_threshold_str,type_folders,type_files,filename_fuzzy_algorithm,cd_fuzzy_algorithm) = params
+
+                name_search_kind,name_func_to_call,cd_func_to_call,custom_data_needed = search_funcs(find_filename_search_kind,name_expr,name_case_sens,find_cd_search_kind,cd_expr,cd_case_sens,filename_fuzzy_threshold_str,cd_fuzzy_threshold_str,filename_fuzzy_algorithm,cd_fuzzy_algorithm)
+
+                t0 = perf_counter()
+                record.decompress_filestructure_for_search()
+
+                if custom_data_needed:
+                    record.decompress_customdata()
+
+                name_candidates = record.filenames_candidates(name_search_kind,name_expr,name_case_sens)
+                cd_candidates = record.customdata_candidates(find_cd_search_kind,cd_expr,cd_case_sens)
+
+                t1 = perf_counter()
+                record.find_items(print_func,
+                        size_min,size_max,
+                        t_min,t_max,
+                        name_search_kind,name_func_to_call,
+                        find_cd_search_kind,cd_func_to_call,
+                        type_folders,type_files,
+                        print_info,
+                        abort_event_is_set,
+                        names_as_indexes=True,
+                        name_candidates=name_candidates,
+                        cd_candidates=cd_candidates)
+
+                t2 = perf_counter()
+                print_info(f'{record.header.label} finished. times:{t1-t0},{t2-t1}')
+
+            except Exception as se:
+                print_info(f'search_worker error:{se}')
+
+            send_results()
+            conn_send_bytes(bytes( (SEARCH_FRAME_END,) ) + search_frame_header.pack(progress_semi_list[0],0,0))
+
+        elif kind=='drop':
+            if command[1] in records_cache:
+                record = records_cache.pop(command[1])
+                record.unmap_sections()
+                del record
+                gc_collect()
+
+            conn_send_bytes(bytes( (SEARCH_FRAME_DROPPED,) ))
+
+        elif kind=='exit':
+            break
+
+    sys.exit(0)
+
+class SearchPool:
+    def __init__(self,processes):
+        ctx = get_context('spawn')
+
+        self.abort_event = ctx.Event()
+        self.conns = []
+        self.processes = []
+
+        self.record_to_worker = {}
+        self.worker_load = [0]*processes
+
+        for worker_nr in range(processes):
+            parent_conn,child_conn = ctx.Pipe()
+            process = ctx.Process(target=search_worker,args=(child_conn,self.abort_event),daemon=True)
+            process.start()
+            child_conn.close()
+
+            self.conns.append(parent_conn)
+            self.processes.append(process)
+
+    def is_alive(self):
+        return all(process.is_alive() for process in self.processes)
+
+    def worker_of_record(self,record):
+        file_path = record.file_path
+        try:
+            return self.record_to_worker[file_path]
+        except KeyError:
+            #sticky assignment - record stays resident in the least loaded worker
+            worker_load = self.worker_load
+            worker_nr = worker_load.index(min(worker_load))
+            worker_load[worker_nr] += record.header.quant_files + record.header.quant_folders
+            self.record_to_worker[file_path] = worker_nr
+            return worker_nr
+
+    def drop_record(self,record):
+        file_path = record.file_path
+        if file_path in self.record_to_worker:
+            worker_nr = self.record_to_worker.pop(file_path)
+            self.worker_load[worker_nr] -= record.header.quant_files + record.header.quant_folders
+            conn = self.conns[worker_nr]
+            try:
+                conn.send( ('drop',file_path) )
+
+                #wait until worker releases the record file (mapped files can't be deleted on windows)
+                while conn.poll(SEARCH_DROP_TIMEOUT):
+                    if conn.recv_bytes()[0]==SEARCH_FRAME_DROPPED:
+                        return True
+
+                print(f'search pool drop timeout:{file_path}')
+            except Exception as de:
+                print(f'search pool drop error:{de}')
+
+        return False
+
+    def close(self):
+        for conn in self.conns:
+            try:
+                conn.send( ('exit',) )
+                conn.close()
+            except Exception as ce:
+                print(f'search pool close error:{ce}')
+
+        for process in self.processes:
+            process.join(1)
+            if process.is_alive():
+                process.terminate()
+
 #######################################################################
 class LibrerCore:
     records = set()
@@ -1535,6 +3561,10 @@ class LibrerCore:
         self.wii_import_folders_counter = 0
         self.wii_import_space = 0
 
+        self.search_pool = None
+        #separate record subprocess per record search with json lines output (debug mode)
+        self.search_in_subprocesses = False
+
     def update_sorted(self):
         self.records_sorted = sorted(self.records,key = lambda x : x.header.creation_time)
 
@@ -2263,7 +4293,7 @@ class LibrerCore:
         new_record.header.items_names=len(new_record.filenames)
         new_record.header.items_cd=len(new_record.customdata)
 
-        new_record.filestructure = ('',code,sub_size,mtime,new_record.tupelize_rec(scan_like_data,print))
+        new_record.filestructure = ('',code,sub_size,mtime,new_record.tupelize(scan_like_data,print))
 
         new_file_path = sep.join([self.db_dir,f'vvv.{int(time())}.{postfix}.dat'])
 
@@ -2340,7 +4370,7 @@ class LibrerCore:
         new_record.header.items_names=len(new_record.filenames)
         new_record.header.items_cd=len(new_record.customdata)
 
-        new_record.filestructure = ('',code,sub_size,mtime,new_record.tupelize_rec(scan_like_data,print))
+        new_record.filestructure = ('',code,sub_size,mtime,new_record.tupelize(scan_like_data,print))
 
         label_filename=safe_filename(label)
 
@@ -2418,7 +4448,7 @@ class LibrerCore:
         new_record.header.items_names=len(new_record.filenames)
         new_record.header.items_cd=len(new_record.customdata)
 
-        new_record.filestructure = ('',code,sub_size,mtime,new_record.tupelize_rec(scan_like_data,print))
+        new_record.filestructure = ('',code,sub_size,mtime,new_record.tupelize(scan_like_data,print))
 
         label_filename=safe_filename(label)
 
@@ -2466,8 +4496,13 @@ class LibrerCore:
         shell=False
         timeout=0
         crc=False
+        max_threads=0
+        batch_size=0
+        batch_json=False
+        output_max_bytes=0
+        output_max_lines=0
 
-        new_record.header.cde_list = [ [expressions,use_smin,smin_int,use_smax,smax_int,executable,parameters,shell,timeout,crc] ]
+        new_record.header.cde_list = [ [expressions,use_smin,smin_int,use_smax,smax_int,executable,parameters,shell,timeout,crc,max_threads,batch_size,batch_json,output_max_bytes,output_max_lines] ]
         new_record.header.cde_stats_size={}
         new_record.header.cde_stats_size[0]=''
 
@@ -2514,7 +4549,7 @@ class LibrerCore:
         new_record.header.items_names=len(new_record.filenames)
         new_record.header.items_cd=len(new_record.customdata)
 
-        new_record.filestructure = ('',code,sub_size,mtime,new_record.tupelize_rec(scan_like_data,print))
+        new_record.filestructure = ('',code,sub_size,mtime,new_record.tupelize(scan_like_data,print))
 
         label_filename=safe_filename(label)
 
@@ -2568,11 +4603,14 @@ class LibrerCore:
                         header_ser_compr = compressor_compress(header_ser)
                         zip_file.writestr('header',header_ser_compr)
 
-                        zip_file.writestr('filestructure',src_zip_file.read('filestructure'))
+                        copy_section(src_zip_file,zip_file,'filestructure',header.filestructure_mapped)
                         zip_file.writestr('filenames',src_zip_file.read('filenames'))
+                        copy_section(src_zip_file,zip_file,'filenamesindex')
+                        copy_section(src_zip_file,zip_file,'nodesindex',header.filestructure_mapped)
 
                         if header.items_cd:
                             zip_file.writestr('customdata',src_zip_file.read('customdata'))
+                            copy_section(src_zip_file,zip_file,'customdataindex')
 
                     new_record = self.create()
 
@@ -2617,11 +4655,14 @@ class LibrerCore:
                     header_ser_compr = ZstdCompressor(level=record.header.compression_level,threads=-1).compress(header_ser)
                     zip_file.writestr('header',header_ser_compr)
 
-                    zip_file.writestr('filestructure',src_zip_file.read('filestructure'))
+                    copy_section(src_zip_file,zip_file,'filestructure',record.header.filestructure_mapped)
                     zip_file.writestr('filenames',src_zip_file.read('filenames'))
+                    copy_section(src_zip_file,zip_file,'filenamesindex')
+                    copy_section(src_zip_file,zip_file,'nodesindex',record.header.filestructure_mapped)
 
                     if record.header.items_cd:
                         zip_file.writestr('customdata',src_zip_file.read('customdata'))
+                        copy_section(src_zip_file,zip_file,'customdataindex')
         except Exception as ex_ex:
             self.log.error(f'export error {ex_ex}')
             return str(ex_ex)
@@ -2657,18 +4698,37 @@ class LibrerCore:
                     if compression_change:
                         data_filenames = loads(dec_dec(src_zip_file.read('filenames')))
 
-                        self.info_line = f'Compressing Filenames ({bytes_to_str(asizeof(data_filenames))})'
+                        self.info_line = f'Compressing Filenames{graph_size_info(data_filenames)}'
                         compress_with_header_update(new_header,data_filenames,new_compression,'filenames',zip_file)
+
+                        self.info_line = 'Indexing Filenames'
+                        compress_with_header_update(new_header,build_trigram_index(data_filenames),new_compression,'filenamesindex',zip_file)
                     else:
                         zip_file.writestr('filenames',src_zip_file.read('filenames'))
+                        copy_section(src_zip_file,zip_file,'filenamesindex')
 
                     if keep_cd!=bool(record.header.items_cd):
-                        data_filestructure = record.remove_cd_rec(loads(dec_dec(src_zip_file.read('filestructure'))))
+                        if header.filestructure_mapped:
+                            data_filestructure = remove_cd_columns(arrays_layout_to_columns(src_zip_file.read('filestructure')))
+                            copy_section(src_zip_file,zip_file,'nodesindex',True)
 
-                        self.info_line = f'Compressing Filestructure ({bytes_to_str(asizeof(data_filestructure))})'
-                        compress_with_header_update(new_header,data_filestructure,new_compression,'filestructure',zip_file)
+                            self.info_line = 'Storing Filestructure'
+                            store_with_header_update(new_header,columns_to_arrays_layout(data_filestructure),'filestructure',zip_file)
+                        else:
+                            if header.filestructure_columns:
+                                data_filestructure = remove_cd_columns(loads(dec_dec(src_zip_file.read('filestructure'))))
+                                copy_section(src_zip_file,zip_file,'nodesindex')
+                            else:
+                                data_filestructure = record.remove_cd_rec(loads(dec_dec(src_zip_file.read('filestructure'))))
+                                if 'nodesindex' in src_zip_file.namelist():
+                                    #children order changed
+                                    compress_with_header_update(new_header,build_nodes_index(data_filestructure,header.items_names),new_compression,'nodesindex',zip_file)
+
+                            self.info_line = f'Compressing Filestructure{graph_size_info(data_filestructure)}'
+                            compress_with_header_update(new_header,data_filestructure,new_compression,'filestructure',zip_file)
 
                         new_header.zipinfo["customdata"]=(0,0,0)
+                        new_header.zipinfo.pop('customdataindex',None)
                         new_header.cde_size_extracted = 0
                         new_header.items_cd=0
                         new_header.references_cd = 0
@@ -2679,21 +4739,30 @@ class LibrerCore:
                         new_header.compression_time['customdata']=0
 
                     elif not compression_change:
-                        zip_file.writestr('filestructure',src_zip_file.read('filestructure'))
+                        copy_section(src_zip_file,zip_file,'filestructure',header.filestructure_mapped)
+                        copy_section(src_zip_file,zip_file,'nodesindex',header.filestructure_mapped)
 
                         if header.items_cd:
                             zip_file.writestr('customdata',src_zip_file.read('customdata'))
+                            copy_section(src_zip_file,zip_file,'customdataindex')
                     else:
-                        data_filestructure = loads(dec_dec(src_zip_file.read('filestructure')))
+                        if header.filestructure_mapped:
+                            copy_section(src_zip_file,zip_file,'filestructure',True)
+                            copy_section(src_zip_file,zip_file,'nodesindex',True)
+                        else:
+                            data_filestructure = loads(dec_dec(src_zip_file.read('filestructure')))
 
-                        self.info_line = f'compressing Filestructure ({bytes_to_str(asizeof(data_filestructure))})'
-                        compress_with_header_update(new_header,data_filestructure,new_compression,'filestructure',zip_file)
+                            self.info_line = f'compressing Filestructure{graph_size_info(data_filestructure)}'
+                            compress_with_header_update(new_header,data_filestructure,new_compression,'filestructure',zip_file)
+                            copy_section(src_zip_file,zip_file,'nodesindex')
 
                         if header.items_cd:
-                            data_customdata = loads(dec_dec(src_zip_file.read('customdata')))
+                            data_customdata = decompress_chunked(src_zip_file.read('customdata')) if header.customdata_chunked else loads(dec_dec(src_zip_file.read('customdata')))
 
-                            self.info_line = f'Compressing Custom Data ({bytes_to_str(asizeof(data_customdata))})'
-                            compress_with_header_update(new_header,data_customdata,new_compression,'customdata',zip_file)
+                            self.info_line = f'Compressing Custom Data{graph_size_info(data_customdata)}'
+                            new_header.customdata_chunked = True
+                            compress_chunked_with_header_update(new_header,data_customdata,new_compression,'customdata',zip_file)
+                            copy_section(src_zip_file,zip_file,'customdataindex')
 
                     header_ser = dumps(new_header)
                     header_ser_compr = ZstdCompressor(level=new_compression,threads=-1).compress(header_ser)
@@ -2935,11 +5004,12 @@ class LibrerCore:
             find_filename_search_kind,name_expr,name_case_sens,
             find_cd_search_kind,cd_expr,cd_case_sens,
             filename_fuzzy_threshold,cd_fuzzy_threshold,
-            type_folders,type_files):
+            type_folders,type_files,
+            filename_fuzzy_algorithm='SequenceMatcher',cd_fuzzy_algorithm='SequenceMatcher'):
 
         self.total_search_progress = 0
 
-        self.log.info(f'find_items_in_records:{size_min},{size_max},{find_filename_search_kind},{name_expr},{name_case_sens},{find_cd_search_kind},{cd_expr},{cd_case_sens},{filename_fuzzy_threshold},{cd_fuzzy_threshold},{type_folders},{type_files}')
+        self.log.info(f'find_items_in_records:{size_min},{size_max},{find_filename_search_kind},{name_expr},{name_case_sens},{find_cd_search_kind},{cd_expr},{cd_case_sens},{filename_fuzzy_threshold},{cd_fuzzy_threshold},{type_folders},{type_files},{filename_fuzzy_algorithm},{cd_fuzzy_algorithm}')
 
         self.find_results_clean()
 
@@ -2952,7 +5022,19 @@ class LibrerCore:
             t_min,t_max,
             find_filename_search_kind,name_expr,name_case_sens,
             find_cd_search_kind,cd_expr,cd_case_sens,
-            filename_fuzzy_threshold,cd_fuzzy_threshold,type_folders,type_files)
+            filename_fuzzy_threshold,cd_fuzzy_threshold,type_folders,type_files,
+            filename_fuzzy_algorithm,cd_fuzzy_algorithm)
+
+        self.find_res_quant = 0
+
+        self.search_record_nr=0
+
+        self.abort_action = False
+        for record in records_to_process:
+            record.abort_action = False
+
+        if not self.search_in_subprocesses and self.get_search_pool():
+            return self.find_items_in_records_pool(records_to_process,params)
 
         searchinfofile = sep.join([temp_dir,SEARCH_DAT_FILE])
         try:
@@ -2968,15 +5050,6 @@ class LibrerCore:
             curr_command_list.extend(['search',record.file_path,temp_dir])
             self.log.info(f'curr_command_list: {curr_command_list}')
 
-        self.find_res_quant = 0
-
-
-        self.search_record_nr=0
-
-        self.abort_action = False
-        for record in records_to_process:
-            record.abort_action = False
-
         ############################################################
 
         max_processes = cpu_count()
@@ -3041,6 +5114,7 @@ class LibrerCore:
             jobs[record_nr] = [0,None]
 
             record.find_results=[]
+            record.find_results_by_index=False
 
         self.info_line = 'subprocesses run.'
 
@@ -3105,6 +5179,133 @@ class LibrerCore:
 
         return True
 
+    def get_search_pool(self):
+        if self.search_pool and not self.search_pool.is_alive():
+            self.log.warning('search pool not alive')
+            self.search_pool_close()
+
+        if not self.search_pool:
+            try:
+                self.info_line = 'Starting search processes ...'
+                self.search_pool = SearchPool(cpu_count())
+            except Exception as pe:
+                self.log.error(f'search pool start error:{pe}')
+                self.search_pool = None
+
+        return self.search_pool
+
+    def search_pool_close(self):
+        if self.search_pool:
+            self.search_pool.close()
+            self.search_pool = None
+
+    def find_items_in_records_pool(self,records_to_process,params):
+        search_pool = self.search_pool
+        search_pool.abort_event.clear()
+
+        records_to_process_len = len(records_to_process)
+
+        total_progress=[0]*records_to_process_len
+        info_list=[[] for record in records_to_process]
+
+        #0 - waiting, 1 - running, 2 - finished
+        records_state=[0]*records_to_process_len
+
+        records_nrs_per_worker=defaultdict(list)
+        for record_nr,record in enumerate(records_to_process):
+            record.find_results=[]
+            record.find_results_by_index=True
+            records_nrs_per_worker[search_pool.worker_of_record(record)].append(record_nr)
+
+        pool_broken_semi_list = [False]
+
+        #####################################################
+        def threaded_pool_run(worker_nr,records_nrs):
+            conn = search_pool.conns[worker_nr]
+            conn_send = conn.send
+            conn_recv_bytes = conn.recv_bytes
+
+            for record_nr in records_nrs:
+                if self.abort_action or pool_broken_semi_list[0]:
+                    break
+
+                record = records_to_process[record_nr]
+                record_find_results_extend = record.find_results.extend
+                info_list_record_append = info_list[record_nr].append
+
+                records_state[record_nr]=1
+                try:
+                    conn_send( ('search',record.file_path,params) )
+
+                    while True:
+                        frame = conn_recv_bytes()
+                        kind = frame[0]
+
+                        if kind==SEARCH_FRAME_RESULTS:
+                            total_progress[record_nr],results = unpack_search_results(frame)
+                            record_find_results_extend(results)
+                        elif kind==SEARCH_FRAME_INFO:
+                            info_list_record_append(frame[1:].decode('utf-8','surrogatepass'))
+                        elif kind==SEARCH_FRAME_END:
+                            total_progress[record_nr] = search_frame_header.unpack_from(frame,1)[0]
+                            break
+
+                except Exception as te:
+                    info_list_record_append(f'threaded_pool_run error:{te}')
+                    pool_broken_semi_list[0]=True
+
+                records_state[record_nr]=2
+
+            sys.exit() #thread
+
+        #####################################################
+        jobs = []
+        for worker_nr,records_nrs in records_nrs_per_worker.items():
+            job = Thread(target=lambda worker_nr=worker_nr,records_nrs=records_nrs : threaded_pool_run(worker_nr,records_nrs),daemon=True)
+            job.start()
+            jobs.append(job)
+
+        abort_sent = False
+        while any(job.is_alive() for job in jobs):
+            if self.abort_action and not abort_sent:
+                self.info_line = 'Aborting ...'
+                search_pool.abort_event.set()
+                abort_sent = True
+            else:
+                waiting = records_state.count(0)
+                running = records_state.count(1)
+                finished = self.search_record_nr = records_to_process_len-running-waiting
+
+                self.records_perc_info = (self.search_record_nr+0.5) * 100.0 / records_to_process_len
+
+                self.info_line = f'Processes: waiting:{waiting}, running:{running}, finished:{finished}'
+
+            self.total_search_progress = sum(total_progress)
+            self.find_res_quant = sum([len(record.find_results) for record in records_to_process])
+
+            sleep(0.1)
+
+        for job in jobs:
+            job.join()
+
+        search_pool.abort_event.clear()
+
+        if pool_broken_semi_list[0]:
+            self.log.error('search pool broken')
+            self.search_pool_close()
+
+        #####################################################
+        for record in records_to_process:
+            record.find_results_tuples_set = {result[0] for result in record.find_results}
+
+        for record_nr,info in enumerate(info_list):
+            self.log.info(f'got info for record:{record_nr}')
+            for info_line in info:
+                self.log.info(info_line)
+            self.log.info('')
+
+        return True
+
     ########################################################################################################################
 
     def delete_record(self,record):
@@ -3114,6 +5315,11 @@ class LibrerCore:
         self.records.remove(record)
         self.remove_record_from_group(record)
 
+        if self.search_pool:
+            self.search_pool.drop_record(record)
+
+        record.unmap_sections()
+
         if file_name in self.aliases:
             del self.aliases[file_name]
             #print('removed from aliases')
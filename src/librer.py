@@ -50,6 +50,7 @@ print('encoding =',getencoding())
 
 from time import sleep
 from threading import Thread
+from multiprocessing import freeze_support
 from traceback import format_stack
 import sys
 import logging
@@ -119,6 +120,8 @@ CFG_KEY_find_cd_case_sens = 'cd_case_sens'
 
 CFG_KEY_filename_fuzzy_threshold = 'filename_fuzzy_threshold'
 CFG_KEY_cd_fuzzy_threshold = 'cd_fuzzy_threshold'
+CFG_KEY_filename_fuzzy_algorithm = 'filename_fuzzy_algorithm'
+CFG_KEY_cd_fuzzy_algorithm = 'cd_fuzzy_algorithm'
 
 CFG_KEY_SEARCH_TXT_STRING = 'search_txt_string'
 CFG_KEY_SEARCH_TXT_CS = 'search_txt_cs'
@@ -134,6 +137,14 @@ CFG_KEY_SHOW_TOOLTIPS_INFO = 'show_tooltips_info'
 CFG_KEY_SHOW_TOOLTIPS_HELP = 'show_tooltips_help'
 CFG_KEY_groups_collapse = 'groups_collapse'
 CFG_KEY_include_hidden = 'include_hidden'
+CFG_KEY_index_cd = 'index_cd'
+CFG_KEY_columns = 'columns'
+CFG_KEY_mapped = 'mapped'
+CFG_KEY_cde_largest_first = 'cde_largest_first'
+CFG_KEY_cde_event_driven = 'cde_event_driven'
+CFG_KEY_cde_cache = 'cde_cache'
+CFG_KEY_cde_cache_hash = 'cde_cache_hash'
+CFG_KEY_streaming = 'streaming'
 CFG_KEY_column_time = 'column_time'
 CFG_KEY_column_size = 'column_size'
 CFG_KEY_select_found = 'select_found'
@@ -170,6 +181,8 @@ cfg_defaults={
 
     CFG_KEY_filename_fuzzy_threshold:'0.95',
     CFG_KEY_cd_fuzzy_threshold:'0.95',
+    CFG_KEY_filename_fuzzy_algorithm:'SequenceMatcher',
+    CFG_KEY_cd_fuzzy_algorithm:'SequenceMatcher',
 
     CFG_KEY_SEARCH_TXT_STRING:'',
     CFG_KEY_SEARCH_TXT_CS:False,
@@ -182,6 +195,14 @@ cfg_defaults={
     CFG_KEY_SHOW_TOOLTIPS_INFO:True,
     CFG_KEY_groups_collapse:True,
     CFG_KEY_include_hidden:False,
+    CFG_KEY_index_cd:False,
+    CFG_KEY_columns:False,
+    CFG_KEY_mapped:False,
+    CFG_KEY_cde_largest_first:False,
+    CFG_KEY_cde_event_driven:True,
+    CFG_KEY_cde_cache:False,
+    CFG_KEY_cde_cache_hash:True,
+    CFG_KEY_streaming:False,
     CFG_KEY_column_time:True,
     CFG_KEY_column_size:True,
     CFG_KEY_select_found:False,
@@ -789,6 +810,7 @@ class Gui:
                 self_file_cascade_add_separator = self.file_cascade.add_separator
 
                 self_file_cascade_add_command(label = STR('New record ...'),command = self.scan_dialog_show, accelerator="Ctrl+N",image = self.ico_record_new,compound='left')
+                self_file_cascade_add_command(label = STR('Update record ...'),command = lambda : self.scan_dialog_show(True),image = self.ico_record_new,compound='left',state='normal' if self.current_record and self.current_record.header.items_cd else 'disabled')
 
                 self_file_cascade_add_separator()
                 self_file_cascade_add_command(label = STR('Import record ...'), accelerator='Ctrl+I', command = self.record_import,image = self.ico_record_import,compound='left')
@@ -1211,7 +1233,7 @@ class Gui:
             data_tuple = self.item_to_data[item]
             code = data_tuple[1]
 
-            is_dir,is_file,is_symlink,is_bind,has_cd,has_files,cd_ok,cd_aborted,cd_empty,aux2 = LUT_decode[code]
+            is_dir,is_file,is_symlink,is_bind,has_cd,has_files,cd_ok,cd_aborted,cd_empty,cd_truncated = LUT_decode[code]
         return has_cd
 
     type_info_or_help={}
@@ -1330,6 +1352,11 @@ class Gui:
             self.shell_checkbutton[e].configure(state='normal')
             self.open_button[e].configure(state='normal')
             self.timeout_entry[e].configure(state='normal')
+            self.threads_entry[e].configure(state='normal')
+            self.batch_entry[e].configure(state='normal')
+            self.batch_json_checkbutton[e].configure(state='normal')
+            self.output_max_bytes_entry[e].configure(state='normal')
+            self.output_max_lines_entry[e].configure(state='normal')
             self.test_button[e].configure(state='normal')
 
             self.shell_change(e)
@@ -1342,6 +1369,11 @@ class Gui:
             self.shell_checkbutton[e].configure(state='disabled')
             self.open_button[e].configure(state='disabled')
             self.timeout_entry[e].configure(state='disabled')
+            self.threads_entry[e].configure(state='disabled')
+            self.batch_entry[e].configure(state='disabled')
+            self.batch_json_checkbutton[e].configure(state='disabled')
+            self.output_max_bytes_entry[e].configure(state='disabled')
+            self.output_max_lines_entry[e].configure(state='disabled')
             self.test_button[e].configure(state='disabled')
 
         if do_cd or do_crc:
@@ -1362,6 +1394,9 @@ class Gui:
     def scan_threads_set(self):
         self.scan_threads_var_int.set(int(self.scan_threads_var.get()))
 
+    def scan_walkers_set(self):
+        self.scan_walkers_var_int.set(int(self.scan_walkers_var.get()))
+
     scan_dialog_created = False
     @restore_status_line
     @block
@@ -1423,6 +1458,12 @@ class Gui:
             self.drives_menu = Menu(self.add_dev_button, tearoff=0,postcommand=self.set_dev_to_scan_menu)
             self.add_dev_button["menu"] = self.drives_menu
 
+            self.scan_update_record = None
+            self.scan_update_var = BooleanVar()
+            self.scan_update_cb = Checkbutton(temp_frame,text=' ' + STR('Reuse Custom Data of unchanged files from record:'),variable=self.scan_update_var)
+            self.scan_update_cb.grid(row=1, column=0, sticky='w',padx=4,pady=4,columnspan=6)
+            self.widget_tooltip(self.scan_update_cb,STR('Custom Data Extractors are executed only for new files and files with changed size or modification time.\nCustom Data of other files is copied from the selected record if the extractor rule is identical.'))
+
             temp_frame.grid_columnconfigure(1, weight=1)
 
             ##############
@@ -1465,6 +1506,21 @@ class Gui:
             self.widget_tooltip(threads_label,threads_tooltip)
             self.widget_tooltip(threads_in_label,threads_tooltip)
 
+            (scan_walkers_frame := Frame(dialog.area_buttons,bg=self.bg_color)).pack(side='right',padx=4,pady=4)
+            self.scan_walkers_var = IntVar()
+            self.scan_walkers_var_int = IntVar()
+
+            self.scan_walkers_var.set(1)
+            self.scan_walkers_var_int.set(1)
+
+            (walkers_label := Label(scan_walkers_frame, text=STR('Scan Threads:'),bg=self.bg_color,relief='flat')).pack(side='left',padx=2,pady=2)
+            (walkers_scale := Scale(scan_walkers_frame, variable=self.scan_walkers_var, orient='horizontal',from_=1, to=32,command=lambda x : self.scan_walkers_set(),style="TScale",length=100)).pack(fill='x',side='left',expand=1,padx=2)
+            (walkers_in_label := Label(scan_walkers_frame, textvariable=self.scan_walkers_var_int,width=3,bg=self.bg_color,relief='groove',borderwidth=2)).pack(side='left',padx=2,pady=2)
+            walkers_tooltip = STR("Number of threads listing folders during scan\n\n1 - single thread (default value)\n\nHigher values help on network shares and NAS,\nwhere listing of every folder waits for the server.")
+            self.widget_tooltip(walkers_scale,walkers_tooltip)
+            self.widget_tooltip(walkers_label,walkers_tooltip)
+            self.widget_tooltip(walkers_in_label,walkers_tooltip)
+
             self.single_device=BooleanVar()
             single_device_button = Checkbutton(dialog.area_buttons,text=STR('one device mode'),variable=self.single_device)
             single_device_button.pack(side='right',padx=2,pady=2)
@@ -1491,7 +1547,12 @@ class Gui:
             (lab_exec := Label(cde_frame,text=STR('Executable'),bg=self.bg_color,anchor='n',relief='groove',bd=2)).grid(row=1, column=7,sticky='news')
             (lab_pars  := Label(cde_frame,text=STR('Parameters'),bg=self.bg_color,anchor='n',relief='groove',bd=2)).grid(row=1, column=8,sticky='news')
             (lab_timeout := Label(cde_frame,image=self.ico_timeout,bg=self.bg_color,anchor='center',relief='groove',bd=2,width=3)).grid(row=1, column=9,sticky='news')
-            (lab_test := Label(cde_frame,image=self.ico_test_col,bg=self.bg_color,anchor='center',relief='groove',bd=2)).grid(row=1, column=10,sticky='news')
+            (lab_threads := Label(cde_frame,text=STR('Threads'),bg=self.bg_color,anchor='center',relief='groove',bd=2)).grid(row=1, column=10,sticky='news')
+            (lab_batch := Label(cde_frame,text=STR('Batch'),bg=self.bg_color,anchor='center',relief='groove',bd=2)).grid(row=1, column=11,sticky='news')
+            (lab_batch_json := Label(cde_frame,text='JSON',bg=self.bg_color,anchor='center',relief='groove',bd=2)).grid(row=1, column=12,sticky='news')
+            (lab_output_max_bytes := Label(cde_frame,text=STR('Max output'),bg=self.bg_color,anchor='center',relief='groove',bd=2)).grid(row=1, column=13,sticky='news')
+            (lab_output_max_lines := Label(cde_frame,text=STR('Max lines'),bg=self.bg_color,anchor='center',relief='groove',bd=2)).grid(row=1, column=14,sticky='news')
+            (lab_test := Label(cde_frame,image=self.ico_test_col,bg=self.bg_color,anchor='center',relief='groove',bd=2)).grid(row=1, column=15,sticky='news')
 
             up_tooltip = STR('UP_TOOLTIP')
             use_tooltip = STR("Mark to use CD Extractor")
@@ -1504,6 +1565,11 @@ class Gui:
             shell_tooltip = STR('SHELL_TOOLTIP')
             open_tooltip = STR('OPEN_TOOLTIP')
             timeout_tooltip = STR('TIMEOUT_TOOLTIP')
+            threads_tooltip = STR('CDE_THREADS_TOOLTIP')
+            batch_tooltip = STR('CDE_BATCH_TOOLTIP')
+            batch_json_tooltip = STR('CDE_BATCH_JSON_TOOLTIP')
+            output_max_bytes_tooltip = STR('CDE_OUTPUT_MAX_BYTES_TOOLTIP')
+            output_max_lines_tooltip = STR('CDE_OUTPUT_MAX_LINES_TOOLTIP')
             test_tooltip_common = STR('TEST_TOOLTIP_COMMOMN')
             test_tooltip = STR('TEST_TOOLTIP') + test_tooltip_common
 
@@ -1518,6 +1584,11 @@ class Gui:
             self_widget_tooltip(lab_shell,shell_tooltip)
             self_widget_tooltip(lab_open,open_tooltip)
             self_widget_tooltip(lab_timeout,timeout_tooltip)
+            self_widget_tooltip(lab_threads,threads_tooltip)
+            self_widget_tooltip(lab_batch,batch_tooltip)
+            self_widget_tooltip(lab_batch_json,batch_json_tooltip)
+            self_widget_tooltip(lab_output_max_bytes,output_max_bytes_tooltip)
+            self_widget_tooltip(lab_output_max_lines,output_max_lines_tooltip)
             self_widget_tooltip(lab_test,test_tooltip)
             #self_widget_tooltip(lab_crc,crc_tooltip)
 
@@ -1531,6 +1602,11 @@ class Gui:
             self.CDE_parameters_var_list=[]
             self.CDE_shell_var_list=[]
             self.CDE_timeout_var_list=[]
+            self.CDE_threads_var_list=[]
+            self.CDE_batch_var_list=[]
+            self.CDE_batch_json_var_list=[]
+            self.CDE_output_max_bytes_var_list=[]
+            self.CDE_output_max_lines_var_list=[]
             self.CDE_crc_var_list=[]
 
             self.up_button={}
@@ -1544,6 +1620,11 @@ class Gui:
             self.shell_checkbutton={}
             self.open_button={}
             self.timeout_entry={}
+            self.threads_entry={}
+            self.batch_entry={}
+            self.batch_json_checkbutton={}
+            self.output_max_bytes_entry={}
+            self.output_max_lines_entry={}
             self.test_button={}
             self.crc_entry={}
 
@@ -1556,6 +1637,11 @@ class Gui:
                 self.CDE_parameters_var_list.append(StringVar())
                 self.CDE_shell_var_list.append(BooleanVar())
                 self.CDE_timeout_var_list.append(StringVar())
+                self.CDE_threads_var_list.append(StringVar())
+                self.CDE_batch_var_list.append(StringVar())
+                self.CDE_batch_json_var_list.append(BooleanVar())
+                self.CDE_output_max_bytes_var_list.append(StringVar())
+                self.CDE_output_max_lines_var_list.append(StringVar())
                 self.CDE_crc_var_list.append(BooleanVar())
 
                 row = e+2
@@ -1593,8 +1679,23 @@ class Gui:
                 self.timeout_entry[e] = Entry(cde_frame,textvariable=self.CDE_timeout_var_list[e],width=3)
                 self.timeout_entry[e].grid(row=row, column=9,sticky='news')
 
+                self.threads_entry[e] = Entry(cde_frame,textvariable=self.CDE_threads_var_list[e],width=3)
+                self.threads_entry[e].grid(row=row, column=10,sticky='news')
+
                 self.test_button[e] = Button(cde_frame,image=self.ico_test,command = lambda x=e : self.cde_test(x) )
-                self.test_button[e].grid(row=row,column=10,sticky='news')
+                self.batch_entry[e] = Entry(cde_frame,textvariable=self.CDE_batch_var_list[e],width=3)
+                self.batch_entry[e].grid(row=row, column=11,sticky='news')
+
+                self.batch_json_checkbutton[e] = Checkbutton(cde_frame,variable=self.CDE_batch_json_var_list[e])
+                self.batch_json_checkbutton[e].grid(row=row, column=12,sticky='news')
+
+                self.output_max_bytes_entry[e] = Entry(cde_frame,textvariable=self.CDE_output_max_bytes_var_list[e],width=6)
+                self.output_max_bytes_entry[e].grid(row=row, column=13,sticky='news')
+
+                self.output_max_lines_entry[e] = Entry(cde_frame,textvariable=self.CDE_output_max_lines_var_list[e],width=6)
+                self.output_max_lines_entry[e].grid(row=row, column=14,sticky='news')
+
+                self.test_button[e].grid(row=row,column=15,sticky='news')
 
                 #self.crc_entry[e] = Checkbutton(cde_frame,variable=self.CDE_crc_var_list[e],command = lambda x=e : self.use_checkbutton_mod(x))
                 #self.crc_entry[e].grid(row=row, column=9,sticky='news')
@@ -1609,6 +1710,11 @@ class Gui:
                 self.widget_tooltip(self.shell_checkbutton[e],shell_tooltip)
                 self.widget_tooltip(self.open_button[e],open_tooltip)
                 self.widget_tooltip(self.timeout_entry[e],timeout_tooltip)
+                self.widget_tooltip(self.threads_entry[e],threads_tooltip)
+                self.widget_tooltip(self.batch_entry[e],batch_tooltip)
+                self.widget_tooltip(self.batch_json_checkbutton[e],batch_json_tooltip)
+                self.widget_tooltip(self.output_max_bytes_entry[e],output_max_bytes_tooltip)
+                self.widget_tooltip(self.output_max_lines_entry[e],output_max_lines_tooltip)
                 self.widget_tooltip(self.test_button[e],test_tooltip)
                 #self.widget_tooltip(self.crc_entry[e],crc_tooltip)
 
@@ -2076,6 +2182,38 @@ class Gui:
             self.expand_search_results_cb = Checkbutton(find_frame,text=' ' + STR('Expand record on search results dialog'),variable=self.expand_search_results_var)
             self.expand_search_results_cb.grid(row=3, column=0, sticky='news',padx=0,pady=4)
 
+            self.index_cd_var = BooleanVar()
+            self.index_cd_cb = Checkbutton(find_frame,text=' ' + STR('Index custom data in new records (faster custom data search)'),variable=self.index_cd_var)
+            self.index_cd_cb.grid(row=4, column=0, sticky='news',padx=0,pady=4)
+
+            self.columns_var = BooleanVar()
+            self.columns_cb = Checkbutton(find_frame,text=' ' + STR('Columnar file structure in new records (less memory when searching)'),variable=self.columns_var)
+            self.columns_cb.grid(row=5, column=0, sticky='news',padx=0,pady=4)
+
+            self.mapped_var = BooleanVar()
+            self.mapped_cb = Checkbutton(find_frame,text=' ' + STR('Memory mapped file structure in new records (uncompressed, fastest loading)'),variable=self.mapped_var)
+            self.mapped_cb.grid(row=6, column=0, sticky='news',padx=0,pady=4)
+
+            self.cde_largest_first_var = BooleanVar()
+            self.cde_largest_first_cb = Checkbutton(find_frame,text=' ' + STR('Extract Custom Data of largest files first (better use of CDE threads)'),variable=self.cde_largest_first_var)
+            self.cde_largest_first_cb.grid(row=7, column=0, sticky='news',padx=0,pady=4)
+
+            self.cde_cache_var = BooleanVar()
+            self.cde_cache_cb = Checkbutton(find_frame,text=' ' + STR('Custom Data cache shared by all records (copies of files are not extracted again)'),variable=self.cde_cache_var)
+            self.cde_cache_cb.grid(row=8, column=0, sticky='news',padx=0,pady=4)
+
+            self.cde_cache_hash_var = BooleanVar()
+            self.cde_cache_hash_cb = Checkbutton(find_frame,text=' ' + STR('Custom Data cache - verify files with partial content hash'),variable=self.cde_cache_hash_var)
+            self.cde_cache_hash_cb.grid(row=9, column=0, sticky='news',padx=0,pady=4)
+
+            self.streaming_var = BooleanVar()
+            self.streaming_cb = Checkbutton(find_frame,text=' ' + STR('Low memory record creation (scanned folders spilled to temporary file)'),variable=self.streaming_var)
+            self.streaming_cb.grid(row=10, column=0, sticky='news',padx=0,pady=4)
+
+            self.cde_event_driven_var = BooleanVar()
+            self.cde_event_driven_cb = Checkbutton(find_frame,text=' ' + STR('Event driven Custom Data extraction (single thread waiting for all extractors, not on Windows)'),variable=self.cde_event_driven_var)
+            self.cde_event_driven_cb.grid(row=11, column=0, sticky='news',padx=0,pady=4)
+
             sfdma.grid_columnconfigure( 0, weight=1)
             sfdma.grid_rowconfigure( 9, weight=1)
 
@@ -2087,6 +2225,7 @@ class Gui:
 
             self.exclude_entry = Entry(exclude_frame,textvariable=self.exclude_var)
             self.exclude_entry.pack(expand='yes',fill="both",padx=3,pady=3)
+            self.widget_tooltip(self.exclude_entry,STR('EXCLUDE_TOOLTIP'))
 
             bfr=Frame(self.settings_dialog.area_main,bg=self.bg_color)
 
@@ -2108,7 +2247,15 @@ class Gui:
                 (self.column_size_var,CFG_KEY_column_size),
                 (self.select_found_var,CFG_KEY_select_found),
                 (self.search_after_action_var,CFG_KEY_after_action),
-                (self.expand_search_results_var,CFG_KEY_expand_search_results)
+                (self.expand_search_results_var,CFG_KEY_expand_search_results),
+                (self.index_cd_var,CFG_KEY_index_cd),
+                (self.columns_var,CFG_KEY_columns),
+                (self.mapped_var,CFG_KEY_mapped),
+                (self.cde_largest_first_var,CFG_KEY_cde_largest_first),
+                (self.cde_event_driven_var,CFG_KEY_cde_event_driven),
+                (self.cde_cache_var,CFG_KEY_cde_cache),
+                (self.cde_cache_hash_var,CFG_KEY_cde_cache_hash),
+                (self.streaming_var,CFG_KEY_streaming)
             ]
 
             self.settings_str = [
@@ -2125,6 +2272,14 @@ class Gui:
         self.select_found_var.set(self.cfg.get(CFG_KEY_select_found))
         self.search_after_action_var.set(self.cfg.get(CFG_KEY_after_action))
         self.expand_search_results_var.set(self.cfg.get(CFG_KEY_expand_search_results))
+        self.index_cd_var.set(self.cfg.get(CFG_KEY_index_cd))
+        self.columns_var.set(self.cfg.get(CFG_KEY_columns))
+        self.mapped_var.set(self.cfg.get(CFG_KEY_mapped))
+        self.cde_largest_first_var.set(self.cfg.get(CFG_KEY_cde_largest_first))
+        self.cde_event_driven_var.set(self.cfg.get(CFG_KEY_cde_event_driven))
+        self.cde_cache_var.set(self.cfg.get(CFG_KEY_cde_cache))
+        self.cde_cache_hash_var.set(self.cfg.get(CFG_KEY_cde_cache_hash))
+        self.streaming_var.set(self.cfg.get(CFG_KEY_streaming))
         self.lang_var.set(self.cfg_get(CFG_LANG))
         self.theme_var.set(self.cfg_get(CFG_THEME))
         self.exclude_var.set(self.cfg_get(CFG_EXCLUDE))
@@ -2177,6 +2332,30 @@ class Gui:
         if self.cfg.get(CFG_KEY_include_hidden)!=self.scan_hidden_var.get():
             self.cfg.set(CFG_KEY_include_hidden,self.scan_hidden_var.get())
 
+        if self.cfg.get(CFG_KEY_index_cd)!=self.index_cd_var.get():
+            self.cfg.set(CFG_KEY_index_cd,self.index_cd_var.get())
+
+        if self.cfg.get(CFG_KEY_columns)!=self.columns_var.get():
+            self.cfg.set(CFG_KEY_columns,self.columns_var.get())
+
+        if self.cfg.get(CFG_KEY_mapped)!=self.mapped_var.get():
+            self.cfg.set(CFG_KEY_mapped,self.mapped_var.get())
+
+        if self.cfg.get(CFG_KEY_cde_largest_first)!=self.cde_largest_first_var.get():
+            self.cfg.set(CFG_KEY_cde_largest_first,self.cde_largest_first_var.get())
+
+        if self.cfg.get(CFG_KEY_cde_event_driven)!=self.cde_event_driven_var.get():
+            self.cfg.set(CFG_KEY_cde_event_driven,self.cde_event_driven_var.get())
+
+        if self.cfg.get(CFG_KEY_cde_cache)!=self.cde_cache_var.get():
+            self.cfg.set(CFG_KEY_cde_cache,self.cde_cache_var.get())
+
+        if self.cfg.get(CFG_KEY_cde_cache_hash)!=self.cde_cache_hash_var.get():
+            self.cfg.set(CFG_KEY_cde_cache_hash,self.cde_cache_hash_var.get())
+
+        if self.cfg.get(CFG_KEY_streaming)!=self.streaming_var.get():
+            self.cfg.set(CFG_KEY_streaming,self.streaming_var.get())
+
         cols_change=False
         tree=self.tree
         if self.cfg.get(CFG_KEY_column_time)!=self.column_time_var.get():
@@ -2249,6 +2428,7 @@ class Gui:
 
             self.find_name_case_sens_var = BooleanVar()
             self.find_name_fuzzy_threshold = StringVar()
+            self.find_name_fuzzy_algorithm = StringVar()
 
             self.find_cd_regexp_var = StringVar()
             self.find_cd_glob_var = StringVar()
@@ -2256,6 +2436,7 @@ class Gui:
 
             self.find_cd_case_sens_var = BooleanVar()
             self.find_cd_fuzzy_threshold = StringVar()
+            self.find_cd_fuzzy_algorithm = StringVar()
             ##############
 
             def ver_number(var):
@@ -2299,6 +2480,9 @@ class Gui:
             self.find_name_fuzzy_threshold.set(self.cfg.get(CFG_KEY_filename_fuzzy_threshold))
             self.find_cd_fuzzy_threshold.set(self.cfg.get(CFG_KEY_cd_fuzzy_threshold))
 
+            self.find_name_fuzzy_algorithm.set(self.cfg.get(CFG_KEY_filename_fuzzy_algorithm))
+            self.find_cd_fuzzy_algorithm.set(self.cfg.get(CFG_KEY_cd_fuzzy_algorithm))
+
             ##############
 
             sfdma = self.find_dialog.area_main
@@ -2381,6 +2565,10 @@ class Gui:
 
             self.find_filename_fuzzy_threshold_entry.bind("<KeyRelease>", self.find_mod_keypress)
 
+            self.find_filename_fuzzy_algorithm_cb = Combobox(find_filename_frame,values=FUZZY_ALGORITHMS,textvariable=self.find_name_fuzzy_algorithm,state='readonly',width=16)
+            self.find_filename_fuzzy_algorithm_cb.grid(row=4, column=4, sticky='wens',padx=4,pady=4)
+            self.find_filename_fuzzy_algorithm_cb.bind('<<ComboboxSelected>>', lambda event : self.find_mod())
+
             self.widget_tooltip(regexp_radio_name,regexp_tooltip + regexp_tooltip_name)
             self.widget_tooltip(self.find_filename_regexp_entry,regexp_tooltip + regexp_tooltip_name)
             self.widget_tooltip(glob_radio_name,glob_tooltip + glob_tooltip_name)
@@ -2389,6 +2577,7 @@ class Gui:
             self.widget_tooltip(fuzzy_radio_name,fuzzy_tooltip + fuzzy_tooltip_name)
             self.widget_tooltip(self.find_filename_fuzz_entry,fuzzy_tooltip + fuzzy_tooltip_name)
             self.widget_tooltip(self.find_filename_fuzzy_threshold_entry,fuzzy_tooltip + fuzzy_tooltip_name)
+            self.widget_tooltip(self.find_filename_fuzzy_algorithm_cb,STR('FUZZY_ALGORITHM_TOOLTIP'))
 
             find_filename_frame.grid_columnconfigure( 1, weight=1)
 
@@ -2452,6 +2641,10 @@ class Gui:
 
             self.find_cd_fuzzy_threshold_entry.bind("<KeyRelease>", self.find_mod_keypress)
 
+            self.find_cd_fuzzy_algorithm_cb = Combobox(find_cd_frame,values=FUZZY_ALGORITHMS,textvariable=self.find_cd_fuzzy_algorithm,state='readonly',width=16)
+            self.find_cd_fuzzy_algorithm_cb.grid(row=8, column=4, sticky='wens',padx=4,pady=4)
+            self.find_cd_fuzzy_algorithm_cb.bind('<<ComboboxSelected>>', lambda event : self.find_mod())
+
             self.widget_tooltip(regexp_radio_cd,regexp_tooltip + regexp_tooltip_cd)
             self.widget_tooltip(self.find_cd_regexp_entry,regexp_tooltip + regexp_tooltip_cd)
             self.widget_tooltip(glob_radio_cd,glob_tooltip + glob_tooltip_cd)
@@ -2460,6 +2653,7 @@ class Gui:
             self.widget_tooltip(fuzzy_radio_cd,fuzzy_tooltip + fuzzy_tooltip_cd)
             self.widget_tooltip(self.find_cd_fuzz_entry,fuzzy_tooltip + fuzzy_tooltip_cd)
             self.widget_tooltip(self.find_cd_fuzzy_threshold_entry,fuzzy_tooltip + fuzzy_tooltip_cd)
+            self.widget_tooltip(self.find_cd_fuzzy_algorithm_cb,STR('FUZZY_ALGORITHM_TOOLTIP'))
 
             find_cd_frame.grid_columnconfigure(1, weight=1)
 
@@ -3485,7 +3679,7 @@ class Gui:
                                     tooltip_list.append(STR('size   ') + f'   : {bytes_to_str(size)} ({size_formatted} B)')
 
                                 code = data_tuple[1]
-                                is_dir,is_file,is_symlink,is_bind,has_cd,has_files,cd_ok,cd_aborted,cd_empty,aux2 = LUT_decode[code]
+                                is_dir,is_file,is_symlink,is_bind,has_cd,has_files,cd_ok,cd_aborted,cd_empty,cd_truncated = LUT_decode[code]
 
                                 if is_symlink:
                                     tooltip_list.append('')
@@ -3506,6 +3700,8 @@ class Gui:
                                     elif cd_empty:
                                         tooltip_list.append(STR('Custom Data is empty'))
                                     else:
+                                        if cd_truncated:
+                                            tooltip_list.append(STR('Custom Data output was truncated'))
                                         tooltip_list.append('(' + STR('Double click to show Custom Data') + '.)')
 
                             self.tooltip_lab_configure(text='\n'.join(tooltip_list))
@@ -3600,6 +3796,8 @@ class Gui:
         #print(f'removing temp dir:{self.temp_dir}')
         rmtree(self.temp_dir)
 
+        librer_core.search_pool_close()
+
         try:
             self.status('exiting ...')
             self.cfg.set(CFG_last_dir,self.last_dir)
@@ -3702,12 +3900,13 @@ class Gui:
             nodes_set_pop = nodes_set.pop
             nodes_set_add = nodes_set.add
 
-            res_items = [ res_item for res_item,res_size,res_mtime in record.find_results ]
+            record_find_results_tuples_set = record.find_results_tuples_set
+            record_find_result_key = record.find_result_key
 
             while nodes_set:
                 item=nodes_set_pop()
 
-                if tuple(self.get_item_record(item)[2]) in res_items:
+                if record_find_result_key(self.get_item_record(item)[2]) in record_find_results_tuples_set:
                     tags=self_tree_item(item,'tags')
 
                     self_tree_item(item,tags=list(tags) + [self_FOUND])
@@ -3739,8 +3938,9 @@ class Gui:
                 for record in librer_core.records:
                     if record.find_results:
                         report_file_write(f'record:{librer_core.get_record_name(record)}\n')
+                        record_find_result_path = record.find_result_path
                         for res_item,res_size,res_mtime in record.find_results:
-                            report_file_write(f'  {sep.join(res_item)}\n')
+                            report_file_write(f'  {sep.join(record_find_result_path(res_item))}\n')
 
                         report_file_write('\n')
 
@@ -3773,7 +3973,9 @@ class Gui:
                     if self.cfg.get(CFG_KEY_expand_search_results):
                         self.results_tree.item(record_node,open=True)
 
-                    for res_item,res_size,res_mtime in sorted(record.find_results,key = lambda x : x) :
+                    record_find_result_path = record.find_result_path
+                    for res_item_key,res_size,res_mtime in sorted(record.find_results,key = lambda x : x) :
+                        res_item = record_find_result_path(res_item_key)
                         item=self_results_tree_insert(record_node,'end',text=sep_join(res_item),values=(sep_join(res_item),res_size,bytes_to_str(res_size),res_mtime,strftime('%Y/%m/%d %H:%M:%S',localtime_catched(res_mtime))))
                         self_found_item_to_data[item]=(record,res_item)
 
@@ -3889,6 +4091,11 @@ class Gui:
                 elif self.cfg.get(CFG_KEY_cd_fuzzy_threshold) != self.find_cd_fuzzy_threshold.get():
                     self.find_params_changed=True
 
+                elif self.cfg.get(CFG_KEY_filename_fuzzy_algorithm) != self.find_name_fuzzy_algorithm.get():
+                    self.find_params_changed=True
+                elif self.cfg.get(CFG_KEY_cd_fuzzy_algorithm) != self.find_cd_fuzzy_algorithm.get():
+                    self.find_params_changed=True
+
             if self.find_filename_search_kind_var.get() == 'regexp':
                 self.find_filename_regexp_entry.configure(state='normal')
             else:
@@ -3902,19 +4109,23 @@ class Gui:
             if self.find_filename_search_kind_var.get() == 'fuzzy':
                 self.find_filename_fuzzy_threshold_lab.configure(state='normal')
                 self.find_filename_fuzzy_threshold_entry.configure(state='normal')
+                self.find_filename_fuzzy_algorithm_cb.configure(state='readonly')
                 self.find_filename_fuzz_entry.configure(state='normal')
             else:
                 self.find_filename_fuzzy_threshold_lab.configure(state='disabled')
                 self.find_filename_fuzzy_threshold_entry.configure(state='disabled')
+                self.find_filename_fuzzy_algorithm_cb.configure(state='disabled')
                 self.find_filename_fuzz_entry.configure(state='disabled')
 
             if self.find_cd_search_kind_var.get() == 'fuzzy':
                 self.find_cd_fuzzy_threshold_lab.configure(state='normal')
                 self.find_cd_fuzzy_threshold_entry.configure(state='normal')
+                self.find_cd_fuzzy_algorithm_cb.configure(state='readonly')
                 self.find_cd_fuzz_entry.configure(state='normal')
             else:
                 self.find_cd_fuzzy_threshold_lab.configure(state='disabled')
                 self.find_cd_fuzzy_threshold_entry.configure(state='disabled')
+                self.find_cd_fuzzy_algorithm_cb.configure(state='disabled')
                 self.find_cd_fuzz_entry.configure(state='disabled')
 
             if self.find_filename_search_kind_var.get() == 'glob':
@@ -4024,6 +4235,9 @@ class Gui:
             filename_fuzzy_threshold = self.find_name_fuzzy_threshold.get()
             cd_fuzzy_threshold = self.find_cd_fuzzy_threshold.get()
 
+            filename_fuzzy_algorithm = self.find_name_fuzzy_algorithm.get()
+            cd_fuzzy_algorithm = self.find_cd_fuzzy_algorithm.get()
+
             self.search_info_lines=[]
             search_info_lines_append = self.search_info_lines.append
             if find_range_all:
@@ -4068,7 +4282,7 @@ class Gui:
                     except ValueError:
                         self.info_dialog_on_find.show(STR('fuzzy threshold error'),STR("wrong threshold value") + ":" + str(filename_fuzzy_threshold) )
                         return
-                    search_info_lines_append(STR('Fuzzy match on path element') + f':"{find_name_fuzz}" (...>{filename_fuzzy_threshold})')
+                    search_info_lines_append(STR('Fuzzy match on path element') + f':"{find_name_fuzz}" ({filename_fuzzy_algorithm}...>{filename_fuzzy_threshold})')
                 else:
                     self.info_dialog_on_find.show(STR('fuzzy expression error'),STR('empty expression'))
                     return
@@ -4109,7 +4323,7 @@ class Gui:
                     except ValueError:
                         self.info_dialog_on_find.show(STR('fuzzy threshold error'),f"wrong threshold value:{cd_fuzzy_threshold}")
                         return
-                    search_info_lines_append(STR('Fuzzy match on Custom Data') + f':"{find_cd_fuzz}" (...>{cd_fuzzy_threshold})')
+                    search_info_lines_append(STR('Fuzzy match on Custom Data') + f':"{find_cd_fuzz}" ({cd_fuzzy_algorithm}...>{cd_fuzzy_threshold})')
 
                 else:
                     self.info_dialog_on_find.show(STR('fuzzy expression error'),STR('empty expression'))
@@ -4182,6 +4396,9 @@ class Gui:
             self.cfg.set(CFG_KEY_filename_fuzzy_threshold,filename_fuzzy_threshold)
             self.cfg.set(CFG_KEY_cd_fuzzy_threshold,cd_fuzzy_threshold)
 
+            self.cfg.set(CFG_KEY_filename_fuzzy_algorithm,filename_fuzzy_algorithm)
+            self.cfg.set(CFG_KEY_cd_fuzzy_algorithm,cd_fuzzy_algorithm)
+
             self_progress_dialog_on_find = self.get_progress_dialog_on_find()
 
             search_thread=Thread(target=lambda : librer_core.find_items_in_records(self.temp_dir,sel_range,
@@ -4189,7 +4406,8 @@ class Gui:
                 t_min,t_max,
                 find_filename_search_kind,find_name,find_name_case_sens,
                 find_cd_search_kind,find_cd,find_cd_case_sens,
-                filename_fuzzy_threshold,cd_fuzzy_threshold,type_folders_var,type_files_var),daemon=True)
+                filename_fuzzy_threshold,cd_fuzzy_threshold,type_folders_var,type_files_var,
+                filename_fuzzy_algorithm,cd_fuzzy_algorithm),daemon=True)
             search_thread.start()
 
             search_thread_is_alive = search_thread.is_alive
@@ -4387,7 +4605,8 @@ class Gui:
                     self.find_result_record_index %= records_quant
 
                 try:
-                    items_names_tuple,res_size,res_mtime=record_find_results[self.find_result_index]
+                    res_item,res_size,res_mtime=record_find_results[self.find_result_index]
+                    items_names_tuple=record.find_result_path(res_item)
                 except Exception as e:
                     continue
                 else:
@@ -4898,6 +5117,7 @@ class Gui:
             c_nav = Menu(self.menubar,tearoff=0,bg=self.bg_color)
 
             pop_add_command(label = STR('New record ...'),  command = self.scan_dialog_show,accelerator='Ctrl+N',image = self.ico_record_new,compound='left')
+            pop_add_command(label = STR('Update record ...'),  command = lambda : self.scan_dialog_show(True),image = self.ico_record_new,compound='left',state='normal' if is_record and self.current_record and self.current_record.header.items_cd else 'disabled')
             pop_add_separator()
             pop_add_command(label = STR('Export record ...'), accelerator='Ctrl+E', command = self.record_export,image = self.ico_record_export,compound='left',state=state_on_records)
             pop_add_command(label = STR('Import record ...'), accelerator='Ctrl+I', command = self.record_import,image = self.ico_record_import,compound='left')
@@ -5244,9 +5464,10 @@ class Gui:
 
         compression_level = self.scan_compr_var_int.get()
         threads = self.scan_threads_var_int.get()
+        scan_threads = self.scan_walkers_var_int.get()
 
         try:
-            if self.scan(compression_level,threads,group):
+            if self.scan(compression_level,threads,scan_threads,group):
                 self.scan_dialog_hide_wrapper()
 
                 if self.new_created_record:
@@ -5283,7 +5504,7 @@ class Gui:
 
     @restore_status_line
     @logwrapper
-    def scan(self,compression_level,threads,group=None):
+    def scan(self,compression_level,threads,scan_threads=1,group=None):
         path_to_scan_from_entry = abspath(self.path_to_scan_entry_var.get())
 
         if not path_to_scan_from_entry:
@@ -5401,6 +5622,11 @@ class Gui:
             pars = self.CDE_parameters_var_list[e].get().strip()
             shell = self.CDE_shell_var_list[e].get()
             timeout = self.CDE_timeout_var_list[e].get().strip()
+            max_threads = self.CDE_threads_var_list[e].get().strip()
+            batch_size = self.CDE_batch_var_list[e].get().strip()
+            batch_json = self.CDE_batch_json_var_list[e].get()
+            output_max_bytes = self.CDE_output_max_bytes_var_list[e].get().strip()
+            output_max_lines = self.CDE_output_max_lines_var_list[e].get().strip()
             crc = self.CDE_crc_var_list[e].get()
 
             smin_int = str_to_bytes(smin)
@@ -5411,6 +5637,23 @@ class Gui:
             except:
                 timeout_int = None
 
+            try:
+                max_threads_int = max(int(max_threads),0)
+            except:
+                max_threads_int = 0
+
+            try:
+                batch_size_int = max(int(batch_size),0)
+            except:
+                batch_size_int = 0
+
+            output_max_bytes_int = max(str_to_bytes(output_max_bytes),0)
+
+            try:
+                output_max_lines_int = max(int(output_max_lines),0)
+            except:
+                output_max_lines_int = 0
+
             line_list = [
             '1' if self.CDE_use_var_list[e].get() else '0',
             mask,
@@ -5420,7 +5663,12 @@ class Gui:
             pars,
             '1' if shell else '0',
             timeout,
-            '1' if self.CDE_crc_var_list[e].get() else '0' ]
+            '1' if self.CDE_crc_var_list[e].get() else '0',
+            max_threads,
+            batch_size,
+            '1' if batch_json else '0',
+            output_max_bytes,
+            output_max_lines ]
 
             cde_sklejka_list.append(line_list)
 
@@ -5437,7 +5685,12 @@ class Gui:
                     pars,
                     shell,
                     timeout_int,
-                    crc ) )
+                    crc,
+                    max_threads_int,
+                    batch_size_int,
+                    batch_json,
+                    output_max_bytes_int,
+                    output_max_lines_int ) )
 
         self.cfg.set(CFG_KEY_CDE_SETTINGS,cde_sklejka_list)
 
@@ -5446,12 +5699,22 @@ class Gui:
         #################################################################################################################################################
 
         include_hidden=self.cfg.get(CFG_KEY_include_hidden)
+        index_cd=self.cfg.get(CFG_KEY_index_cd)
+        columns=self.cfg.get(CFG_KEY_columns)
+        mapped=self.cfg.get(CFG_KEY_mapped)
+        cde_largest_first=self.cfg.get(CFG_KEY_cde_largest_first)
+        cde_event_driven=self.cfg.get(CFG_KEY_cde_event_driven)
+        cde_cache=self.cfg.get(CFG_KEY_cde_cache)
+        cde_cache_hash=self.cfg.get(CFG_KEY_cde_cache_hash)
+        streaming=self.cfg.get(CFG_KEY_streaming)
         #exclude=tuple(self.cfg_get(CFG_EXCLUDE).split(';' if windows else ':'))
         exclude=self.cfg_get(CFG_EXCLUDE)
 
+        update_path = self.scan_update_record.file_path if self.scan_update_record and self.scan_update_var.get() else ''
+
         try:
             with open(sep.join([self.temp_dir,SCAN_DAT_FILE]), "wb") as f:
-                f.write(ZstdCompressor(level=8,threads=1).compress(dumps([new_label,path_to_scan_from_entry,check_dev,compression_level,threads,cde_list,include_hidden,exclude])))
+                f.write(ZstdCompressor(level=8,threads=1).compress(dumps([new_label,path_to_scan_from_entry,check_dev,compression_level,threads,cde_list,include_hidden,exclude,index_cd,columns,mapped,scan_threads,update_path,cde_largest_first,cde_event_driven,cde_cache,cde_cache_hash,streaming])))
 
         except Exception as e:
             print(e)
@@ -5695,7 +5958,7 @@ class Gui:
 
         self.scan_label_entry.configure(values=sorted(self.scan_label_entry_values_set))
 
-    def scan_dialog_show(self):
+    def scan_dialog_show(self,update=False):
         dialog = self.get_scan_dialog()
 
         if not self.path_is_dropped:
@@ -5723,7 +5986,8 @@ class Gui:
         if sklejka_settings:
             for e_section in sklejka_settings:
                 try:
-                    v1,v2,v3,v4,v5,v6,v7,v8,v9 = e_section
+                    v1,v2,v3,v4,v5,v6,v7,v8,v9 = e_section[0:9]
+                    v10,v11,v12,v13,v14 = (list(e_section[9:]) + ['','','','',''])[0:5]
 
                     self.CDE_use_var_list[e].set(bool(v1=='1'))
                     self.CDE_mask_var_list[e].set(v2)
@@ -5734,6 +5998,11 @@ class Gui:
                     self.CDE_shell_var_list[e].set(bool(v7=='1'))
                     self.CDE_timeout_var_list[e].set(v8)
                     self.CDE_crc_var_list[e].set(bool(v9=='1'))
+                    self.CDE_threads_var_list[e].set(v10)
+                    self.CDE_batch_var_list[e].set(v11)
+                    self.CDE_batch_json_var_list[e].set(bool(v12=='1'))
+                    self.CDE_output_max_bytes_var_list[e].set(v13)
+                    self.CDE_output_max_lines_var_list[e].set(v14)
                     e+=1
                 except Exception as e:
                     print(e,e_section)
@@ -5753,6 +6022,11 @@ class Gui:
                 self.CDE_parameters_var_list[e].set('')
                 self.CDE_shell_var_list[e].set(False)
                 self.CDE_timeout_var_list[e].set('')
+                self.CDE_threads_var_list[e].set('')
+                self.CDE_batch_var_list[e].set('')
+                self.CDE_batch_json_var_list[e].set(False)
+                self.CDE_output_max_bytes_var_list[e].set('')
+                self.CDE_output_max_lines_var_list[e].set('')
                 self.CDE_crc_var_list[e].set(False)
 
             self.cfg.set(CFG_KEY_CDE_SETTINGS,[])
@@ -5773,6 +6047,13 @@ class Gui:
             self.scan_label_entry_var.set(prop_label)
             self.set_scan_label_entry_values()
 
+        self.scan_update_record = self.current_record if self.current_record and self.current_record.header.items_cd else None
+        if self.scan_update_record:
+            self.scan_update_cb.configure(state='normal',text=' ' + STR('Reuse Custom Data of unchanged files from record:') + f' {librer_core.get_record_name(self.scan_update_record)}')
+        else:
+            self.scan_update_cb.configure(state='disabled',text=' ' + STR('Reuse Custom Data of unchanged files from record:'))
+        self.scan_update_var.set(update and bool(self.scan_update_record))
+
         dialog.show()
 
     def set_dev_to_scan_menu(self):
@@ -5958,7 +6239,7 @@ class Gui:
     def cde_up(self,e):
         e_up=e-1
 
-        for n_list in [self.CDE_use_var_list,self.CDE_mask_var_list,self.CDE_size_min_var_list,self.CDE_size_max_var_list,self.CDE_executable_var_list,self.CDE_parameters_var_list,self.CDE_shell_var_list,self.CDE_timeout_var_list]:
+        for n_list in [self.CDE_use_var_list,self.CDE_mask_var_list,self.CDE_size_min_var_list,self.CDE_size_max_var_list,self.CDE_executable_var_list,self.CDE_parameters_var_list,self.CDE_shell_var_list,self.CDE_timeout_var_list,self.CDE_threads_var_list,self.CDE_batch_var_list,self.CDE_batch_json_var_list,self.CDE_output_max_bytes_var_list,self.CDE_output_max_lines_var_list]:
             ve = n_list[e].get()
             v_e_up = n_list[e_up].get()
 
@@ -6014,9 +6295,10 @@ class Gui:
             if record:
                 temp_index=0
                 if record.find_results:
+                    subpath_key = record.find_result_key(subpath_list)
                     for found_result in record.find_results:
-                        items_names_tuple,res_size,res_mtime = found_result
-                        if items_names_tuple==subpath_list:
+                        res_item,res_size,res_mtime = found_result
+                        if res_item==subpath_key:
                             break
                         else:
                             temp_index+=1
@@ -6121,7 +6403,7 @@ class Gui:
 
                 (top_entry_name_nr,top_code,top_size,top_mtime) = top_data_tuple[0:4]
 
-                top_is_dir,top_is_file,top_is_symlink,top_is_bind,top_has_cd,top_has_files,top_cd_ok,top_cd_aborted,top_cd_empty,top_aux2 = LUT_decode_loc[top_code]
+                top_is_dir,top_is_file,top_is_symlink,top_is_bind,top_has_cd,top_has_files,top_cd_ok,top_cd_aborted,top_cd_empty,top_cd_truncated = LUT_decode_loc[top_code]
 
                 record_filenames = record.filenames
 
@@ -6138,6 +6420,8 @@ class Gui:
 
                 record_find_results = record.find_results
                 record_find_results_tuples_set = record.find_results_tuples_set
+                record_find_results_by_index = record.find_results_by_index
+                subpath_key = record.find_result_key(subpath_list) if self.any_valid_find_results else None
 
                 self_FOUND = self.FOUND
                 if top_has_files:
@@ -6147,9 +6431,9 @@ class Gui:
 
                         entry_name = record_filenames[entry_name_nr]
 
-                        entry_subpath_tuple = tuple(subpath_list + [entry_name])
+                        entry_subpath_key = (*subpath_key,entry_name_nr if record_find_results_by_index else entry_name) if subpath_key is not None else None
 
-                        is_dir,is_file,is_symlink,is_bind,has_cd,has_files,cd_ok,cd_aborted,cd_empty,aux2 = LUT_decode_loc[code]
+                        is_dir,is_file,is_symlink,is_bind,has_cd,has_files,cd_ok,cd_aborted,cd_empty,cd_truncated = LUT_decode_loc[code]
 
                         sub_data_tuple = None
 
@@ -6168,7 +6452,7 @@ class Gui:
 
                         image = (self_ico_folder_error if size==-1 else self_ico_folder_link if is_symlink or is_bind else self_ico_folder) if is_dir else (self_ico_cd_ok if cd_ok else self_cd_ico_aborted if cd_aborted else self_cd_ico_empty if cd_empty else self_ico_cd_error) if has_cd else self_ico_empty
 
-                        tags=self_SYMLINK if is_symlink or is_bind else self_FOUND if self.any_valid_find_results and entry_subpath_tuple in record_find_results_tuples_set else ''
+                        tags=self_SYMLINK if is_symlink or is_bind else self_FOUND if self.any_valid_find_results and entry_subpath_key in record_find_results_tuples_set else ''
 
                         #('data','record','opened','path','size','size_h','ctime','ctime_h','kind')
                         values = (entry_name,'','0',entry_name,size,bytes_to_str(size),mtime,strftime('%Y/%m/%d %H:%M:%S',localtime_catched(mtime)) if mtime else '',kind)
@@ -6445,21 +6729,23 @@ class Gui:
                             data_tuple = self.item_to_data[item]
                             (entry_name,code,size,mtime) = data_tuple[0:4]
 
-                            is_dir,is_file,is_symlink,is_bind,has_cd,has_files,cd_ok,cd_aborted,cd_empty,aux2 = LUT_decode[code]
+                            is_dir,is_file,is_symlink,is_bind,has_cd,has_files,cd_ok,cd_aborted,cd_empty,cd_truncated = LUT_decode[code]
 
                             if has_cd: #wiec nie has_files
                                 cd_index = data_tuple[4]
                                 error_infos.append(f'{cd_index=},type:{type(cd_index)}')
 
-                                self.access_customdata(record)
-                                cd_field = record.customdata[cd_index]
+                                if not record.header.customdata_chunked:
+                                    self.access_customdata(record)
+
+                                cd_field = record.get_customdata(cd_index)
 
                                 error_infos.append(' '.join(str(cd_field)))
                                 if cd_data := cd_field[2]:
                                     rule_nr=cd_field[0]
                                     returncode=cd_field[1]
 
-                                    expressions,use_smin,smin_int,use_smax,smax_int,executable,parameters,shell,timeout,crc = record.header.cde_list[rule_nr]
+                                    expressions,use_smin,smin_int,use_smax,smax_int,executable,parameters,shell,timeout,crc = record.header.cde_list[rule_nr][0:10]
 
                                     file_path = normpath(sep.join([record.header.scan_path,sep.join(subpath_list)]))
 
@@ -6469,7 +6755,8 @@ class Gui:
 
                                     shell_info = (STR('No'),STR('Yes'))[shell]
                                     timeout_info = f'\ntimeout:{timeout}' if timeout else ''
-                                    self.get_text_info_dialog().show(STR('Custom Data of') + f': {file_path}',cd_txt,uplabel_text=f"{command_info}\n\nshell:{shell_info}{timeout_info}\nreturncode:{returncode}\nsize:{bytes_to_str(asizeof(cd_txt))}")
+                                    truncated_info = '\n' + STR('Custom Data output was truncated') if cd_truncated else ''
+                                    self.get_text_info_dialog().show(STR('Custom Data of') + f': {file_path}',cd_txt,uplabel_text=f"{command_info}\n\nshell:{shell_info}{timeout_info}\nreturncode:{returncode}\nsize:{bytes_to_str(data_size(cd_txt))}{truncated_info}")
                                     self.store_text_dialog_fields(self.text_info_dialog)
                                     return True
 
@@ -6543,6 +6830,8 @@ class Gui:
         self.system_wrapper(HOMEPAGE)
 
 if __name__ == "__main__":
+    freeze_support()
+
     try:
         def running_in_flatpak():
             return "FLATPAK_ID" in environ
@@ -40,10 +40,6 @@ from time import sleep,perf_counter,time
 
 from threading import Thread
 
-from re import compile as re_compile,IGNORECASE,MULTILINE,DOTALL
-from fnmatch import translate
-from difflib import SequenceMatcher
-
 from json import dumps as json_dumps
 from collections import deque
 
@@ -223,97 +219,28 @@ if __name__ == "__main__":
                 print_info(f'search error:{e}')
                 proper_exit(2)
 
-            (size_min,size_max,t_min,t_max,find_filename_search_kind,name_expr,name_case_sens,find_cd_search_kind,cd_expr,cd_case_sens,filename_fuzzy_threshold_str,cd_fuzzy_threshold_str,type_folders,type_files) = params
-
-            try:
-                filename_fuzzy_threshold = float(filename_fuzzy_threshold_str)
-            except Exception as ce:
-                filename_fuzzy_threshold = 0.0
+            (size_min,size_max,t_min,t_max,find_filename_search_kind,name_expr,name_case_sens,find_cd_search_kind,cd_expr,cd_case_sens,filename_fuzzy_threshold_str,cd_fuzzy_threshold_str,type_folders,type_files,filename_fuzzy_algorithm,cd_fuzzy_algorithm) = params
 
-            try:
-                cd_fuzzy_threshold = float(cd_fuzzy_threshold_str)
-            except Exception as ce:
-                cd_fuzzy_threshold = 0.0
-
-            name_regexp=bool(find_filename_search_kind == 'regexp')
-            name_glob=bool(find_filename_search_kind == 'glob')
-            name_fuzzy=bool(find_filename_search_kind == 'fuzzy')
-            file_error=bool(find_filename_search_kind == 'error')
-
-            if name_regexp:
+            if find_filename_search_kind == 'regexp':
                 if res := test_regexp(name_expr):
                     proper_exit(res)
 
-                re_obj_name=re_compile(name_expr)
-                name_func_to_call = lambda x : re_obj_name.match(x)
-                name_search_kind='regexp'
-            elif name_glob:
-                if name_case_sens:
-                    re_obj_name=re_compile(translate(name_expr))
-                    name_func_to_call = lambda x : re_obj_name.match(x)
-                else:
-                    re_obj_name=re_compile(translate(name_expr), IGNORECASE)
-                    name_func_to_call = lambda x : re_obj_name.match(x)
-                name_search_kind='glob'
-            elif name_fuzzy:
-                name_func_to_call = lambda x : bool(SequenceMatcher(None, name_expr, x).ratio()>filename_fuzzy_threshold)
-                name_search_kind='fuzzy'
-            elif file_error:
-                name_func_to_call = None
-                name_search_kind='error'
-
-            else:
-                name_func_to_call = None
-                name_search_kind='dont'
-
-            custom_data_needed=False
-
-            cd_regexp=bool(find_cd_search_kind=='regexp')
-            cd_glob=bool(find_cd_search_kind=='glob')
-            cd_fuzzy=bool(find_cd_search_kind=='fuzzy')
-            cd_error=bool(find_cd_search_kind=='error')
-            cd_empty=bool(find_cd_search_kind=='empty')
-            cd_aborted=bool(find_cd_search_kind=='aborted')
-            cd_without=bool(find_cd_search_kind=='without')
-            cd_ok=bool(find_cd_search_kind=='any')
-
-            if cd_regexp:
-                custom_data_needed=True
+            if find_cd_search_kind == 'regexp':
                 if res := test_regexp(cd_expr):
                     proper_exit(res)
-                re_obj_cd=re_compile(cd_expr, MULTILINE | DOTALL)
-                cd_func_to_call = lambda x : re_obj_cd.match(x)
-
-            elif cd_glob:
-                custom_data_needed=True
-                if cd_case_sens:
-                    re_obj_cd=re_compile(translate(cd_expr), MULTILINE | DOTALL)
-                    cd_func_to_call = lambda x : re_obj_cd.match(x)
-                else:
-                    re_obj_cd=re_compile(translate(cd_expr), MULTILINE | DOTALL | IGNORECASE)
-                    cd_func_to_call = lambda x : re_obj_cd.match(x)
-            elif cd_fuzzy:
-                custom_data_needed=True
-                cd_func_to_call = lambda x : bool(SequenceMatcher(None,cd_expr, x).ratio()>cd_fuzzy_threshold)
-            elif cd_without:
-                cd_func_to_call = None
-            elif cd_empty:
-                cd_func_to_call = None
-            elif cd_error:
-                cd_func_to_call = None
-            elif cd_ok:
-                cd_func_to_call = None
-            else:
-                #cd_search_kind='dont'
-                cd_func_to_call = None
+
+            name_search_kind,name_func_to_call,cd_func_to_call,custom_data_needed = search_funcs(find_filename_search_kind,name_expr,name_case_sens,find_cd_search_kind,cd_expr,cd_case_sens,filename_fuzzy_threshold_str,cd_fuzzy_threshold_str,filename_fuzzy_algorithm,cd_fuzzy_algorithm)
 
             #####################################################################
             t0 = perf_counter()
-            record.decompress_filestructure()
+            record.decompress_filestructure_for_search()
 
             if custom_data_needed:
                 record.decompress_customdata()
 
+            name_candidates = record.filenames_candidates(name_search_kind,name_expr,name_case_sens)
+            cd_candidates = record.customdata_candidates(find_cd_search_kind,cd_expr,cd_case_sens)
+
             print_info('search start')
             t1 = perf_counter()
 
@@ -326,7 +253,9 @@ if __name__ == "__main__":
                         name_search_kind,name_func_to_call,
                         find_cd_search_kind,cd_func_to_call,
                         type_folders,type_files,
-                        print_info)
+                        print_info,
+                        name_candidates=name_candidates,
+                        cd_candidates=cd_candidates)
             except Exception as fe:
                 print_info(f'find_items error:{fe}')
 
@@ -340,7 +269,7 @@ if __name__ == "__main__":
                 with open(sep.join([comm_dir,SCAN_DAT_FILE]),"rb") as f:
                     create_list = loads(ZstdDecompressor().decompress(f.read()))
                     print_info(f'{create_list=}')
-                label,path_to_scan,check_dev,compression_level,threads,cde_list,include_hidden,exclude = create_list
+                label,path_to_scan,check_dev,compression_level,threads,cde_list,include_hidden,exclude,index_cd,columns,mapped,scan_threads,update_path,cde_largest_first,cde_event_driven,cde_cache,cde_cache_hash,streaming = create_list
             except Exception as e:
                 print_info(f'create error:{e}')
                 proper_exit(2)
@@ -349,7 +278,9 @@ if __name__ == "__main__":
 
                 try:
                     print_func(('stage',0),True)
-                    new_record.scan(print_func,abort_list,tuple(cde_list),check_dev,include_hidden,exclude)
+                    if update_path and cde_list:
+                        new_record.prepare_update(print_func,update_path)
+                    new_record.scan(print_func,abort_list,tuple(cde_list),check_dev,include_hidden,exclude,scan_threads,streaming,dirname(args.file))
                 except Exception as fe:
                     print_info(f'scan error:{fe}')
                 else:
@@ -357,14 +288,17 @@ if __name__ == "__main__":
                         if cde_list :
                             try:
                                 print_func(('stage',1),True)
-                                new_record.extract_customdata(print_func,abort_list,threads=threads)
+                                new_record.extract_customdata(print_func,abort_list,threads=threads,largest_first=cde_largest_first,event_driven=cde_event_driven,cache_file=path_join(dirname(args.file),CDE_CACHE_FILE) if cde_cache else None,cache_hash=cde_cache_hash)
                             except Exception as cde:
                                 print_info(f'cde error:{cde}')
 
                         print_func(('stage',2),True)
-                        new_record.pack_data(print_func)
+                        if streaming:
+                            new_record.pack_stream(print_func)
+                        else:
+                            new_record.pack_data(print_func)
                         print_func(('stage',3),True)
-                        new_record.save(print_func,file_path=args.file,compression_level=compression_level)
+                        new_record.save(print_func,file_path=args.file,compression_level=compression_level,index_customdata=index_cd,columns=columns,mapped=mapped)
                         print_func(('stage',4),True)
 
         #####################################################################
@@ -290,6 +290,14 @@ class LANGUAGES:
             'it':'File Bash',
             'fr':'Fichiers Bash',
         },
+        'Batch':{
+            'pl': 'Wsad',
+            'es': 'Lote',
+            'ru': 'Пакет',
+            'de': 'Stapel',
+            'it': 'Lotto',
+            'fr': 'Lot',
+        },
         'Bat Files':{
             'pl':'Pliki bat',
             'es':'Archivos bat',
@@ -362,6 +370,51 @@ class LANGUAGES:
             'it':'Thread CDE:',
             'fr':'Fils CDE :',
         },
+        'CDE_BATCH_JSON_TOOLTIP':{
+            'en': "Batch output format.\n\nUnchecked - one line of output per file.\nChecked - JSON array with one element per file (e.g. 'exiftool -j').\n\nOutput must follow the order of files in the command.",
+            'pl': "Format wyjścia wsadowego.\n\nNiezaznaczone - jedna linia wyjścia na plik.\nZaznaczone - tablica JSON z jednym elementem na plik (np. 'exiftool -j').\n\nWyjście musi zachować kolejność plików w poleceniu.",
+            'es': "Formato de salida por lotes.\n\nDesmarcado - una línea de salida por archivo.\nMarcado - matriz JSON con un elemento por archivo (p. ej. 'exiftool -j').\n\nLa salida debe seguir el orden de los archivos en el comando.",
+            'ru': "Формат пакетного вывода.\n\nНе отмечено - одна строка вывода на файл.\nОтмечено - массив JSON с одним элементом на файл (например, 'exiftool -j').\n\nВывод должен соответствовать порядку файлов в команде.",
+            'de': "Format der Stapelausgabe.\n\nNicht markiert - eine Ausgabezeile pro Datei.\nMarkiert - JSON-Array mit einem Element pro Datei (z. B. 'exiftool -j').\n\nDie Ausgabe muss der Reihenfolge der Dateien im Befehl folgen.",
+            'it': "Formato dell'output in lotto.\n\nNon selezionato - una riga di output per file.\nSelezionato - array JSON con un elemento per file (es. 'exiftool -j').\n\nL'output deve seguire l'ordine dei file nel comando.",
+            'fr': "Format de sortie par lot.\n\nNon coché - une ligne de sortie par fichier.\nCoché - tableau JSON avec un élément par fichier (par ex. 'exiftool -j').\n\nLa sortie doit suivre l'ordre des fichiers dans la commande.",
+        },
+        'CDE_BATCH_TOOLTIP':{
+            'en': "Maximum number of files passed to a single run of the Custom Data Extractor.\nThe file path parameter is repeated for every file.\nSaves process startup time for tools that accept many files (e.g. md5sum, exiftool).\n\n'0' or empty field means one run per file.",
+            'pl': "Maksymalna liczba plików przekazywanych do jednego uruchomienia ekstraktora danych użytkownika.\nParametr ścieżki pliku jest powtarzany dla każdego pliku.\nOszczędza czas uruchamiania procesu dla narzędzi akceptujących wiele plików (np. md5sum, exiftool).\n\n'0' lub puste pole oznacza jedno uruchomienie na plik.",
+            'es': "Número máximo de archivos pasados a una sola ejecución del extractor de datos personalizados.\nEl parámetro de ruta de archivo se repite para cada archivo.\nAhorra el tiempo de inicio de procesos para herramientas que aceptan muchos archivos (p. ej. md5sum, exiftool).\n\n'0' o un campo vacío significa una ejecución por archivo.",
+            'ru': "Максимальное количество файлов, передаваемых за один запуск извлекателя пользовательских данных.\nПараметр пути файла повторяется для каждого файла.\nЭкономит время запуска процессов для инструментов, принимающих много файлов (например, md5sum, exiftool).\n\n'0' или пустое поле означает один запуск на файл.",
+            'de': "Maximale Anzahl von Dateien, die an einen einzelnen Lauf des Benutzerdaten-Extraktors übergeben werden.\nDer Dateipfad-Parameter wird für jede Datei wiederholt.\nSpart Prozessstartzeit bei Werkzeugen, die viele Dateien akzeptieren (z. B. md5sum, exiftool).\n\n'0' oder ein leeres Feld bedeutet einen Lauf pro Datei.",
+            'it': "Numero massimo di file passati a una singola esecuzione dell'estrattore di dati utente.\nIl parametro del percorso del file viene ripetuto per ogni file.\nRisparmia il tempo di avvio dei processi per strumenti che accettano molti file (es. md5sum, exiftool).\n\n'0' o un campo vuoto significa un'esecuzione per file.",
+            'fr': "Nombre maximal de fichiers passés à une seule exécution de l'extracteur de données utilisateur.\nLe paramètre de chemin de fichier est répété pour chaque fichier.\nÉconomise le temps de démarrage des processus pour les outils acceptant de nombreux fichiers (par ex. md5sum, exiftool).\n\n'0' ou un champ vide signifie une exécution par fichier.",
+        },
+        'CDE_OUTPUT_MAX_BYTES_TOOLTIP':{
+            'en': "Maximum size of output collected from a single run of the Custom Data Extractor.\nOnce exceeded, reading stops, the process is terminated\nand the output is stored truncated.\nSize can be given with units (e.g. 64kB, 1MB).\n\n'0' or empty field means no limit.",
+            'pl': "Maksymalny rozmiar wyjścia zbieranego z jednego uruchomienia ekstraktora danych użytkownika.\nPo jego przekroczeniu odczyt jest przerywany, proces zostaje zakończony\na wyjście zapisywane jest w skróconej postaci.\nRozmiar można podać z jednostką (np. 64kB, 1MB).\n\n'0' lub puste pole oznacza brak limitu.",
+            'es': "Tamaño máximo de la salida recogida de una sola ejecución del extractor de datos personalizados.\nAl superarlo, se detiene la lectura, se termina el proceso\ny la salida se guarda truncada.\nEl tamaño puede indicarse con unidades (p. ej. 64kB, 1MB).\n\n'0' o un campo vacío significa sin límite.",
+            'ru': "Максимальный размер вывода, собираемого за один запуск извлекателя пользовательских данных.\nПри превышении чтение прекращается, процесс завершается,\nа вывод сохраняется в усечённом виде.\nРазмер можно указать с единицами (например, 64kB, 1MB).\n\n'0' или пустое поле означает отсутствие ограничения.",
+            'de': "Maximale Größe der Ausgabe eines einzelnen Laufs des Benutzerdaten-Extraktors.\nBei Überschreitung wird das Lesen beendet, der Prozess beendet\nund die Ausgabe gekürzt gespeichert.\nDie Größe kann mit Einheiten angegeben werden (z. B. 64kB, 1MB).\n\n'0' oder ein leeres Feld bedeutet keine Begrenzung.",
+            'it': "Dimensione massima dell'output raccolto da una singola esecuzione dell'estrattore di dati utente.\nUna volta superata, la lettura si interrompe, il processo viene terminato\ne l'output viene salvato troncato.\nLa dimensione può essere indicata con unità (es. 64kB, 1MB).\n\n'0' o un campo vuoto significa nessun limite.",
+            'fr': "Taille maximale de la sortie collectée lors d'une seule exécution de l'extracteur de données utilisateur.\nUne fois dépassée, la lecture s'arrête, le processus est terminé\net la sortie est enregistrée tronquée.\nLa taille peut être indiquée avec des unités (par ex. 64kB, 1MB).\n\n'0' ou un champ vide signifie aucune limite.",
+        },
+        'CDE_OUTPUT_MAX_LINES_TOOLTIP':{
+            'en': "Maximum number of output lines collected from a single run of the Custom Data Extractor.\nOnce exceeded, reading stops, the process is terminated\nand the output is stored truncated.\n\n'0' or empty field means no limit.",
+            'pl': "Maksymalna liczba linii wyjścia zbieranych z jednego uruchomienia ekstraktora danych użytkownika.\nPo jej przekroczeniu odczyt jest przerywany, proces zostaje zakończony\na wyjście zapisywane jest w skróconej postaci.\n\n'0' lub puste pole oznacza brak limitu.",
+            'es': "Número máximo de líneas de salida recogidas de una sola ejecución del extractor de datos personalizados.\nAl superarlo, se detiene la lectura, se termina el proceso\ny la salida se guarda truncada.\n\n'0' o un campo vacío significa sin límite.",
+            'ru': "Максимальное количество строк вывода, собираемых за один запуск извлекателя пользовательских данных.\nПри превышении чтение прекращается, процесс завершается,\nа вывод сохраняется в усечённом виде.\n\n'0' или пустое поле означает отсутствие ограничения.",
+            'de': "Maximale Anzahl der Ausgabezeilen eines einzelnen Laufs des Benutzerdaten-Extraktors.\nBei Überschreitung wird das Lesen beendet, der Prozess beendet\nund die Ausgabe gekürzt gespeichert.\n\n'0' oder ein leeres Feld bedeutet keine Begrenzung.",
+            'it': "Numero massimo di righe di output raccolte da una singola esecuzione dell'estrattore di dati utente.\nUna volta superato, la lettura si interrompe, il processo viene terminato\ne l'output viene salvato troncato.\n\n'0' o un campo vuoto significa nessun limite.",
+            'fr': "Nombre maximal de lignes de sortie collectées lors d'une seule exécution de l'extracteur de données utilisateur.\nUne fois dépassé, la lecture s'arrête, le processus est terminé\net la sortie est enregistrée tronquée.\n\n'0' ou un champ vide signifie aucune limite.",
+        },
+        'CDE_THREADS_TOOLTIP':{
+            'en': "Maximum number of files processed by this Custom Data Extractor at the same time.\nUse '1' for tools that can't run in parallel or\nshould not load the disk concurrently.\n\n'0' or empty field means no limit (all CDE threads).",
+            'pl': "Maksymalna liczba plików przetwarzanych jednocześnie przez ten ekstraktor danych użytkownika.\nUżyj '1' dla narzędzi, które nie mogą działać równolegle lub\nnie powinny jednocześnie obciążać dysku.\n\n'0' lub puste pole oznacza brak limitu (wszystkie wątki CDE).",
+            'es': "Número máximo de archivos procesados simultáneamente por este extractor de datos personalizados.\nUse '1' para herramientas que no pueden ejecutarse en paralelo o\nno deben cargar el disco simultáneamente.\n\n'0' o un campo vacío significa sin límite (todos los hilos CDE).",
+            'ru': "Максимальное количество файлов, одновременно обрабатываемых этим извлекателем пользовательских данных.\nИспользуйте '1' для инструментов, которые не могут работать параллельно или\nне должны одновременно нагружать диск.\n\n'0' или пустое поле означает отсутствие ограничения (все потоки CDE).",
+            'de': "Maximale Anzahl von Dateien, die von diesem Benutzerdaten-Extraktor gleichzeitig verarbeitet werden.\nVerwenden Sie '1' für Werkzeuge, die nicht parallel laufen können oder\ndie Festplatte nicht gleichzeitig belasten sollen.\n\n'0' oder ein leeres Feld bedeutet keine Begrenzung (alle CDE-Threads).",
+            'it': "Numero massimo di file elaborati contemporaneamente da questo estrattore di dati utente.\nUsa '1' per strumenti che non possono essere eseguiti in parallelo o\nnon devono caricare il disco contemporaneamente.\n\n'0' o un campo vuoto significa nessun limite (tutti i thread CDE).",
+            'fr': "Nombre maximal de fichiers traités simultanément par cet extracteur de données utilisateur.\nUtilisez '1' pour les outils qui ne peuvent pas s'exécuter en parallèle ou\nne doivent pas solliciter le disque simultanément.\n\n'0' ou un champ vide signifie aucune limite (tous les fils CDE).",
+        },
         'CDE Timeout not set':{
             'pl':'Nie ustawiony timeout CDE',
             'es':'Timeout CDE no configurado',
@@ -618,6 +671,14 @@ class LANGUAGES:
             'it':'Estrazione dei Dati Utente interrotta',
             'fr':'L\'extraction des Données Utilisateur a été interrompue',
         },
+        'Custom Data Extractors are executed only for new files and files with changed size or modification time.\nCustom Data of other files is copied from the selected record if the extractor rule is identical.': {
+            'pl': 'Ekstraktory Danych Użytkownika są uruchamiane tylko dla nowych plików i plików ze zmienionym rozmiarem lub czasem modyfikacji.\nDane Użytkownika pozostałych plików są kopiowane z wybranego rekordu, jeśli reguła ekstraktora jest identyczna.',
+            'es': 'Los Extractores de Datos del Usuario se ejecutan solo para archivos nuevos y archivos con tamaño o fecha de modificación cambiados.\nLos Datos del Usuario de los demás archivos se copian del registro seleccionado si la regla del extractor es idéntica.',
+            'ru': 'Экстракторы пользовательских данных запускаются только для новых файлов и файлов с изменённым размером или временем изменения.\nПользовательские данные остальных файлов копируются из выбранной записи, если правило экстрактора идентично.',
+            'de': 'Benutzerdaten-Extraktoren werden nur für neue Dateien und Dateien mit geänderter Größe oder Änderungszeit ausgeführt.\nBenutzerdaten der übrigen Dateien werden aus dem ausgewählten Datensatz kopiert, wenn die Extraktorregel identisch ist.',
+            'it': 'Gli Estrattori di Dati Utente vengono eseguiti solo per i file nuovi e per i file con dimensione o data di modifica cambiate.\nI Dati Utente degli altri file vengono copiati dal record selezionato se la regola dell\'estrattore è identica.',
+            'fr': 'Les extracteurs de données utilisateur ne sont exécutés que pour les nouveaux fichiers et les fichiers dont la taille ou la date de modification a changé.\nLes données utilisateur des autres fichiers sont copiées depuis l\'enregistrement sélectionné si la règle de l\'extracteur est identique.',
+        },
         'Custom Data Extractors:':{
             'pl':'Ekstraktory Danych Użytkownika:',
             'es':'Extractores de Datos del Usuario:',
@@ -626,6 +687,22 @@ class LANGUAGES:
             'it':'Estraitori di Dati Utente:',
             'fr':'Extracteurs de Données Utilisateur :',
         },
+        'Custom Data cache - verify files with partial content hash':{
+            'pl': 'Pamięć podręczna danych użytkownika - weryfikuj pliki częściowym skrótem zawartości',
+            'es': 'Caché de datos personalizados - verificar archivos con hash parcial del contenido',
+            'ru': 'Кэш пользовательских данных - проверять файлы частичным хешем содержимого',
+            'de': 'Benutzerdaten-Cache - Dateien mit partiellem Inhalts-Hash prüfen',
+            'it': 'Cache dei dati utente - verifica i file con hash parziale del contenuto',
+            'fr': 'Cache des données utilisateur - vérifier les fichiers avec un hachage partiel du contenu',
+        },
+        'Custom Data cache shared by all records (copies of files are not extracted again)':{
+            'pl': 'Pamięć podręczna danych użytkownika wspólna dla wszystkich rekordów (kopie plików nie są ponownie przetwarzane)',
+            'es': 'Caché de datos personalizados compartida por todos los registros (las copias de archivos no se extraen de nuevo)',
+            'ru': 'Кэш пользовательских данных, общий для всех записей (копии файлов не обрабатываются повторно)',
+            'de': 'Benutzerdaten-Cache für alle Datensätze (Kopien von Dateien werden nicht erneut extrahiert)',
+            'it': 'Cache dei dati utente condivisa da tutti i record (le copie dei file non vengono estratte di nuovo)',
+            'fr': "Cache des données utilisateur partagé par tous les enregistrements (les copies de fichiers ne sont pas extraites à nouveau)",
+        },
         'Custom Data extractor command':{
             'pl':'Kryteria plików %',
             'es':'Comando del extractor de Datos del Usuario',
@@ -650,6 +727,14 @@ class LANGUAGES:
             'it':'Dati Utente del file',
             'fr':'Données Utilisateur du fichier',
         },
+        'Custom Data output was truncated':{
+            'pl': 'Wyjście ekstraktora danych użytkownika zostało skrócone',
+            'es': 'La salida de datos personalizados fue truncada',
+            'ru': 'Вывод пользовательских данных был усечён',
+            'de': 'Die Ausgabe der Benutzerdaten wurde gekürzt',
+            'it': "L'output dei dati utente è stato troncato",
+            'fr': 'La sortie des données utilisateur a été tronquée',
+        },
         'Dat Files': {
             'pl': 'Pliki Dat',
             'es': 'Archivos Dat',
@@ -730,6 +815,15 @@ class LANGUAGES:
             'it': 'Fai doppio clic per visualizzare tutte le informazioni sul record',
             'fr': 'Double-cliquez pour afficher les informations complètes sur l\'enregistrement'
         },
+        'EXCLUDE_TOOLTIP': {
+            'en': "Name expression e.g. '*.tmp' excludes matching files and folders\nExpression containing path separator e.g. '*/cache/*'\nis matched against the full path\nExpression ending with path separator e.g. 'node_modules/'\nexcludes folders only\n\nContent of excluded folders is not scanned",
+            'pl': "Wyrażenie nazwy np. '*.tmp' wyklucza pasujące pliki i foldery\nWyrażenie zawierające separator ścieżki np. '*/cache/*'\njest dopasowywane do pełnej ścieżki\nWyrażenie zakończone separatorem ścieżki np. 'node_modules/'\nwyklucza tylko foldery\n\nZawartość wykluczonych folderów nie jest skanowana",
+            'es': "Expresión de nombre p.ej. '*.tmp' excluye archivos y carpetas coincidentes\nExpresión con separador de ruta p.ej. '*/cache/*'\nse compara con la ruta completa\nExpresión terminada en separador de ruta p.ej. 'node_modules/'\nexcluye solo carpetas\n\nEl contenido de las carpetas excluidas no se escanea",
+            'ru': "Выражение имени, например '*.tmp', исключает совпадающие файлы и папки\nВыражение с разделителем пути, например '*/cache/*',\nсравнивается с полным путём\nВыражение, оканчивающееся разделителем пути, например 'node_modules/',\nисключает только папки\n\nСодержимое исключённых папок не сканируется",
+            'de': "Namensausdruck z. B. '*.tmp' schließt passende Dateien und Ordner aus\nAusdruck mit Pfadtrenner z. B. '*/cache/*'\nwird mit dem vollständigen Pfad verglichen\nAusdruck mit Pfadtrenner am Ende z. B. 'node_modules/'\nschließt nur Ordner aus\n\nDer Inhalt ausgeschlossener Ordner wird nicht gescannt",
+            'it': "Espressione del nome es. '*.tmp' esclude file e cartelle corrispondenti\nEspressione con separatore di percorso es. '*/cache/*'\nviene confrontata con il percorso completo\nEspressione che termina con separatore di percorso es. 'node_modules/'\nesclude solo le cartelle\n\nIl contenuto delle cartelle escluse non viene scansionato",
+            'fr': "Expression de nom p. ex. '*.tmp' exclut les fichiers et dossiers correspondants\nExpression contenant un séparateur de chemin p. ex. '*/cache/*'\nest comparée au chemin complet\nExpression terminée par un séparateur de chemin p. ex. 'node_modules/'\nexclut uniquement les dossiers\n\nLe contenu des dossiers exclus n'est pas analysé",
+        },
         'EXEC_TOOLTIP': {
             'en': "Binary executable, batch script, or entire command\n(depending on the 'shell' option setting)\nthat will run with the full path to the scanned file.\nThe executable may have a full path, be located in a PATH\nenvironment variable, or be interpreted by the system shell\n\ncheck 'shell' option tooltip.",
             'pl': 'Plik wykonywalny binarny, skrypt wsadowy lub całe polecenie\n(w zależności od ustawienia opcji "shell")\nktóre zostanie uruchomione z pełną ścieżką do skanowanego pliku.\nPlik wykonywalny może mieć pełną ścieżkę, znajdować się w zmiennej\nśrodowiskowej PATH lub być interpretowany przez powłokę systemową\n\nSprawdź podpowiedź opcji "shell".',
@@ -876,6 +970,38 @@ class LANGUAGES:
             'it': "Includi file/cartelle nascosti nella scansione",
             'fr': "Inclure les fichiers/dossiers cachés dans l'analyse",
         },
+        'Columnar file structure in new records (less memory when searching)': {
+            'pl': "Kolumnowa struktura plików w nowych rekordach (mniej pamięci podczas wyszukiwania)",
+            'es': "Estructura de archivos en columnas en nuevos registros (menos memoria al buscar)",
+            'ru': "Столбцовая файловая структура в новых записях (меньше памяти при поиске)",
+            'de': "Spaltenbasierte Dateistruktur in neuen Datensätzen (weniger Speicher bei der Suche)",
+            'it': "Struttura dei file a colonne nei nuovi record (meno memoria durante la ricerca)",
+            'fr': "Structure de fichiers en colonnes dans les nouveaux enregistrements (moins de mémoire lors de la recherche)",
+        },
+        'Event driven Custom Data extraction (single thread waiting for all extractors, not on Windows)': {
+            'pl': 'Sterowana zdarzeniami ekstrakcja danych użytkownika (jeden wątek czekający na wszystkie ekstraktory, nie w Windows)',
+            'es': 'Extracción de datos personalizados dirigida por eventos (un solo hilo esperando a todos los extractores, no en Windows)',
+            'ru': 'Событийное извлечение пользовательских данных (один поток ожидает все извлекатели, не в Windows)',
+            'de': 'Ereignisgesteuerte Benutzerdaten-Extraktion (ein Thread wartet auf alle Extraktoren, nicht unter Windows)',
+            'it': 'Estrazione dei dati utente guidata dagli eventi (un solo thread in attesa di tutti gli estrattori, non su Windows)',
+            'fr': 'Extraction des données utilisateur pilotée par événements (un seul fil attendant tous les extracteurs, pas sous Windows)',
+        },
+        'Extract Custom Data of largest files first (better use of CDE threads)': {
+            'pl': "Wyodrębniaj Dane Użytkownika najpierw z największych plików (lepsze wykorzystanie wątków CDE)",
+            'es': "Extraer Datos del Usuario de los archivos más grandes primero (mejor uso de los hilos CDE)",
+            'ru': "Извлекать пользовательские данные сначала из самых больших файлов (лучшее использование потоков CDE)",
+            'de': "Benutzerdaten der größten Dateien zuerst extrahieren (bessere Nutzung der CDE-Threads)",
+            'it': "Estrai prima i Dati Utente dei file più grandi (migliore uso dei thread CDE)",
+            'fr': "Extraire d'abord les données utilisateur des plus gros fichiers (meilleure utilisation des fils CDE)",
+        },
+        'Index custom data in new records (faster custom data search)': {
+            'pl': "Indeksuj Dane Użytkownika w nowych rekordach (szybsze wyszukiwanie)",
+            'es': "Indexar Datos del Usuario en nuevos registros (búsqueda más rápida)",
+            'ru': "Индексировать пользовательские данные в новых записях (более быстрый поиск)",
+            'de': "Benutzerdaten in neuen Datensätzen indizieren (schnellere Suche)",
+            'it': "Indicizza i Dati Utente nei nuovi record (ricerca più veloce)",
+            'fr': "Indexer les données utilisateur dans les nouveaux enregistrements (recherche plus rapide)",
+        },
         'Information': {
             'pl': "Informacja",
             'es': "Información",
@@ -956,6 +1082,22 @@ class LANGUAGES:
             'it': "Caricamento record ...",
             'fr': "Chargement des enregistrements ...",
         },
+        'Low memory record creation (scanned folders spilled to temporary file)': {
+            'pl': 'Tworzenie rekordu przy małym zużyciu pamięci (skanowane foldery zapisywane do pliku tymczasowego)',
+            'es': 'Creación de registros con poca memoria (carpetas escaneadas volcadas a un archivo temporal)',
+            'ru': 'Создание записи с малым расходом памяти (просканированные папки сбрасываются во временный файл)',
+            'de': 'Datensatzerstellung mit wenig Speicher (gescannte Ordner in temporäre Datei ausgelagert)',
+            'it': 'Creazione del record con poca memoria (cartelle scansionate scaricate in un file temporaneo)',
+            'fr': 'Création d\'enregistrement économe en mémoire (dossiers analysés déchargés dans un fichier temporaire)',
+        },
+        'Memory mapped file structure in new records (uncompressed, fastest loading)': {
+            'pl': "Mapowana w pamięci struktura plików w nowych rekordach (bez kompresji, najszybsze wczytywanie)",
+            'es': "Estructura de archivos mapeada en memoria en nuevos registros (sin compresión, carga más rápida)",
+            'ru': "Отображаемая в память файловая структура в новых записях (без сжатия, самая быстрая загрузка)",
+            'de': "Speicherabgebildete Dateistruktur in neuen Datensätzen (unkomprimiert, schnellstes Laden)",
+            'it': "Struttura dei file mappata in memoria nei nuovi record (non compressa, caricamento più veloce)",
+            'fr': "Structure de fichiers mappée en mémoire dans les nouveaux enregistrements (non compressée, chargement le plus rapide)",
+        },
         'MASK_TOOLTIP': {
             'en': "Glob expressions separated by comma (',')\ne.g.: '*.7z, *.zip, *.gz'\n\nthe given executable will run\nwith every file matching the expression\n(and size criteria if provided)",
             'pl': "Wyrażenia 'glob' rozdzielone przecinkiem (',')\nnp.: '*.7z, *.zip, *.gz'\n\nPodany plik wykonywalny zostanie uruchomiony\nz każdym plikiem pasującym do wyrażenia\n(i kryteriów rozmiaru, jeśli zostały podane)",
@@ -973,6 +1115,14 @@ class LANGUAGES:
             'it': "Seleziona per utilizzare il CD Extractor",
             'fr': "Marquer pour utiliser l'extracteur de CD",
         },
+        'Max lines': {
+            'pl': 'Maks. linii',
+            'es': 'Máx. líneas',
+            'ru': 'Макс. строк',
+            'de': 'Max. Zeilen',
+            'it': 'Max righe',
+            'fr': 'Max lignes',
+        },
         'Max modtime': {
             'pl': "Maksymalny czas modyfikacji",
             'es': "Tiempo máximo de modificación",
@@ -981,6 +1131,14 @@ class LANGUAGES:
             'it': "Tempo massimo di modifica",
             'fr': "Temps de modification maximum",
         },
+        'Max output': {
+            'pl': 'Maks. wyjście',
+            'es': 'Máx. salida',
+            'ru': 'Макс. вывод',
+            'de': 'Max. Ausgabe',
+            'it': 'Max output',
+            'fr': 'Max sortie',
+        },
         'Max size': {
             'pl': "Maksymalna wielkość",
             'es': "Tamaño máximo",
@@ -1149,6 +1307,14 @@ class LANGUAGES:
             'it': 'Nessun risultato di ricerca\nClicca per aprire il dialogo di ricerca.',
             'fr': 'Aucun résultat de recherche\nCliquez pour ouvrir la boîte de dialogue de recherche.',
         },
+        'Number of threads listing folders during scan\n\n1 - single thread (default value)\n\nHigher values help on network shares and NAS,\nwhere listing of every folder waits for the server.': {
+            'pl': 'Liczba wątków listujących foldery podczas skanowania\n\n1 - pojedynczy wątek (wartość domyślna)\n\nWiększe wartości pomagają w przypadku udziałów sieciowych i NAS,\ngdzie listowanie każdego folderu czeka na serwer.',
+            'es': 'Número de hilos que listan carpetas durante el escaneo\n\n1 - un solo hilo (valor predeterminado)\n\nValores más altos ayudan en recursos compartidos de red y NAS,\ndonde el listado de cada carpeta espera al servidor.',
+            'ru': 'Количество потоков, читающих папки во время сканирования\n\n1 - один поток (значение по умолчанию)\n\nБольшие значения помогают на сетевых ресурсах и NAS,\nгде чтение каждой папки ожидает ответа сервера.',
+            'de': 'Anzahl der Threads, die während des Scans Ordner auflisten\n\n1 - ein Thread (Standardwert)\n\nHöhere Werte helfen bei Netzwerkfreigaben und NAS,\nwo das Auflisten jedes Ordners auf den Server wartet.',
+            'it': 'Numero di thread che elencano le cartelle durante la scansione\n\n1 - un singolo thread (valore predefinito)\n\nValori più alti aiutano su condivisioni di rete e NAS,\ndove l\'elenco di ogni cartella attende il server.',
+            'fr': 'Nombre de threads listant les dossiers pendant l\'analyse\n\n1 - un seul thread (valeur par défaut)\n\nDes valeurs plus élevées aident sur les partages réseau et NAS,\noù le listage de chaque dossier attend le serveur.',
+        },
         'Number of threads used to extract Custom Data\n\n0 - all available CPU cores\n1 - single thread (default value)\n\nThe optimal value depends on the CPU cores performace,\nIO subsystem performance and Custom Data Extractor specifics.\n\nConsider limitations of parallel CDE execution e.g.\nnumber of licenses of used software,\nused working directory, needed memory etc.': {
             'pl': 'Liczba wątków użytych do wyodrębnienia danych użytkownika\n\n0 - wszystkie dostępne rdzenie procesora\n1 - pojedynczy wątek (wartość domyślna)\n\nWartość optymalna zależy od wydajności rdzeni procesora,\nwydajności podsystemu wejścia/wyjścia i specyfiki programu Custom Data Extractor.\n\nNależy wziąć pod uwagę ograniczenia równoległego wykonywania CDE, np.\nliczbę licencji używanego oprogramowania,\nużywany katalog roboczy, potrzebną pamięć itp.',
             'es': 'Número de hilos utilizados para extraer Datos de Usuario\n\n0 - todos los núcleos de CPU disponibles\n1 - un solo hilo (valor predeterminado)\n\nEl valor óptimo depende del rendimiento de los núcleos de la CPU,\ndel rendimiento del subsistema de E/S y de las especificaciones del Extractor de Datos de Usuario.\n\nConsidere las limitaciones de la ejecución paralela de CDE, p. ej.\nnúmero de licencias del software utilizado,\ndirectorio de trabajo utilizado, memoria necesaria, etc.',
@@ -1439,6 +1605,14 @@ class LANGUAGES:
             'it': 'Reimpacchettamento completato.',
             'fr': 'Réempaquetage terminé.'
         },
+        'Reuse Custom Data of unchanged files from record:': {
+            'pl': 'Użyj ponownie Danych Użytkownika niezmienionych plików z rekordu:',
+            'es': 'Reutilizar Datos del Usuario de archivos sin cambios del registro:',
+            'ru': 'Повторно использовать пользовательские данные неизменённых файлов из записи:',
+            'de': 'Benutzerdaten unveränderter Dateien aus Datensatz wiederverwenden:',
+            'it': 'Riutilizza i Dati Utente dei file non modificati dal record:',
+            'fr': 'Réutiliser les données utilisateur des fichiers inchangés de l\'enregistrement :',
+        },
         'Restart Librer to gain full access to the recordset.': {
             'pl': 'Uruchom ponownie Librera by uzyskać pełny dostęp do rekordów.',
             'es': 'Reinicie Librer para obtener acceso completo al conjunto de registros.',
@@ -1481,6 +1655,14 @@ class LANGUAGES:
             'it': 'Scansiona',
             'fr': 'Scanner'
         },
+        'Scan Threads:':{
+            'pl':'Wątki skanowania:',
+            'es':'Hilos de escaneo:',
+            'ru':'Потоки сканирования:',
+            'de':'Scan-Threads:',
+            'it':'Thread di scansione:',
+            'fr':'Fils d\'analyse :',
+        },
         'Search': {
             'pl': 'Szukaj',
             'es': 'Buscar',
@@ -1749,6 +1931,14 @@ class LANGUAGES:
             'it': 'File di testo',
             'fr': 'Fichiers texte',
         },
+        'Threads':{
+            'pl': 'Wątki',
+            'es': 'Hilos',
+            'ru': 'Потоки',
+            'de': 'Threads',
+            'it': 'Thread',
+            'fr': 'Fils',
+        },
         'Threshold:':{
             'pl': 'Próg:',
             'es': 'Umbral:',
@@ -1790,6 +1980,14 @@ class LANGUAGES:
             'it': 'Scarica i dati del record',
             'fr': 'Décharger les données d\'enregistrement',
         },
+        'Update record ...': {
+            'pl': 'Aktualizuj rekord ...',
+            'es': 'Actualizar registro ...',
+            'ru': 'Обновить запись ...',
+            'de': 'Eintrag aktualisieren ...',
+            'it': 'Aggiorna record ...',
+            'fr': 'Mettre à jour l\'enregistrement ...',
+        },
         'Unload all records data':{
             'pl': 'Rozładuj wszystkie dane rekordów',
             'es': 'Descargar todos los datos del registro',
@@ -2175,6 +2373,15 @@ class LANGUAGES:
             'it': 'Il matching fuzzy è implementato utilizzando SequenceMatcher\ndal modulo difflib. Qualsiasi file la cui similarità\npunteggio supera la soglia verrà classificato come trovato.\nIl punteggio di similarità viene calcolato\n',
             'fr': 'Le rapprochement flou est implémenté en utilisant SequenceMatcher\ndu module difflib. Tout fichier dont le score de similarité\nexcède le seuil sera classé comme trouvé.\nLe score de similarité est calculé\n'
         },
+        'FUZZY_ALGORITHM_TOOLTIP': {
+            'en': 'Similarity score algorithm\nSequenceMatcher - ratio of matching characters (difflib)\nLevenshtein - 1 - edit distance / length of the longer text\n(much faster on long texts)',
+            'pl': 'Algorytm wyniku podobieństwa\nSequenceMatcher - udział pasujących znaków (difflib)\nLevenshtein - 1 - odległość edycyjna / długość dłuższego tekstu\n(znacznie szybszy dla długich tekstów)',
+            'es': 'Algoritmo de puntuación de similitud\nSequenceMatcher - proporción de caracteres coincidentes (difflib)\nLevenshtein - 1 - distancia de edición / longitud del texto más largo\n(mucho más rápido con textos largos)',
+            'ru': 'Алгоритм оценки сходства\nSequenceMatcher - доля совпадающих символов (difflib)\nLevenshtein - 1 - расстояние редактирования / длина более длинного текста\n(намного быстрее на длинных текстах)',
+            'de': 'Algorithmus für den Ähnlichkeitswert\nSequenceMatcher - Anteil übereinstimmender Zeichen (difflib)\nLevenshtein - 1 - Editierdistanz / Länge des längeren Textes\n(viel schneller bei langen Texten)',
+            'it': 'Algoritmo del punteggio di similarità\nSequenceMatcher - rapporto dei caratteri corrispondenti (difflib)\nLevenshtein - 1 - distanza di modifica / lunghezza del testo più lungo\n(molto più veloce su testi lunghi)',
+            'fr': "Algorithme du score de similarité\nSequenceMatcher - proportion de caractères correspondants (difflib)\nLevenshtein - 1 - distance d'édition / longueur du texte le plus long\n(beaucoup plus rapide sur les textes longs)"
+        },
         'File': {
             'pl': 'Plik',
             'es': 'Archivo',